@@ -23,14 +23,16 @@ import subprocess
 import sys
 from contextlib import asynccontextmanager
 
+import httpx
 import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from _paths import _is_frozen, RUNTIME_DIR
 from config import Config
 from dashboard.router import router as dashboard_router
-from setup.router import router as setup_router
+from setup.router import WizardState, router as setup_router
 
 # When running as a frozen executable, change to the runtime directory so any
 # stray relative paths (e.g. from third-party libs) resolve next to the exe.
@@ -137,7 +139,13 @@ async def lifespan(app: FastAPI):
         logger.info("Configuration incomplete — starting in setup mode.")
         _print_banner(host, port, setup=True)
         app.state.setup_mode = True
-        yield
+        app.state.wizard_data = WizardState()
+        # Wizard validation calls (SwitchBot, Telegram) share one pooled client
+        app.state.http = httpx.AsyncClient(timeout=10)
+        try:
+            yield
+        finally:
+            await app.state.http.aclose()
         return
 
     # --- OPERATIONAL MODE ---
@@ -150,38 +158,49 @@ async def lifespan(app: FastAPI):
     from event_store import EventStore
     from telegram_alerter import TelegramAlerter
     from telegram_commands import TelegramCommandHandler
-    from main import polling_loop
+    from main import make_face_pool, polling_loop
 
     # --- Initialize EventStore ---
     logger.info("Initializing EventStore...")
-    store = EventStore(Config.DB_PATH, Config.THUMBNAILS_DIR)
+    # WAL checkpoints run on a 60s timer instead of inside event commits
+    store = EventStore(Config.DB_PATH, Config.THUMBNAILS_DIR, checkpoint_interval=60.0)
     await store.initialize()
 
     # --- Initialize ObjectDetector ---
     logger.info("Loading YOLO model...")
-    detector = ObjectDetector(Config.YOLO_MODEL_PATH)
+    detector = ObjectDetector(Config.YOLO_MODEL_PATH, torch_threads=Config.TORCH_THREADS)
 
     # --- Initialize FaceRecognizer ---
     logger.info("Loading face recognition model...")
     recognizer = FaceRecognizer(Config.KNOWN_FACES_DIR, Config.FACE_MATCH_TOLERANCE)
-    if not recognizer.known_encodings:
+    if len(recognizer.known_encodings) == 0:
         logger.warning(
             "No known faces loaded — face recognition will not grant access. "
             "Add images to the known_faces/ directory to enable face-based unlocking."
         )
 
+    # --- Shared outbound HTTP pool (keep-alive + HTTP/2 for cloud APIs) ---
+    http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    )
+
     # --- Initialize SwitchBotClient ---
     logger.info("Initializing SwitchBot client...")
     switchbot = SwitchBotClient(
         Config.SWITCHBOT_TOKEN,
         Config.SWITCHBOT_SECRET,
         Config.SWITCHBOT_DEVICE_ID,
+        http=http,
     )
 
     # --- Initialize RingClient ---
     logger.info("Authenticating with Ring...")
     ring = RingClient(Config.RING_USERNAME, Config.RING_PASSWORD)
     await ring.authenticate()
+    # Push events when available; history polling then only runs as a safety net
+    await ring.try_start_listener()
 
     # --- Initialize Telegram alerter (optional — graceful if token missing) ---
     alerter = None
@@ -203,8 +222,12 @@ async def lifespan(app: FastAPI):
         f"Starting polling loop (interval={Config.POLL_INTERVAL}s, "
         f"camera_id={Config.CAMERA_ID})..."
     )
+    face_pool = make_face_pool()
     polling_task = asyncio.create_task(
-        polling_loop(ring, recognizer, switchbot, detector, store, alerter)
+        polling_loop(
+            ring, recognizer, switchbot, detector, store, alerter,
+            face_pool=face_pool,
+        )
     )
 
     # --- Initialize BlinkClient (optional — standalone camera feed) ---
@@ -251,16 +274,18 @@ async def lifespan(app: FastAPI):
             Config.BLINK_MOTION_COOLDOWN,
         )
         blink_monitor_task = asyncio.create_task(
-            blink_polling_loop(blink, detector, recognizer, store, alerter)
+            blink_polling_loop(blink, detector, recognizer, store, alerter, face_pool=face_pool)
         )
 
     # Expose services on app.state for dashboard routes
+    app.state.http = http
     app.state.store = store
     app.state.alerter = alerter
     app.state.switchbot = switchbot
     app.state.ring = ring
     app.state.recognizer = recognizer
     app.state.detector = detector
+    app.state.face_pool = face_pool
     app.state.blink = blink
 
     _print_banner(host, port)
@@ -283,9 +308,6 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
-    if alerter is not None:
-        await alerter.shutdown()
-
     if blink_monitor_task is not None:
         blink_monitor_task.cancel()
         try:
@@ -293,19 +315,48 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    # After every alert producer has stopped, so queued alerts can flush
+    if alerter is not None:
+        await alerter.shutdown()
+
     if blink is not None:
         await blink.stop()
 
     detector.shutdown()
+    face_pool.shutdown(wait=True)
     await store.close()
     await ring.stop()
+    await switchbot.aclose()
+    await http.aclose()
 
     logger.info("Shutdown complete.")
 
 
-app = FastAPI(lifespan=lifespan, title="Smart Lock System")
+class SetupGZipMiddleware(GZipMiddleware):
+    """Gzip responses under /setup only.
+
+    The wizard pages are large, inline-styled HTML fetched over home Wi-Fi on
+    first run. Dashboard traffic is left alone: its MJPEG/livestream bodies
+    would sit in the compressor between frames, and JPEG/MP4 bodies (some
+    served as byte ranges) gain nothing from gzip.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/setup"):
+            await super().__call__(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+app = FastAPI(
+    lifespan=lifespan,
+    title="Smart Lock System",
+    # Routes returning plain dicts are encoded with orjson too
+    default_response_class=ORJSONResponse,
+)
 app.include_router(setup_router)
 app.include_router(dashboard_router)
+app.add_middleware(SetupGZipMiddleware, minimum_size=512, compresslevel=6)
 
 
 @app.middleware("http")
@@ -330,5 +381,34 @@ async def health():
     return {"status": "ok"}
 
 
+def serve() -> None:
+    """Run uvicorn until shutdown, re-serving in-process after setup completes.
+
+    The setup wizard calls app.state.request_restart() once .env is written;
+    the server then shuts down gracefully and starts again with the reloaded
+    Config, so the lifespan comes up in operational mode without paying for
+    a fresh interpreter.
+    """
+    while True:
+        server = uvicorn.Server(uvicorn.Config(
+            app, host=Config.FASTAPI_HOST, port=Config.FASTAPI_PORT, log_level="info",
+        ))
+        restart = False
+
+        def request_restart() -> None:
+            nonlocal restart
+            restart = True
+            server.should_exit = True
+
+        app.state.request_restart = request_restart
+        try:
+            server.run()
+        except KeyboardInterrupt:
+            return
+        if not restart:
+            return
+        Config.reload()
+
+
 if __name__ == "__main__":
-    uvicorn.run("app:app", host=Config.FASTAPI_HOST, port=Config.FASTAPI_PORT, log_level="info")
+    serve()
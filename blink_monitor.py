@@ -14,18 +14,31 @@ of Ring events. No SwitchBot unlock — Blink is a secondary surveillance camera
 
 import asyncio
 import datetime
+import functools
 import logging
 import time
 import zoneinfo
+from concurrent.futures import Executor
 
 from config import Config
-from object_detector import ObjectDetector, crop_person_bbox, detections_to_dicts
+from object_detector import (
+    ObjectDetector,
+    crop_person_array,
+    decode_frame,
+)
 from event_store import EventStore
 
 logger = logging.getLogger("smart-lock.blink-monitor")
 
 
-async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store: EventStore, alerter=None):
+async def blink_polling_loop(
+    blink,
+    detector: ObjectDetector,
+    recognizer,
+    store: EventStore,
+    alerter=None,
+    face_pool: Executor | None = None,
+):
     """
     Blink motion event pipeline loop.
 
@@ -39,6 +52,8 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
         recognizer: FaceRecognizer instance.
         store: Initialized EventStore instance.
         alerter: Optional TelegramAlerter instance. If None, alerts are skipped.
+        face_pool: Executor for recognizer.identify_array, shared with the Ring loop.
+                   None uses the loop's default executor.
     """
     last_motion_time: float = 0
     loop = asyncio.get_running_loop()
@@ -83,12 +98,26 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
                 await asyncio.sleep(Config.BLINK_POLL_INTERVAL)
                 continue
 
-            # --- Save thumbnail ---
-            thumbnail_path = store.save_thumbnail(frame, recorded_at)
+            # --- Decode once; thumbnail, YOLO and face recognition share the array ---
+            try:
+                frame_array = await loop.run_in_executor(None, decode_frame, frame)
+            except Exception:
+                logger.warning("Could not decode Blink snapshot, skipping event")
+                await asyncio.sleep(Config.BLINK_POLL_INTERVAL)
+                continue
 
-            # --- YOLO object detection ---
-            detections = await detector.detect(frame)
-            detection_dicts = detections_to_dicts(detections)
+            # --- Thumbnail encode and YOLO detection run concurrently ---
+            # Independent work on separate executors; the thumbnail is still
+            # on disk before the DB write below.
+            thumbnail_path, detections = await asyncio.gather(
+                loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        store.save_thumbnail, frame, recorded_at, frame_array=frame_array
+                    ),
+                ),
+                detector.detect(frame_array),
+            )
 
             # --- Face recognition on best person crop ---
             matched_name = None
@@ -96,20 +125,29 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
 
             if person_detections:
                 best_person = max(person_detections, key=lambda d: d.confidence)
-                person_crop = crop_person_bbox(frame, best_person)
+                box_w = best_person.bbox_x2 - best_person.bbox_x1
+                box_h = best_person.bbox_y2 - best_person.bbox_y1
 
-                if person_crop is not None:
-                    matched_name = await loop.run_in_executor(
-                        None, recognizer.identify, person_crop
+                if min(box_w, box_h) < Config.MIN_FACE_PIXELS:
+                    logger.info(
+                        f"Person too small for face recognition "
+                        f"({box_w:.0f}x{box_h:.0f}px < {Config.MIN_FACE_PIXELS}px), skipping"
                     )
                 else:
-                    logger.debug(
-                        "Person crop returned None (degenerate bbox), "
-                        "falling back to full frame for face recognition"
-                    )
-                    matched_name = await loop.run_in_executor(
-                        None, recognizer.identify, frame
-                    )
+                    person_crop = crop_person_array(frame_array, best_person)
+
+                    if person_crop is not None:
+                        matched_name = await loop.run_in_executor(
+                            face_pool, recognizer.identify_array, person_crop
+                        )
+                    else:
+                        logger.debug(
+                            "Person crop returned None (degenerate bbox), "
+                            "falling back to full frame for face recognition"
+                        )
+                        matched_name = await loop.run_in_executor(
+                            face_pool, recognizer.identify_array, frame_array
+                        )
             else:
                 logger.debug("No person detected by YOLO — skipping face recognition")
 
@@ -125,13 +163,13 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
                 unlock_granted=False,
                 door_action="none",
                 thumbnail_path=thumbnail_path,
-                detections=detection_dicts,
+                detections=detections,
             )
             logger.info("Blink event persisted: event_id=%d", event_id)
 
             # --- Send Telegram alert ---
             if alerter is not None:
-                objects_summary = ", ".join(d["label"] for d in detection_dicts) if detection_dicts else "motion"
+                objects_summary = ", ".join(d.label for d in detections) if detections else "motion"
 
                 if matched_name is None and person_detections:
                     # Unknown person detected
@@ -141,7 +179,7 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
                         f"Time: {recorded_at}"
                     )
                     await alerter.alert_stranger(thumbnail_path, caption)
-                elif not person_detections and detection_dicts:
+                elif not person_detections and detections:
                     # Non-person objects (car, animal, package, etc.)
                     caption = (
                         f"Blink: Motion detected\n"
@@ -149,7 +187,7 @@ async def blink_polling_loop(blink, detector: ObjectDetector, recognizer, store:
                         f"Time: {recorded_at}"
                     )
                     await alerter.alert_blink_motion(thumbnail_path, caption)
-                elif not detection_dicts:
+                elif not detections:
                     # Motion detected but YOLO found nothing specific
                     caption = (
                         f"Blink: Motion detected (no objects identified)\n"
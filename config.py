@@ -1,4 +1,5 @@
 import os
+import platform
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -7,6 +8,14 @@ from _paths import BUNDLE_DIR, RUNTIME_DIR
 load_dotenv(RUNTIME_DIR / ".env")
 
 
+def _default_yolo_model_path() -> str:
+    """NCNN export (see export_ncnn.py, batch 1 only) on ARM boards when present, else PyTorch weights."""
+    ncnn_model = BUNDLE_DIR / "yolo11n_ncnn_model"
+    if platform.machine() in ("aarch64", "armv7l") and ncnn_model.is_dir():
+        return str(ncnn_model)
+    return str(BUNDLE_DIR / "yolo11n.pt")
+
+
 class Config:
     # Ring
     RING_USERNAME: str = os.getenv("RING_USERNAME", "")
@@ -20,6 +29,11 @@ class Config:
     # Face Recognition
     FACE_MATCH_TOLERANCE: float = float(os.getenv("FACE_MATCH_TOLERANCE", "0.5"))
     KNOWN_FACES_DIR: Path = Path(os.getenv("KNOWN_FACES_DIR", str(RUNTIME_DIR / "known_faces")))
+    # Save each analysed frame to debug_frames/ (turns on DEBUG logging for face_recognizer)
+    SAVE_DEBUG_FRAMES: bool = os.getenv("SAVE_DEBUG_FRAMES", "").lower() in ("1", "true", "yes")
+    # Person boxes / images smaller than this on either side skip face recognition
+    # (HOG cannot find a face in them)
+    MIN_FACE_PIXELS: int = int(os.getenv("MIN_FACE_PIXELS", "80"))
 
     # Timing
     POLL_INTERVAL: int = int(os.getenv("POLL_INTERVAL", "5"))
@@ -30,7 +44,9 @@ class Config:
     THUMBNAILS_DIR: str = os.getenv("THUMBNAILS_DIR", str(RUNTIME_DIR / "thumbnails"))
 
     # YOLO Object Detection
-    YOLO_MODEL_PATH: str = os.getenv("YOLO_MODEL_PATH", str(BUNDLE_DIR / "yolo11n.pt"))
+    YOLO_MODEL_PATH: str = os.getenv("YOLO_MODEL_PATH") or _default_yolo_model_path()
+    # PyTorch intra-op threads for YOLO (0 = all cores but one, left for the event loop)
+    TORCH_THREADS: int = int(os.getenv("WATCHTOWER_TORCH_THREADS", "0"))
 
     # Pipeline (Phase 3)
     CAMERA_ID: str = os.getenv("CAMERA_ID", "front_door")
@@ -91,11 +107,14 @@ class Config:
         cls.SWITCHBOT_DEVICE_ID = os.getenv("SWITCHBOT_DEVICE_ID", "")
         cls.FACE_MATCH_TOLERANCE = float(os.getenv("FACE_MATCH_TOLERANCE", "0.5"))
         cls.KNOWN_FACES_DIR = Path(os.getenv("KNOWN_FACES_DIR", str(RUNTIME_DIR / "known_faces")))
+        cls.SAVE_DEBUG_FRAMES = os.getenv("SAVE_DEBUG_FRAMES", "").lower() in ("1", "true", "yes")
+        cls.MIN_FACE_PIXELS = int(os.getenv("MIN_FACE_PIXELS", "80"))
         cls.POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "5"))
         cls.UNLOCK_COOLDOWN = int(os.getenv("UNLOCK_COOLDOWN", "60"))
         cls.DB_PATH = os.getenv("DB_PATH", str(RUNTIME_DIR / "events.db"))
         cls.THUMBNAILS_DIR = os.getenv("THUMBNAILS_DIR", str(RUNTIME_DIR / "thumbnails"))
-        cls.YOLO_MODEL_PATH = os.getenv("YOLO_MODEL_PATH", str(BUNDLE_DIR / "yolo11n.pt"))
+        cls.YOLO_MODEL_PATH = os.getenv("YOLO_MODEL_PATH") or _default_yolo_model_path()
+        cls.TORCH_THREADS = int(os.getenv("WATCHTOWER_TORCH_THREADS", "0"))
         cls.CAMERA_ID = os.getenv("CAMERA_ID", "front_door")
         cls.FASTAPI_HOST = os.getenv("FASTAPI_HOST", "127.0.0.1")
         cls.FASTAPI_PORT = int(os.getenv("FASTAPI_PORT", "1847"))
@@ -4,7 +4,7 @@ Dashboard router for Smart Lock System web interface.
 Provides HTTP Basic Auth-protected routes for:
 - /dashboard/         — Summary widget (today's count, last event, lock status)
 - /dashboard/events   — Event feed with date range and object type filters + pagination
-- /dashboard/thumbnails/{filename} — Authenticated JPEG thumbnail serving via FileResponse
+- /dashboard/thumbnails/{filename} — Authenticated thumbnail serving via FileResponse
 
 Security:
 - All routes require HTTP Basic Auth via router-level Depends(verify_credentials)
@@ -16,18 +16,23 @@ Security:
 
 import asyncio
 import logging
+import os
 import secrets
 import shutil
+import stat
 import subprocess
 import tempfile
+from email.utils import parsedate
 from pathlib import Path
 from typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.templating import Jinja2Templates
 from starlette.background import BackgroundTask
+from starlette.staticfiles import NotModifiedResponse
 from PIL import Image, ImageDraw, ImageFont
 
 from config import Config
@@ -83,7 +88,7 @@ router = APIRouter(prefix="/dashboard", dependencies=[Depends(verify_credentials
 templates = Jinja2Templates(directory=str(BUNDLE_DIR / "dashboard" / "templates"))
 
 # Add basename filter so templates can use {{ event.thumbnail_path | basename }}
-# EventStore.save_thumbnail() returns paths like "thumbnails/2026-02-25T10-30-00.jpg"
+# EventStore.save_thumbnail() returns paths like "thumbnails/2026-02-25T10-30-00.webp"
 # The /dashboard/thumbnails/ route expects just the filename component
 templates.env.filters["basename"] = lambda path: path.split("/")[-1] if path else ""
 
@@ -105,6 +110,97 @@ def _human_datetime(value: str) -> str:
 templates.env.filters["humandate"] = _human_datetime
 
 
+def _stream_template(name: str, context: dict, buffer_size: int = 20) -> StreamingResponse:
+    """
+    Render a template incrementally as a StreamingResponse.
+
+    Jinja's stream() yields the page in chunks (buffered ``buffer_size`` template
+    events at a time) so the first bytes go out before the whole page is rendered
+    and the full HTML string is never held in memory at once.
+    """
+    stream = templates.get_template(name).stream(context)
+    stream.enable_buffering(buffer_size)
+    return StreamingResponse(stream, media_type="text/html; charset=utf-8")
+
+
+def _resolve_safe(name: str, base: str) -> Path | None:
+    """
+    Validate a client-supplied filename and join it onto ``base``.
+
+    Returns None for names containing "/" or "..". Callers stat() the
+    returned path once per request (see _stat_regular_file).
+    """
+    if "/" in name or ".." in name:
+        return None
+    return Path(base) / name
+
+
+def _stat_regular_file(path: Path) -> os.stat_result | None:
+    """
+    Stat a path once and return the result only if it is a regular file.
+
+    A single stat() replaces the exists() + is_file() pair, and the result is
+    handed to FileResponse(stat_result=...) so Starlette skips its own stat().
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st
+
+
+async def _json_body(request: Request):
+    """Parse the request body with orjson (drop-in for ``await request.json()``)."""
+    return orjson.loads(await request.body())
+
+
+# Cache-Control policies for authenticated file routes
+_THUMBNAIL_CACHE_CONTROL = "private, max-age=300"
+# Asset URLs are not versioned: cache for a day, then revalidate via ETag
+_ASSET_CACHE_CONTROL = "private, max-age=86400"
+# Older events still reference .jpg thumbnails; new ones are stored as WebP
+_THUMBNAIL_MEDIA_TYPES = {".webp": "image/webp", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def _is_not_modified(response: FileResponse, request: Request) -> bool:
+    """Return True if the request's validators match the response's ETag/Last-Modified."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = response.headers["etag"]
+        return etag in [tag.strip(" W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = parsedate(request.headers.get("if-modified-since", ""))
+    last_modified = parsedate(response.headers["last-modified"])
+    return if_modified_since is not None and last_modified is not None and if_modified_since >= last_modified
+
+
+def _cached_file_response(
+    request: Request,
+    path: Path,
+    st: os.stat_result,
+    media_type: str,
+    cache_control: str,
+) -> FileResponse | NotModifiedResponse:
+    """
+    Build a FileResponse with ETag/Last-Modified/Cache-Control validators.
+
+    FileResponse derives ETag and Last-Modified from stat_result but never answers
+    conditional requests itself, so If-None-Match / If-Modified-Since are checked
+    here and a body-less 304 is returned on a match.
+    """
+    response = FileResponse(
+        str(path),
+        media_type=media_type,
+        stat_result=st,
+        headers={"Cache-Control": cache_control},
+    )
+    if _is_not_modified(response, request):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Route: GET /dashboard/ — Summary widget (DASH-04)
 # ---------------------------------------------------------------------------
@@ -116,7 +212,7 @@ async def dashboard_home(request: Request) -> HTMLResponse:
     Displays:
     - Today's total event count (via EventStore.get_today_event_count)
     - Most recent event card with thumbnail, timestamp, and person name
-    - Current lock status (via SwitchBotClient.get_lock_status in thread executor)
+    - Current lock status (via SwitchBotClient.get_lock_status)
     """
     store = request.app.state.store
     switchbot = request.app.state.switchbot
@@ -128,12 +224,10 @@ async def dashboard_home(request: Request) -> HTMLResponse:
     recent = await store.get_recent_events(limit=1)
     last_event = recent[0] if recent else None
 
-    # Lock status — get_lock_status() uses synchronous requests.get(), must run
-    # in executor to avoid blocking the async event loop
+    # Lock status — fetched over the shared async HTTP pool (app.state.http)
     lock_status = None
     try:
-        loop = asyncio.get_event_loop()
-        lock_status = await loop.run_in_executor(None, switchbot.get_lock_status)
+        lock_status = await switchbot.get_lock_status()
     except Exception:
         lock_status = None
 
@@ -165,7 +259,7 @@ async def events_feed(
     limit: int = 20,
     date_range: str = "all",
     object_type: str = "all",
-) -> HTMLResponse:
+) -> StreamingResponse:
     """
     Paginated event feed with date range and object type filters.
 
@@ -196,7 +290,8 @@ async def events_feed(
     # has_next heuristic: if we got a full page, there's likely another page
     has_next = len(events) == limit
 
-    return templates.TemplateResponse(
+    # Largest page — stream it instead of building the whole HTML string first
+    return _stream_template(
         "events.html",
         {
             "request": request,
@@ -215,38 +310,44 @@ async def events_feed(
 # (DASH-05)
 # ---------------------------------------------------------------------------
 @router.get("/thumbnails/{filename}")
-async def serve_thumbnail(filename: str) -> FileResponse:
+async def serve_thumbnail(request: Request, filename: str) -> FileResponse:
     """
-    Serve a JPEG thumbnail with authentication enforced by router-level dependency.
+    Serve a WebP or JPEG thumbnail with authentication enforced by router-level dependency.
 
     Security:
     - Path traversal prevention: filenames containing "/" or ".." are rejected
     - File existence check before serving
     - Auth enforced at router level (no additional check needed here)
 
+    Caching:
+    - ETag/Last-Modified + "Cache-Control: private, max-age=300"; a matching
+      If-None-Match / If-Modified-Since gets a 304 with no body
+
     Returns:
-        FileResponse with media_type="image/jpeg"
+        FileResponse with media_type "image/webp" or "image/jpeg"
+        (or 304 Not Modified)
 
     Raises:
         HTTPException 400 if filename contains path traversal sequences
         HTTPException 404 if thumbnail file does not exist
     """
     # Block path traversal attempts
-    if "/" in filename or ".." in filename:
+    path = _resolve_safe(filename, str(Config.THUMBNAILS_DIR))
+    if path is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid filename",
         )
 
-    path = Path(Config.THUMBNAILS_DIR) / filename
-
-    if not path.exists() or not path.is_file():
+    st = _stat_regular_file(path)
+    if st is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Thumbnail not found",
         )
 
-    return FileResponse(str(path), media_type="image/jpeg")
+    media_type = _THUMBNAIL_MEDIA_TYPES.get(path.suffix.lower(), "image/jpeg")
+    return _cached_file_response(request, path, st, media_type, _THUMBNAIL_CACHE_CONTROL)
 
 
 # ---------------------------------------------------------------------------
@@ -269,45 +370,45 @@ async def analytics_page(request: Request) -> HTMLResponse:
 # ---------------------------------------------------------------------------
 
 @router.get("/api/stats")
-async def api_stats(request: Request) -> JSONResponse:
+async def api_stats(request: Request) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_analytics_stats()
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/hourly-heatmap")
-async def api_hourly_heatmap(request: Request, days: int = Query(30, ge=1, le=365)) -> JSONResponse:
+async def api_hourly_heatmap(request: Request, days: int = Query(30, ge=1, le=365)) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_hourly_heatmap(days=days)
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/detection-breakdown")
-async def api_detection_breakdown(request: Request, days: int = Query(30, ge=1, le=365)) -> JSONResponse:
+async def api_detection_breakdown(request: Request, days: int = Query(30, ge=1, le=365)) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_detection_breakdown(days=days)
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/daily-timeline")
-async def api_daily_timeline(request: Request, days: int = Query(30, ge=1, le=365)) -> JSONResponse:
+async def api_daily_timeline(request: Request, days: int = Query(30, ge=1, le=365)) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_daily_timeline(days=days)
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/peak-hours")
-async def api_peak_hours(request: Request, days: int = Query(30, ge=1, le=365)) -> JSONResponse:
+async def api_peak_hours(request: Request, days: int = Query(30, ge=1, le=365)) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_peak_hours(days=days)
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/recent-orb")
-async def api_recent_orb(request: Request, limit: int = Query(50, ge=1, le=200)) -> JSONResponse:
+async def api_recent_orb(request: Request, limit: int = Query(50, ge=1, le=200)) -> ORJSONResponse:
     store = request.app.state.store
     data = await store.get_recent_events_for_orb(limit=limit)
-    return JSONResponse(data)
+    return ORJSONResponse(data)
 
 
 @router.get("/api/blink-snapshot")
@@ -331,7 +432,7 @@ async def api_blink_snapshot(request: Request):
 
 
 @router.get("/api/blink-analyze")
-async def api_blink_analyze(request: Request) -> JSONResponse:
+async def api_blink_analyze(request: Request) -> ORJSONResponse:
     """Fetch a Blink snapshot, run YOLO detection, and return annotated results.
 
     Returns JSON with:
@@ -356,11 +457,14 @@ async def api_blink_analyze(request: Request) -> JSONResponse:
     if image_bytes is None:
         raise HTTPException(status_code=502, detail="Failed to fetch snapshot from Blink")
 
-    # Run YOLO detection
-    detections = await detector.detect(image_bytes)
+    # Run YOLO detection on the same decoded frame that gets annotated
+    try:
+        frame_array, detections = await detector.detect_with_image(image_bytes)
+    except ValueError:
+        raise HTTPException(status_code=502, detail="Blink returned an undecodable snapshot")
 
     # Draw bounding boxes on image
-    img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    img = Image.fromarray(frame_array)
     draw = ImageDraw.Draw(img)
     font = ImageFont.load_default()
 
@@ -404,7 +508,7 @@ async def api_blink_analyze(request: Request) -> JSONResponse:
     else:
         summary = "No objects detected"
 
-    return JSONResponse({
+    return ORJSONResponse({
         "image": b64_image,
         "detections": [
             {"label": d.label, "confidence": round(d.confidence, 3)}
@@ -415,16 +519,16 @@ async def api_blink_analyze(request: Request) -> JSONResponse:
 
 
 @router.post("/api/blink-2fa")
-async def api_blink_2fa(request: Request) -> JSONResponse:
+async def api_blink_2fa(request: Request) -> ORJSONResponse:
     """Submit a Blink 2FA verification code."""
     blink = getattr(request.app.state, "blink", None)
     if blink is None:
         raise HTTPException(status_code=404, detail="Blink camera not configured")
 
     if not blink.needs_2fa:
-        return JSONResponse({"status": "ok", "message": "Already verified"})
+        return ORJSONResponse({"status": "ok", "message": "Already verified"})
 
-    body = await request.json()
+    body = await _json_body(request)
     code = body.get("code", "").strip()
     if not code:
         raise HTTPException(status_code=400, detail="Verification code is required")
@@ -433,11 +537,11 @@ async def api_blink_2fa(request: Request) -> JSONResponse:
     if not success:
         raise HTTPException(status_code=401, detail="Invalid verification code")
 
-    return JSONResponse({"status": "ok", "message": "Blink camera verified"})
+    return ORJSONResponse({"status": "ok", "message": "Blink camera verified"})
 
 
 @router.get("/api/blink-arm-status")
-async def api_blink_arm_status(request: Request) -> JSONResponse:
+async def api_blink_arm_status(request: Request) -> ORJSONResponse:
     """Return current Blink camera arm state and motion detection status."""
     blink = getattr(request.app.state, "blink", None)
     if blink is None or blink.needs_2fa or blink._camera is None:
@@ -452,7 +556,7 @@ async def api_blink_arm_status(request: Request) -> JSONResponse:
         network_armed = False
 
     # "armed" means both network and camera are armed (both gates must be open)
-    return JSONResponse({
+    return ORJSONResponse({
         "armed": bool(camera_armed) and bool(network_armed),
         "camera_armed": bool(camera_armed),
         "network_armed": bool(network_armed),
@@ -461,17 +565,17 @@ async def api_blink_arm_status(request: Request) -> JSONResponse:
 
 
 @router.post("/api/blink-arm")
-async def api_blink_arm(request: Request) -> JSONResponse:
+async def api_blink_arm(request: Request) -> ORJSONResponse:
     """Arm or disarm the Blink camera for motion detection."""
     blink = getattr(request.app.state, "blink", None)
     if blink is None or blink.needs_2fa or blink._camera is None:
         raise HTTPException(status_code=404, detail="Blink camera not available")
 
-    body = await request.json()
+    body = await _json_body(request)
     armed = body.get("armed", True)
 
     await blink.async_arm(armed)
-    return JSONResponse({"armed": armed})
+    return ORJSONResponse({"armed": armed})
 
 
 @router.get("/api/blink-live")
@@ -623,49 +727,46 @@ async def api_blink_live_stop(request: Request):
     if blink:
         await blink.stop_livestream()
 
-    return JSONResponse({"status": "ok", "message": "Livestream stopped"})
+    return ORJSONResponse({"status": "ok", "message": "Livestream stopped"})
 
 
 @router.get("/api/battery")
-async def api_battery(request: Request) -> JSONResponse:
+async def api_battery(request: Request) -> ORJSONResponse:
     """Return Ring doorbell battery percentage."""
     ring = request.app.state.ring
     level = ring.get_battery_level()
-    return JSONResponse({"battery": level})
+    return ORJSONResponse({"battery": level})
 
 
 @router.get("/api/lock-status")
-async def api_lock_status(request: Request) -> JSONResponse:
+async def api_lock_status(request: Request) -> ORJSONResponse:
     """Return current lock state."""
     switchbot = request.app.state.switchbot
-    loop = asyncio.get_event_loop()
-    status = await loop.run_in_executor(None, switchbot.get_lock_status)
+    status = await switchbot.get_lock_status()
     state = "unknown"
     if status and isinstance(status, dict):
         state = status.get("lockState", "unknown")
-    return JSONResponse({"state": state})
+    return ORJSONResponse({"state": state})
 
 
 @router.post("/api/lock")
-async def api_lock(request: Request) -> JSONResponse:
+async def api_lock(request: Request) -> ORJSONResponse:
     """Send lock command to SwitchBot."""
     switchbot = request.app.state.switchbot
-    loop = asyncio.get_event_loop()
-    ok = await loop.run_in_executor(None, switchbot.lock)
+    ok = await switchbot.lock()
     if not ok:
         raise HTTPException(status_code=500, detail="Lock command failed")
-    return JSONResponse({"status": "locked"})
+    return ORJSONResponse({"status": "locked"})
 
 
 @router.post("/api/unlock")
-async def api_unlock(request: Request) -> JSONResponse:
+async def api_unlock(request: Request) -> ORJSONResponse:
     """Send unlock command to SwitchBot."""
     switchbot = request.app.state.switchbot
-    loop = asyncio.get_event_loop()
-    ok = await loop.run_in_executor(None, switchbot.unlock)
+    ok = await switchbot.unlock()
     if not ok:
         raise HTTPException(status_code=500, detail="Unlock command failed")
-    return JSONResponse({"status": "unlocked"})
+    return ORJSONResponse({"status": "unlocked"})
 
 
 # ---------------------------------------------------------------------------
@@ -685,18 +786,20 @@ async def api_timelapse_info(
     start_date: str = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     end_date: str = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     camera: str = Query("all"),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Return thumbnail count for a date or date range (used by frontend preview)."""
     store = request.app.state.store
     events = await store.get_events_for_timelapse(
         date=date, start_date=start_date, end_date=end_date, camera=camera,
     )
-    return JSONResponse({"count": len(events)})
+    return ORJSONResponse({"count": len(events)})
 
 
 def _burn_overlay(src_path: str, dst_path: str, timestamp: str, person_name: str | None) -> None:
     """Burn timestamp + person name overlay onto a thumbnail copy."""
-    img = Image.open(src_path).convert("RGB")
+    img = Image.open(src_path)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
     draw = ImageDraw.Draw(img, "RGBA")
     w, h = img.size
 
@@ -836,12 +939,12 @@ async def people_page(request: Request) -> HTMLResponse:
 
 
 @router.get("/api/people")
-async def api_list_people(request: Request) -> JSONResponse:
-    """List all persons as JSON."""
+async def api_list_people(request: Request) -> ORJSONResponse:
+    """List all persons as JSON (orjson-encoded — the list grows with photo metadata)."""
     store = request.app.state.store
     await store.sync_persons_from_disk(Config.KNOWN_FACES_DIR)
     persons = await store.get_persons(Config.KNOWN_FACES_DIR)
-    return JSONResponse(persons)
+    return ORJSONResponse(persons)
 
 
 @router.post("/api/people")
@@ -849,7 +952,7 @@ async def api_add_person(
     request: Request,
     name: str = Form(...),
     photo: UploadFile = File(...),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Upload a face photo and create/add-to a person."""
     store = request.app.state.store
     recognizer = request.app.state.recognizer
@@ -871,10 +974,12 @@ async def api_add_person(
         ext = ".jpg"
 
     # Enroll the face (validates face presence, saves to disk, reloads recognizer)
+    # on the dedicated face pool when the app created one
+    face_pool = getattr(request.app.state, "face_pool", None)
     loop = asyncio.get_event_loop()
     try:
         filename = await loop.run_in_executor(
-            None, recognizer.enroll, clean_name, image_bytes, ext
+            face_pool, recognizer.enroll, clean_name, image_bytes, ext
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -884,17 +989,16 @@ async def api_add_person(
     await store.add_person(clean_name, display_name)
 
     # Return updated person info
-    persons = await store.get_persons(Config.KNOWN_FACES_DIR)
-    person = next((p for p in persons if p["name"] == clean_name), None)
+    person = await store.get_person(clean_name, Config.KNOWN_FACES_DIR)
 
-    return JSONResponse(
+    return ORJSONResponse(
         {"status": "ok", "filename": filename, "person": person},
         status_code=201,
     )
 
 
 @router.delete("/api/people/{name}")
-async def api_delete_person(request: Request, name: str) -> JSONResponse:
+async def api_delete_person(request: Request, name: str) -> ORJSONResponse:
     """Delete a person and all their face images."""
     store = request.app.state.store
     recognizer = request.app.state.recognizer
@@ -907,35 +1011,35 @@ async def api_delete_person(request: Request, name: str) -> JSONResponse:
     loop = asyncio.get_event_loop()
     await loop.run_in_executor(None, recognizer.reload)
 
-    return JSONResponse({"status": "ok"})
+    return ORJSONResponse({"status": "ok"})
 
 
 @router.post("/api/people/{name}/auto-unlock")
-async def api_toggle_auto_unlock(request: Request, name: str) -> JSONResponse:
+async def api_toggle_auto_unlock(request: Request, name: str) -> ORJSONResponse:
     """Toggle a person's auto-unlock setting."""
     store = request.app.state.store
 
-    body = await request.json()
+    body = await _json_body(request)
     enabled = body.get("enabled", True)
 
     updated = await store.set_person_auto_unlock(name, enabled)
     if not updated:
         raise HTTPException(status_code=404, detail="Person not found")
 
-    return JSONResponse({"status": "ok", "auto_unlock": enabled})
+    return ORJSONResponse({"status": "ok", "auto_unlock": enabled})
 
 
 @router.get("/people/photos/{filename}")
 async def serve_face_photo(filename: str) -> FileResponse:
     """Serve face photos from the known_faces directory."""
-    if "/" in filename or ".." in filename:
+    path = _resolve_safe(filename, str(Config.KNOWN_FACES_DIR))
+    if path is None:
         raise HTTPException(status_code=400, detail="Invalid filename")
-
-    path = Config.KNOWN_FACES_DIR / filename
-    if not path.exists() or not path.is_file():
+    st = _stat_regular_file(path)
+    if st is None:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    return FileResponse(str(path), media_type="image/jpeg")
+    return FileResponse(str(path), media_type="image/jpeg", stat_result=st)
 
 
 # ---------------------------------------------------------------------------
@@ -959,6 +1063,11 @@ _SETTINGS_WHITELIST: dict[str, list[str]] = {
     ],
 }
 
+# Same whitelist as frozensets, for O(1) membership / C-level set difference
+_SETTINGS_WHITELIST_SET: dict[str, frozenset[str]] = {
+    section: frozenset(keys) for section, keys in _SETTINGS_WHITELIST.items()
+}
+
 
 @router.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request) -> HTMLResponse:
@@ -971,24 +1080,25 @@ async def settings_page(request: Request) -> HTMLResponse:
 
 
 @router.post("/api/settings")
-async def api_save_settings(request: Request) -> JSONResponse:
+async def api_save_settings(request: Request) -> ORJSONResponse:
     """Save settings for a given section to .env and reload Config."""
-    body = await request.json()
+    body = await _json_body(request)
     section = body.get("section", "")
     values = body.get("values", {})
 
-    if section not in _SETTINGS_WHITELIST:
+    allowed_keys = _SETTINGS_WHITELIST_SET.get(section)
+    if allowed_keys is None:
         raise HTTPException(status_code=400, detail=f"Unknown section: {section}")
 
-    allowed_keys = _SETTINGS_WHITELIST[section]
-    updates = {}
-    for key, value in values.items():
-        if key not in allowed_keys:
-            raise HTTPException(status_code=400, detail=f"Key not allowed: {key}")
-        updates[key] = str(value)
+    bad_keys = values.keys() - allowed_keys
+    if bad_keys:
+        # Report the first offending key in request order
+        key = next(k for k in values if k in bad_keys)
+        raise HTTPException(status_code=400, detail=f"Key not allowed: {key}")
+    updates = {key: str(value) for key, value in values.items()}
 
     if not updates:
-        return JSONResponse({"ok": True, "restart_needed": False, "message": "Nothing to update"})
+        return ORJSONResponse({"ok": True, "restart_needed": False, "message": "Nothing to update"})
 
     write_env(updates=updates)
     Config.reload()
@@ -998,7 +1108,7 @@ async def api_save_settings(request: Request) -> JSONResponse:
     if restart_needed:
         message += " Restart WatchTower for device changes to take full effect."
 
-    return JSONResponse({"ok": True, "restart_needed": restart_needed, "message": message})
+    return ORJSONResponse({"ok": True, "restart_needed": restart_needed, "message": message})
 
 
 # ---------------------------------------------------------------------------
@@ -1006,14 +1116,14 @@ async def api_save_settings(request: Request) -> JSONResponse:
 # ---------------------------------------------------------------------------
 
 @router.post("/api/settings/blink-login")
-async def api_settings_blink_login(request: Request) -> JSONResponse:
+async def api_settings_blink_login(request: Request) -> ORJSONResponse:
     """Step 1: Test Blink credentials. If 2FA is needed, store the instance."""
-    body = await request.json()
+    body = await _json_body(request)
     username = body.get("username", "").strip()
     password = body.get("password", "").strip()
 
     if not username or not password:
-        return JSONResponse({"ok": False, "error": "Email and password are required."})
+        return ORJSONResponse({"ok": False, "error": "Email and password are required."})
 
     try:
         from blink_client import BlinkClient, BLINK_CREDS_CACHE
@@ -1023,7 +1133,7 @@ async def api_settings_blink_login(request: Request) -> JSONResponse:
 
         if blink.needs_2fa:
             request.app.state.settings_blink = blink
-            return JSONResponse({"ok": True, "needs_2fa": True, "cameras": []})
+            return ORJSONResponse({"ok": True, "needs_2fa": True, "cameras": []})
 
         cameras = list(blink.blink.cameras.keys()) if blink.blink and blink.blink.cameras else []
 
@@ -1039,46 +1149,46 @@ async def api_settings_blink_login(request: Request) -> JSONResponse:
 
             if blink.needs_2fa:
                 request.app.state.settings_blink = blink
-                return JSONResponse({"ok": True, "needs_2fa": True, "cameras": []})
+                return ORJSONResponse({"ok": True, "needs_2fa": True, "cameras": []})
 
             cameras = list(blink.blink.cameras.keys()) if blink.blink and blink.blink.cameras else []
 
         request.app.state.settings_blink = blink
-        return JSONResponse({"ok": True, "needs_2fa": False, "cameras": cameras})
+        return ORJSONResponse({"ok": True, "needs_2fa": False, "cameras": cameras})
     except Exception as e:
-        return JSONResponse({"ok": False, "error": f"Blink login failed: {e}"})
+        return ORJSONResponse({"ok": False, "error": f"Blink login failed: {e}"})
 
 
 @router.post("/api/settings/blink-2fa")
-async def api_settings_blink_2fa(request: Request) -> JSONResponse:
+async def api_settings_blink_2fa(request: Request) -> ORJSONResponse:
     """Step 2: Submit 2FA code and return camera list on success."""
-    body = await request.json()
+    body = await _json_body(request)
     code = body.get("code", "").strip()
     if not code:
-        return JSONResponse({"ok": False, "error": "Verification code is required."})
+        return ORJSONResponse({"ok": False, "error": "Verification code is required."})
 
     blink = getattr(request.app.state, "settings_blink", None)
     if blink is None:
-        return JSONResponse({"ok": False, "error": "No pending Blink session. Log in first."})
+        return ORJSONResponse({"ok": False, "error": "No pending Blink session. Log in first."})
 
     success = await blink.submit_2fa(code)
     if not success:
-        return JSONResponse({"ok": False, "error": "Invalid verification code."})
+        return ORJSONResponse({"ok": False, "error": "Invalid verification code."})
 
     cameras = list(blink.blink.cameras.keys()) if blink.blink and blink.blink.cameras else []
-    return JSONResponse({"ok": True, "cameras": cameras})
+    return ORJSONResponse({"ok": True, "cameras": cameras})
 
 
 @router.post("/api/settings/blink-save")
-async def api_settings_blink_save(request: Request) -> JSONResponse:
+async def api_settings_blink_save(request: Request) -> ORJSONResponse:
     """Step 3: Save Blink credentials + selected camera to .env."""
-    body = await request.json()
+    body = await _json_body(request)
     username = body.get("username", "").strip()
     password = body.get("password", "").strip()
     camera_name = body.get("camera_name", "").strip()
 
     if not username or not password:
-        return JSONResponse({"ok": False, "error": "Email and password are required."})
+        return ORJSONResponse({"ok": False, "error": "Email and password are required."})
 
     updates = {
         "BLINK_USERNAME": username,
@@ -1102,7 +1212,7 @@ async def api_settings_blink_save(request: Request) -> JSONResponse:
         request.app.state.blink = settings_blink
         request.app.state.settings_blink = None
 
-        return JSONResponse({
+        return ORJSONResponse({
             "ok": True,
             "restart_needed": False,
             "message": "Blink camera connected and ready.",
@@ -1113,7 +1223,7 @@ async def api_settings_blink_save(request: Request) -> JSONResponse:
         await settings_blink.stop()
         request.app.state.settings_blink = None
 
-    return JSONResponse({
+    return ORJSONResponse({
         "ok": True,
         "restart_needed": True,
         "message": "Blink settings saved. Restart WatchTower for changes to take effect.",
@@ -1128,16 +1238,20 @@ _ALLOWED_ASSETS = {
     "background.png": "transparent_drawing.png",
 }
 
+# Whitelisted asset paths resolved once at import
+_ASSET_PATHS: dict[str, Path] = {name: BUNDLE_DIR / src for name, src in _ALLOWED_ASSETS.items()}
+
 
 @router.get("/assets/{filename}")
-async def serve_asset(filename: str) -> FileResponse:
+async def serve_asset(request: Request, filename: str) -> FileResponse:
     """Serve whitelisted static assets from the bundle directory."""
-    if filename not in _ALLOWED_ASSETS:
+    path = _ASSET_PATHS.get(filename)
+    if path is None:
         raise HTTPException(status_code=404, detail="Asset not found")
 
-    path = BUNDLE_DIR / _ALLOWED_ASSETS[filename]
-    if not path.exists():
+    st = _stat_regular_file(path)
+    if st is None:
         raise HTTPException(status_code=404, detail="Asset not found")
 
     media = "image/png" if filename.endswith(".png") else "application/octet-stream"
-    return FileResponse(str(path), media_type=media)
+    return _cached_file_response(request, path, st, media, _ASSET_CACHE_CONTROL)
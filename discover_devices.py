@@ -1,22 +1,23 @@
 #!/usr/bin/env python3
 """Discover SwitchBot devices to find your Lock's device ID."""
 
+import httpx
+
 from config import Config
-from switchbot_client import SwitchBotClient
+from switchbot_client import SWITCHBOT_API_BASE, SwitchBotClient
+
 
-import requests
+def list_devices(http: httpx.Client, client: SwitchBotClient) -> dict:
+    """Fetch the raw SwitchBot device listing using the given HTTP client."""
+    resp = http.get(f"{SWITCHBOT_API_BASE}/devices", headers=client._build_headers())
+    return resp.json()
 
 
 def main():
     client = SwitchBotClient(Config.SWITCHBOT_TOKEN, Config.SWITCHBOT_SECRET, "")
-    headers = client._build_headers()
-
-    resp = requests.get(
-        "https://api.switch-bot.com/v1.1/devices",
-        headers=headers,
-        timeout=10,
-    )
-    data = resp.json()
+
+    with httpx.Client(timeout=10) as http:
+        data = list_devices(http, client)
 
     if data.get("statusCode") != 100:
         print(f"Error: {data}")
@@ -1,10 +1,11 @@
 """
 EventStore: Single shared database interface for the Smart Lock Analytics Platform.
 
-This module wraps an aiosqlite connection in WAL mode and provides async
-write/read methods for events, detections, and thumbnail management. Every
-downstream phase (object detection, pipeline integration, Telegram alerts,
-web dashboard) depends on this module for structured event storage.
+This module wraps an aiosqlite write connection plus a small pool of
+read-only connections in WAL mode and provides async write/read methods
+for events, detections, and thumbnail management. Every downstream phase
+(object detection, pipeline integration, Telegram alerts, web dashboard)
+depends on this module for structured event storage.
 
 Schema overview:
     events      — one row per Ring doorbell event (motion, ding)
@@ -13,31 +14,249 @@ Schema overview:
 """
 
 import asyncio
+import datetime
 import io
 import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 import aiosqlite
+import numpy as np
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Target size for JPEG draft mode: libjpeg scales by 1/2, 1/4 or 1/8 during the
+# IDCT while keeping the image at least this large (1080p frames decode at 960x540).
+THUMBNAIL_DRAFT_SIZE = (800, 450)
+
+# Stored thumbnails are bounded to this many pixels on the longest side and
+# encoded as WebP, which is markedly smaller than JPEG at equal quality.
+THUMBNAIL_MAX_SIDE = 800
+THUMBNAIL_WEBP_QUALITY = 80
+
+_TEMP_STORE_MODES = frozenset({"DEFAULT", "FILE", "MEMORY"})
+
+# JPEG frames up to this size are stored byte-for-byte (no decode/re-encode)
+THUMBNAIL_PASSTHROUGH_MAX_BYTES = 512 * 1024
+_JPEG_SOI = b"\xff\xd8\xff"
+
+# ISO timestamp -> filesystem-safe thumbnail stem (":" and "." become "-")
+_TS_SANITIZE = str.maketrans(":.", "--")
+
+# Offset applied to 'now' by the schema's datetime('now', '-6 hours') defaults
+_DAY_OFFSET = datetime.timedelta(hours=6)
+
+
+def _sql_today() -> str:
+    """Python equivalent of SQLite's DATE('now', '-6 hours')."""
+    return (datetime.datetime.now(datetime.timezone.utc) - _DAY_OFFSET).date().isoformat()
+
+
+def _sql_date(timestamp: str) -> str | None:
+    """Python equivalent of SQLite's DATE(timestamp): offset-aware values are shifted to UTC."""
+    try:
+        dt = datetime.datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc)
+    return dt.date().isoformat()
+
+
+# ---------------------------------------------------------------------------
+# SQL — module-level constants so every call reuses the same statement text
+# (and so sqlite3's per-connection statement cache) instead of rebuilding it
+# ---------------------------------------------------------------------------
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    camera_id      TEXT    NOT NULL DEFAULT 'front_door',
+    recorded_at    TEXT    NOT NULL,
+    event_type     TEXT    NOT NULL DEFAULT 'motion',
+    recording_id   TEXT,
+    person_name    TEXT,
+    face_confidence REAL,
+    face_distance  REAL,
+    unlock_granted INTEGER NOT NULL DEFAULT 0,
+    door_action    TEXT    DEFAULT 'none',
+    thumbnail_path TEXT,
+    alert_sent     INTEGER NOT NULL DEFAULT 0,
+    created_at     TEXT    NOT NULL DEFAULT (datetime('now', '-6 hours'))
+);
+
+CREATE TABLE IF NOT EXISTS detections (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id    INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    label       TEXT    NOT NULL,
+    confidence  REAL    NOT NULL,
+    bbox_x1     REAL,
+    bbox_y1     REAL,
+    bbox_x2     REAL,
+    bbox_y2     REAL
+);
+
+CREATE TABLE IF NOT EXISTS persons (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    name         TEXT    NOT NULL UNIQUE,
+    display_name TEXT,
+    created_at   TEXT    NOT NULL DEFAULT (datetime('now', '-6 hours'))
+);
+
+-- Indexes for common query patterns
+CREATE INDEX IF NOT EXISTS idx_events_recorded_at ON events(recorded_at DESC);
+-- Camera-filtered, time-ordered feeds walk this index without a sort step
+CREATE INDEX IF NOT EXISTS idx_events_cam_time ON events(camera_id, recorded_at DESC);
+-- Superseded by the (camera_id, recorded_at) prefix above
+DROP INDEX IF EXISTS idx_events_camera_id;
+CREATE INDEX IF NOT EXISTS idx_events_person_name ON events(person_name);
+-- Partial index: stranger events (person_name NULL) are the majority and never looked up by name
+CREATE INDEX IF NOT EXISTS idx_events_person_time ON events(person_name, recorded_at DESC)
+    WHERE person_name IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_detections_event_id ON detections(event_id);
+CREATE INDEX IF NOT EXISTS idx_detections_label ON detections(label);
+"""
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (
+        camera_id, recorded_at, event_type, recording_id,
+        person_name, face_confidence, face_distance,
+        unlock_granted, door_action, thumbnail_path
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_DETECTION_SQL = """
+    INSERT INTO detections (event_id, label, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Detection columns selected alongside e.* in event/detection LEFT JOINs,
+# aliased so they cannot collide with event columns: (alias, detection key)
+_DETECTION_ALIASES = (
+    ("det_id", "id"),
+    ("det_event_id", "event_id"),
+    ("det_label", "label"),
+    ("det_confidence", "confidence"),
+    ("det_bbox_x1", "bbox_x1"),
+    ("det_bbox_y1", "bbox_y1"),
+    ("det_bbox_x2", "bbox_x2"),
+    ("det_bbox_y2", "bbox_y2"),
+)
+_DETECTION_SELECT = ", ".join(
+    f"d.{key} AS {alias}" for alias, key in _DETECTION_ALIASES
+)
+_DETECTION_ALIAS_SET = frozenset(alias for alias, _ in _DETECTION_ALIASES)
+
+
+def _group_event_rows(rows) -> list[dict]:
+    """
+    Fold LEFT JOIN rows (one per event x detection) into event dicts.
+
+    Each event dict carries a nested 'detections' list; events without any
+    detection (NULL join columns) get an empty list. Event order follows the
+    first appearance of each event in ``rows``.
+    """
+    events: dict[int, dict] = {}
+    for row in rows:
+        event_id = row["id"]
+        event = events.get(event_id)
+        if event is None:
+            event = {k: row[k] for k in row.keys() if k not in _DETECTION_ALIAS_SET}
+            event["detections"] = []
+            events[event_id] = event
+        if row["det_id"] is not None:
+            event["detections"].append(
+                {key: row[alias] for alias, key in _DETECTION_ALIASES}
+            )
+    return list(events.values())
+
+
+def _detection_params(event_id: int, d) -> tuple:
+    """_INSERT_DETECTION_SQL parameters for a detection dict or Detection object."""
+    if isinstance(d, dict):
+        return (
+            event_id,
+            d["label"],
+            d["confidence"],
+            d.get("bbox_x1"),
+            d.get("bbox_y1"),
+            d.get("bbox_x2"),
+            d.get("bbox_y2"),
+        )
+    return (event_id, d.label, d.confidence, d.bbox_x1, d.bbox_y1, d.bbox_x2, d.bbox_y2)
+
 
 class EventStore:
     """Async SQLite interface for smart lock events, detections, and thumbnails."""
 
-    def __init__(self, db_path: str, thumbnails_dir: str = "thumbnails") -> None:
+    def __init__(
+        self,
+        db_path: str,
+        thumbnails_dir: str = "thumbnails",
+        read_connections: int = 4,
+        cache_size: int = -64000,
+        temp_store: str = "MEMORY",
+        mmap_size: int = 268435456,
+        wal_autocheckpoint: int = 1000,
+        max_batch: int = 32,
+        checkpoint_interval: float | None = None,
+    ) -> None:
         """
         Initialize EventStore with database and thumbnail storage paths.
 
         Args:
             db_path: Filesystem path to the SQLite database file.
-            thumbnails_dir: Directory where JPEG thumbnails will be stored.
+            thumbnails_dir: Directory where thumbnails (WebP, or small JPEGs
+                            kept as-is) will be stored.
+            read_connections: Size of the read-only connection pool. Readers run
+                on their own aiosqlite threads so dashboard queries never queue
+                behind pipeline writes. 0 routes reads through the writer.
+            cache_size: PRAGMA cache_size per connection (negative = KiB;
+                        -64000 ≈ 64 MB upper bound).
+            temp_store: PRAGMA temp_store — "DEFAULT", "FILE" or "MEMORY".
+            mmap_size: PRAGMA mmap_size in bytes (0 disables memory-mapped I/O).
+            wal_autocheckpoint: PRAGMA wal_autocheckpoint in WAL pages.
+            max_batch: Most events committed in one write_event() transaction.
+            checkpoint_interval: Seconds between background
+                PRAGMA wal_checkpoint(TRUNCATE) runs. When set, writer-triggered
+                autocheckpoints are disabled (wal_autocheckpoint=0) so commits
+                never pay for a checkpoint; None keeps wal_autocheckpoint.
         """
+        temp_store = temp_store.upper()
+        if temp_store not in _TEMP_STORE_MODES:
+            raise ValueError(f"temp_store must be one of {sorted(_TEMP_STORE_MODES)}, got {temp_store!r}")
+
         self.db_path = db_path
         self.thumbnails_dir = Path(thumbnails_dir)
+        # Per-connection tuning PRAGMAs, applied in initialize() before any DDL
+        self._connection_pragmas = (
+            f"PRAGMA cache_size={int(cache_size)}",
+            f"PRAGMA temp_store={temp_store}",
+            f"PRAGMA mmap_size={int(mmap_size)}",
+        )
+        self._checkpoint_interval = checkpoint_interval
+        self._wal_autocheckpoint = 0 if checkpoint_interval else int(wal_autocheckpoint)
+        self._checkpoint_task: asyncio.Task | None = None
+        # Single write connection; all writes are serialized by _write_lock
         self.db: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        # Events waiting for the group-commit flusher: (row, detections, future)
+        self._pending_events: list[tuple[tuple, list[dict] | None, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._max_batch = max_batch
+        # WAL lets readers see committed data while a write is in flight.
+        # An in-memory database is private to its connection, so it gets no pool.
+        self._read_connections = 0 if db_path == ":memory:" else read_connections
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_conns: list[aiosqlite.Connection] = []
+
+        # Write-through cache for get_today_event_count(): (day, count) or None.
+        # _today_gen bumps on every insert so a COUNT(*) that raced a write is discarded.
+        self._today_count: tuple[str, int] | None = None
+        self._today_gen = 0
 
     async def initialize(self) -> None:
         """
@@ -58,48 +277,13 @@ class EventStore:
         await self.db.execute("PRAGMA foreign_keys=ON")
         await self.db.execute("PRAGMA busy_timeout=5000")
         await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.execute(f"PRAGMA wal_autocheckpoint={self._wal_autocheckpoint}")
+        for pragma in self._connection_pragmas:
+            await self.db.execute(pragma)
         await self.db.commit()
 
-        # Create tables
-        await self.db.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id             INTEGER PRIMARY KEY AUTOINCREMENT,
-                camera_id      TEXT    NOT NULL DEFAULT 'front_door',
-                recorded_at    TEXT    NOT NULL,
-                event_type     TEXT    NOT NULL DEFAULT 'motion',
-                recording_id   TEXT,
-                person_name    TEXT,
-                face_confidence REAL,
-                face_distance  REAL,
-                unlock_granted INTEGER NOT NULL DEFAULT 0,
-                door_action    TEXT    DEFAULT 'none',
-                thumbnail_path TEXT,
-                alert_sent     INTEGER NOT NULL DEFAULT 0,
-                created_at     TEXT    NOT NULL DEFAULT (datetime('now', '-6 hours'))
-            )
-        """)
-
-        await self.db.execute("""
-            CREATE TABLE IF NOT EXISTS detections (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_id    INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
-                label       TEXT    NOT NULL,
-                confidence  REAL    NOT NULL,
-                bbox_x1     REAL,
-                bbox_y1     REAL,
-                bbox_x2     REAL,
-                bbox_y2     REAL
-            )
-        """)
-
-        await self.db.execute("""
-            CREATE TABLE IF NOT EXISTS persons (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                name         TEXT    NOT NULL UNIQUE,
-                display_name TEXT,
-                created_at   TEXT    NOT NULL DEFAULT (datetime('now', '-6 hours'))
-            )
-        """)
+        # Create tables and indexes in one worker-thread dispatch
+        await self.db.executescript(_SCHEMA_SQL)
 
         # Idempotent migration: add auto_unlock column to persons table
         try:
@@ -111,52 +295,92 @@ class EventStore:
         except Exception:
             pass  # Column already exists
 
-        # Create indexes for common query patterns
-        await self.db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_recorded_at ON events(recorded_at DESC)"
-        )
-        await self.db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_camera_id ON events(camera_id)"
-        )
-        await self.db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_person_name ON events(person_name)"
-        )
-        await self.db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_detections_event_id ON detections(event_id)"
-        )
-        await self.db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_detections_label ON detections(label)"
+        # Open the read pool only after the schema exists
+        for _ in range(self._read_connections):
+            reader = await aiosqlite.connect(self.db_path)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA busy_timeout=5000")
+            for pragma in self._connection_pragmas:
+                await reader.execute(pragma)
+            await reader.execute("PRAGMA query_only=ON")
+            self._reader_conns.append(reader)
+            self._readers.put_nowait(reader)
+
+        logger.info(
+            "EventStore initialized: %s (%d read connections)",
+            self.db_path, len(self._reader_conns),
         )
 
-        await self.db.commit()
-        logger.info("EventStore initialized: %s", self.db_path)
+    @asynccontextmanager
+    async def _acquire_reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool (the writer if there is no pool)."""
+        if not self._reader_conns:
+            yield self.db
+            return
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
 
-    def save_thumbnail(self, frame_bytes: bytes, event_timestamp: str) -> str | None:
+    def save_thumbnail(
+        self,
+        frame_bytes: bytes,
+        event_timestamp: str,
+        frame_array: np.ndarray | None = None,
+    ) -> str | None:
         """
-        Save a video frame as a JPEG thumbnail to the thumbnails directory.
+        Save a video frame as a thumbnail to the thumbnails directory.
 
-        This is a synchronous method because Pillow image operations are
-        CPU-bound and should complete before the database write. Thumbnail
+        This is a synchronous, CPU-bound method — callers on the event loop run
+        it via run_in_executor and await it before the database write. Thumbnail
         failures are non-fatal — the event is always stored regardless.
 
+        JPEG input of at most THUMBNAIL_PASSTHROUGH_MAX_BYTES that already fits
+        within THUMBNAIL_MAX_SIDE is written as-is, avoiding a lossy decode +
+        re-encode; Pillow still parses the header so corrupt data is rejected.
+        Anything else is downscaled to THUMBNAIL_MAX_SIDE and stored as WebP.
+
         Args:
             frame_bytes: Raw image bytes (any PIL-supported format).
             event_timestamp: ISO 8601 timestamp used to build the filename.
+            frame_array: Optional RGB ndarray already decoded from frame_bytes;
+                         used instead of decoding frame_bytes again.
 
         Returns:
-            Relative path string (e.g. "thumbnails/2026-02-25T10-30-00.jpg")
+            Relative path string (e.g. "thumbnails/2026-02-25T10-30-00.webp")
             or None if any error occurs.
         """
         try:
             # Sanitize timestamp for filesystem use
-            safe_ts = event_timestamp.replace(":", "-").replace(".", "-")
-            filename = f"{safe_ts}.jpg"
-            path = self.thumbnails_dir / filename
+            stem = event_timestamp.translate(_TS_SANITIZE)
 
+            # Image.open only reads the header here — no pixel decode yet
             img = Image.open(io.BytesIO(frame_bytes))
-            img.save(str(path), "JPEG", quality=85)
+            if (
+                frame_bytes[:3] == _JPEG_SOI
+                and img.format == "JPEG"
+                and len(frame_bytes) <= THUMBNAIL_PASSTHROUGH_MAX_BYTES
+                and max(img.size) <= THUMBNAIL_MAX_SIDE
+            ):
+                path = self.thumbnails_dir / f"{stem}.jpg"
+                path.write_bytes(frame_bytes)
+                logger.debug("Thumbnail saved (passthrough): %s", path)
+                return path.as_posix()
+
+            if frame_array is not None:
+                img = Image.fromarray(frame_array)
+            else:
+                # Let libjpeg downscale during decode; no-op for non-JPEG input
+                img.draft("RGB", THUMBNAIL_DRAFT_SIZE)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGB")
+            img.thumbnail((THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE), Image.Resampling.LANCZOS)
 
-            relative = str(self.thumbnails_dir / filename)
+            path = self.thumbnails_dir / f"{stem}.webp"
+            img.save(path, "WEBP", quality=THUMBNAIL_WEBP_QUALITY, method=4)
+
+            relative = path.as_posix()
             logger.debug("Thumbnail saved: %s", relative)
             return relative
         except Exception:
@@ -175,11 +399,15 @@ class EventStore:
         unlock_granted: bool = False,
         door_action: str = "none",
         thumbnail_path: str | None = None,
-        detections: list[dict] | None = None,
+        detections: list | None = None,
     ) -> int:
         """
         Write an event (and optional detections) to the database atomically.
 
+        The insert is queued and committed by a group-commit flusher together
+        with any other events written concurrently; this call returns once the
+        transaction holding the event has committed.
+
         Args:
             camera_id: Identifier for the Ring camera (e.g. 'front_door').
             recorded_at: ISO 8601 UTC timestamp of when the event occurred.
@@ -189,61 +417,177 @@ class EventStore:
             face_confidence: Derived confidence score (max(0.0, 1.0 - face_distance)).
             face_distance: Raw euclidean distance from face_recognition library.
             unlock_granted: True if door was unlocked for this event.
-            door_action: 'unlocked', 'locked', or 'none'.
-            thumbnail_path: Relative path to saved JPEG thumbnail.
-            detections: List of YOLO detection dicts with keys:
-                        label, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2.
+            door_action: 'unlocked', 'locked', 'none', or 'pending' while an
+                         unlock is in flight (see update_door_action).
+            thumbnail_path: Relative path returned by save_thumbnail()
+                            (.webp, or .jpg for passed-through JPEGs).
+            detections: YOLO detections — object_detector.Detection objects
+                        (stored as-is, no dict conversion needed) or dicts with
+                        keys: label, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2.
 
         Returns:
             Integer event_id of the newly inserted event row.
         """
-        cursor = await self.db.execute(
-            """
-            INSERT INTO events (
-                camera_id, recorded_at, event_type, recording_id,
-                person_name, face_confidence, face_distance,
-                unlock_granted, door_action, thumbnail_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                camera_id,
-                recorded_at,
-                event_type,
-                recording_id,
-                person_name,
-                face_confidence,
-                face_distance,
-                1 if unlock_granted else 0,
-                door_action,
-                thumbnail_path,
-            ),
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[int] = loop.create_future()
+        row = (
+            camera_id,
+            recorded_at,
+            event_type,
+            recording_id,
+            person_name,
+            face_confidence,
+            face_distance,
+            1 if unlock_granted else 0,
+            door_action,
+            thumbnail_path,
         )
-        event_id = cursor.lastrowid
+        self._pending_events.append((row, detections, future))
 
-        if detections:
-            await self.db.executemany(
-                """
-                INSERT INTO detections (event_id, label, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    (
-                        event_id,
-                        d["label"],
-                        d["confidence"],
-                        d.get("bbox_x1"),
-                        d.get("bbox_y1"),
-                        d.get("bbox_x2"),
-                        d.get("bbox_y2"),
-                    )
-                    for d in detections
-                ],
-            )
+        # Group commit: one flusher drains everything queued while it runs, so a
+        # burst of events shares a single transaction (and a single WAL fsync).
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_pending_events())
 
-        await self.db.commit()
+        # Started lazily in the writer's loop: the WAL only grows when we write
+        if self._checkpoint_interval:
+            task = self._checkpoint_task
+            if task is None or task.done() or task.get_loop() is not loop:
+                self._checkpoint_task = loop.create_task(self._checkpoint_loop())
+
+        event_id = await future
         logger.debug("Wrote event %d (camera=%s, person=%s)", event_id, camera_id, person_name)
         return event_id
 
+    async def _flush_pending_events(self) -> None:
+        """
+        Write queued events in BEGIN IMMEDIATE transactions of up to max_batch events.
+
+        Resolves each caller's future with its event_id once the batch commits.
+        If the batch is rolled back, its events are retried one per
+        transaction, so only the writer whose row fails gets the exception.
+        """
+        while self._pending_events:
+            batch = self._pending_events[: self._max_batch]
+            del self._pending_events[: self._max_batch]
+
+            async with self._write_lock:
+                try:
+                    results: list[int | Exception] = await self._insert_events(batch)
+                    if len(batch) > 1:
+                        logger.debug("Committed %d events in one transaction", len(batch))
+                except Exception as exc:
+                    if len(batch) == 1:
+                        results = [exc]
+                    else:
+                        logger.warning(
+                            "Batch of %d events rolled back (%s); retrying one per transaction",
+                            len(batch),
+                            exc,
+                        )
+                        results = []
+                        for item in batch:
+                            try:
+                                results.extend(await self._insert_events([item]))
+                            except Exception as item_exc:
+                                results.append(item_exc)
+
+            for (row, _, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    if not future.done():
+                        future.set_exception(result)
+                    continue
+                # After commit, so a reader's COUNT(*) never misses a counted row
+                self._bump_today_count(row[1])
+                if not future.done():
+                    future.set_result(result)
+
+    async def _insert_events(self, batch: list) -> list[int]:
+        """
+        Insert queued events and their detections in one transaction.
+
+        Caller holds _write_lock. Rolls back and re-raises on any failure.
+
+        Returns:
+            The new event ids, in batch order.
+        """
+        try:
+            # IMMEDIATE takes the write lock up front — no deferred
+            # read-to-write upgrade that could hit SQLITE_BUSY mid-batch
+            await self.db.execute("BEGIN IMMEDIATE")
+            event_ids = []
+            for row, detections, _ in batch:
+                cursor = await self.db.execute(_INSERT_EVENT_SQL, row)
+                event_id = cursor.lastrowid
+                event_ids.append(event_id)
+
+                if detections:
+                    await self.db.executemany(
+                        _INSERT_DETECTION_SQL,
+                        [_detection_params(event_id, d) for d in detections],
+                    )
+
+            await self.db.commit()
+        except Exception:
+            try:
+                await self.db.rollback()
+            except Exception:
+                logger.exception("Rollback after failed event batch also failed")
+            raise
+        return event_ids
+
+    async def update_door_action(
+        self, event_id: int, unlock_granted: bool, door_action: str
+    ) -> None:
+        """
+        Record the outcome of an unlock dispatched after the event was written.
+
+        Args:
+            event_id: Event written earlier with door_action='pending'.
+            unlock_granted: True if the door was unlocked.
+            door_action: Final door action ('unlocked' or 'none').
+        """
+        async with self._write_lock:
+            await self.db.execute(
+                "UPDATE events SET unlock_granted = ?, door_action = ? WHERE id = ?",
+                (1 if unlock_granted else 0, door_action, event_id),
+            )
+            await self.db.commit()
+
+    async def checkpoint(self) -> tuple[int, int, int]:
+        """
+        Checkpoint the WAL into the database file and truncate it to zero bytes.
+
+        Runs on the writer connection under the write lock, so it never
+        interleaves with an event batch.
+
+        Returns:
+            (busy, log, checkpointed) as reported by PRAGMA wal_checkpoint;
+            busy=1 means a reader kept the checkpoint from completing.
+        """
+        async with self._write_lock:
+            async with self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)") as cursor:
+                busy, log, checkpointed = await cursor.fetchone()
+
+        if busy:
+            logger.warning(
+                "WAL checkpoint incomplete (busy): %d of %d frames checkpointed",
+                checkpointed, log,
+            )
+        else:
+            logger.debug("WAL checkpoint: %d of %d frames checkpointed", checkpointed, log)
+        return busy, log, checkpointed
+
+    async def _checkpoint_loop(self) -> None:
+        """Run checkpoint() every checkpoint_interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self._checkpoint_interval)
+            try:
+                await self.checkpoint()
+            except Exception:
+                logger.exception("Background WAL checkpoint failed")
+
     async def get_event(self, event_id: int) -> dict | None:
         """
         Retrieve a single event with its associated detections.
@@ -255,60 +599,91 @@ class EventStore:
             Dict with all event fields plus a 'detections' list, or None if
             the event does not exist.
         """
-        async with self.db.execute(
-            "SELECT * FROM events WHERE id = ?", (event_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-
-        if row is None:
-            return None
-
-        event = dict(row)
-
-        async with self.db.execute(
-            "SELECT * FROM detections WHERE event_id = ?", (event_id,)
+        async with self._acquire_reader() as conn, conn.execute(
+            f"""
+            SELECT e.*, {_DETECTION_SELECT}
+            FROM events e
+            LEFT JOIN detections d ON d.event_id = e.id
+            WHERE e.id = ?
+            ORDER BY d.id
+            """,
+            (event_id,),
         ) as cursor:
-            detection_rows = await cursor.fetchall()
+            rows = await cursor.fetchall()
 
-        event["detections"] = [dict(r) for r in detection_rows]
-        return event
+        events = _group_event_rows(rows)
+        return events[0] if events else None
 
-    async def get_recent_events(self, limit: int = 20, offset: int = 0) -> list[dict]:
+    async def get_recent_events(
+        self, limit: int = 20, offset: int = 0, camera_id: str | None = None
+    ) -> list[dict]:
         """
         Retrieve recent events ordered by recorded_at descending.
 
         Args:
             limit: Maximum number of events to return.
             offset: Number of events to skip (for pagination).
+            camera_id: Only return events from this camera (served by the
+                       idx_events_cam_time composite index). None = all cameras.
 
         Returns:
             List of event dicts, each including a nested 'detections' list.
         """
-        async with self.db.execute(
-            "SELECT * FROM events ORDER BY recorded_at DESC LIMIT ? OFFSET ?",
-            (limit, offset),
+        where_clause = ""
+        params: list = []
+        if camera_id is not None:
+            where_clause = "WHERE camera_id = ?"
+            params.append(camera_id)
+        params.extend([limit, offset])
+
+        # One round-trip: page the events in a subquery, then LEFT JOIN detections
+        async with self._acquire_reader() as conn, conn.execute(
+            f"""
+            SELECT e.*, {_DETECTION_SELECT}
+            FROM (SELECT * FROM events {where_clause} ORDER BY recorded_at DESC LIMIT ? OFFSET ?) e
+            LEFT JOIN detections d ON d.event_id = e.id
+            ORDER BY e.recorded_at DESC, d.id
+            """,
+            params,
         ) as cursor:
             rows = await cursor.fetchall()
 
-        events = []
-        for row in rows:
-            event = dict(row)
-            async with self.db.execute(
-                "SELECT * FROM detections WHERE event_id = ?", (event["id"],)
-            ) as det_cursor:
-                det_rows = await det_cursor.fetchall()
-            event["detections"] = [dict(r) for r in det_rows]
-            events.append(event)
-
-        return events
+        return _group_event_rows(rows)
+
+    def _bump_today_count(self, recorded_at: str) -> None:
+        """Keep the cached today count in step with a newly inserted event."""
+        self._today_gen += 1
+        cached = self._today_count
+        if cached is None:
+            return
+        day, count = cached
+        event_day = _sql_date(recorded_at)
+        if event_day is None:
+            self._today_count = None  # unparseable timestamp — let SQLite decide
+        elif event_day == day:
+            self._today_count = (day, count + 1)
 
     async def get_today_event_count(self) -> int:
-        """Count events recorded today (UTC calendar day)."""
-        async with self.db.execute(
+        """
+        Count events recorded today (UTC calendar day).
+
+        Served from an in-memory count maintained by write_event(); the COUNT(*)
+        query only runs on first use and after the day rolls over.
+        """
+        today = _sql_today()
+        cached = self._today_count
+        if cached is not None and cached[0] == today:
+            return cached[1]
+
+        gen = self._today_gen
+        async with self._acquire_reader() as conn, conn.execute(
             "SELECT COUNT(*) FROM events WHERE DATE(recorded_at) = DATE('now', '-6 hours')"
         ) as cursor:
             row = await cursor.fetchone()
-        return row[0] if row else 0
+        count = row[0] if row else 0
+        if gen == self._today_gen:
+            self._today_count = (today, count)
+        return count
 
     async def get_filtered_events(
         self,
@@ -358,23 +733,18 @@ class EventStore:
         if where_fragments:
             where_clause = "WHERE " + " AND ".join(where_fragments)
 
-        sql = f"SELECT * FROM events {where_clause} ORDER BY recorded_at DESC LIMIT ? OFFSET ?"
+        sql = f"""
+            SELECT e.*, {_DETECTION_SELECT}
+            FROM (SELECT * FROM events {where_clause} ORDER BY recorded_at DESC LIMIT ? OFFSET ?) e
+            LEFT JOIN detections d ON d.event_id = e.id
+            ORDER BY e.recorded_at DESC, d.id
+        """
         params.extend([limit, offset])
 
-        async with self.db.execute(sql, params) as cursor:
+        async with self._acquire_reader() as conn, conn.execute(sql, params) as cursor:
             rows = await cursor.fetchall()
 
-        events = []
-        for row in rows:
-            event = dict(row)
-            async with self.db.execute(
-                "SELECT * FROM detections WHERE event_id = ?", (event["id"],)
-            ) as det_cursor:
-                det_rows = await det_cursor.fetchall()
-            event["detections"] = [dict(r) for r in det_rows]
-            events.append(event)
-
-        return events
+        return _group_event_rows(rows)
 
     # ------------------------------------------------------------------
     # Analytics aggregate queries
@@ -382,7 +752,7 @@ class EventStore:
 
     async def get_hourly_heatmap(self, days: int = 30) -> list[dict]:
         """Activity heatmap data: event count per (day_of_week, hour) bucket."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT CAST(strftime('%w', recorded_at) AS INTEGER) AS day_of_week,
                    CAST(strftime('%H', recorded_at) AS INTEGER) AS hour,
@@ -398,7 +768,7 @@ class EventStore:
 
     async def get_detection_breakdown(self, days: int = 30) -> list[dict]:
         """Detection label breakdown with counts and average confidence."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT d.label,
                    COUNT(*) AS count,
@@ -415,7 +785,7 @@ class EventStore:
 
     async def get_daily_timeline(self, days: int = 30) -> list[dict]:
         """Per-day event counts with stranger / known / unlock breakdowns."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT DATE(recorded_at) AS date,
                    COUNT(*) AS count,
@@ -433,7 +803,7 @@ class EventStore:
 
     async def get_analytics_stats(self) -> dict:
         """High-level aggregate stats across all events."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT COUNT(*) AS total_events,
                    SUM(CASE WHEN DATE(recorded_at) = DATE('now', '-6 hours') THEN 1 ELSE 0 END) AS today_count,
@@ -451,7 +821,7 @@ class EventStore:
 
     async def get_peak_hours(self, days: int = 30) -> list[dict]:
         """Event count per hour-of-day with average per day."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT CAST(strftime('%H', recorded_at) AS INTEGER) AS hour,
                    COUNT(*) AS count,
@@ -467,7 +837,7 @@ class EventStore:
 
     async def get_recent_events_for_orb(self, limit: int = 50) -> list[dict]:
         """Recent events with their primary (highest-confidence) detection label."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             """
             SELECT e.id, e.recorded_at, e.event_type, e.person_name, e.unlock_granted,
                    (SELECT d.label FROM detections d
@@ -505,7 +875,7 @@ class EventStore:
             params.append(camera)
 
         sql = f"SELECT id, recorded_at, person_name, thumbnail_path, camera_id FROM events WHERE {' AND '.join(where)} ORDER BY recorded_at ASC"
-        async with self.db.execute(sql, params) as cursor:
+        async with self._acquire_reader() as conn, conn.execute(sql, params) as cursor:
             return [dict(r) for r in await cursor.fetchall()]
 
     # ------------------------------------------------------------------
@@ -514,7 +884,7 @@ class EventStore:
 
     async def get_persons(self, known_faces_dir: Path | None = None) -> list[dict]:
         """List all persons with face image count from the known_faces directory."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             "SELECT id, name, display_name, auto_unlock, created_at FROM persons ORDER BY name"
         ) as cursor:
             rows = await cursor.fetchall()
@@ -530,23 +900,43 @@ class EventStore:
             persons.append(p)
         return persons
 
+    async def get_person(self, name: str, known_faces_dir: Path | None = None) -> dict | None:
+        """Fetch one person by name with the face image count for just that person."""
+        async with self._acquire_reader() as conn, conn.execute(
+            "SELECT id, name, display_name, auto_unlock, created_at FROM persons WHERE name = ?",
+            (name,),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None
+
+        p = dict(row)
+        if known_faces_dir and known_faces_dir.exists():
+            p["face_count"] = len(list(known_faces_dir.glob(f"{name}_*")))
+        else:
+            p["face_count"] = 0
+        return p
+
     async def add_person(self, name: str, display_name: str | None = None, auto_unlock: bool = True) -> None:
         """Insert a person into the persons table (upsert — ignores if exists)."""
-        await self.db.execute(
-            """
-            INSERT INTO persons (name, display_name, auto_unlock)
-            VALUES (?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                display_name = COALESCE(excluded.display_name, persons.display_name)
-            """,
-            (name, display_name or name.replace("_", " ").title(), 1 if auto_unlock else 0),
-        )
-        await self.db.commit()
+        async with self._write_lock:
+            await self.db.execute(
+                """
+                INSERT INTO persons (name, display_name, auto_unlock)
+                VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    display_name = COALESCE(excluded.display_name, persons.display_name)
+                """,
+                (name, display_name or name.replace("_", " ").title(), 1 if auto_unlock else 0),
+            )
+            await self.db.commit()
 
     async def delete_person(self, name: str, known_faces_dir: Path | None = None) -> bool:
         """Delete a person from the DB and remove their face images from disk."""
-        cursor = await self.db.execute("DELETE FROM persons WHERE name = ?", (name,))
-        await self.db.commit()
+        async with self._write_lock:
+            cursor = await self.db.execute("DELETE FROM persons WHERE name = ?", (name,))
+            await self.db.commit()
 
         if known_faces_dir and known_faces_dir.exists():
             for img in known_faces_dir.glob(f"{name}_*"):
@@ -559,16 +949,17 @@ class EventStore:
 
     async def set_person_auto_unlock(self, name: str, enabled: bool) -> bool:
         """Update a person's auto_unlock flag. Returns True if the row was updated."""
-        cursor = await self.db.execute(
-            "UPDATE persons SET auto_unlock = ? WHERE name = ?",
-            (1 if enabled else 0, name),
-        )
-        await self.db.commit()
+        async with self._write_lock:
+            cursor = await self.db.execute(
+                "UPDATE persons SET auto_unlock = ? WHERE name = ?",
+                (1 if enabled else 0, name),
+            )
+            await self.db.commit()
         return cursor.rowcount > 0
 
     async def get_auto_unlock_names(self) -> set[str]:
         """Return the set of person names that have auto_unlock enabled."""
-        async with self.db.execute(
+        async with self._acquire_reader() as conn, conn.execute(
             "SELECT name FROM persons WHERE auto_unlock = 1"
         ) as cursor:
             rows = await cursor.fetchall()
@@ -588,19 +979,39 @@ class EventStore:
 
         added = 0
         for name in disk_names:
-            async with self.db.execute(
+            async with self._acquire_reader() as conn, conn.execute(
                 "SELECT 1 FROM persons WHERE name = ?", (name,)
             ) as cursor:
-                if await cursor.fetchone() is None:
-                    await self.add_person(name)
-                    added += 1
+                exists = await cursor.fetchone() is not None
+            if not exists:
+                await self.add_person(name)
+                added += 1
 
         if added:
             logger.info("Synced %d person(s) from disk to DB", added)
         return added
 
     async def close(self) -> None:
-        """Close the database connection and release resources."""
+        """Flush queued events, stop the checkpoint timer, then close all connections."""
+        task = self._flush_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            await task
+        self._flush_task = None
+
+        task = self._checkpoint_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._checkpoint_task = None
+
+        for reader in self._reader_conns:
+            await reader.close()
+        self._reader_conns.clear()
+        self._readers = asyncio.Queue()
+
         if self.db is not None:
             await self.db.close()
             self.db = None
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Export YOLO11n to an FP16 NCNN model for ARM deployments.
+
+Usage:
+    python export_ncnn.py [weights.pt]
+
+Example:
+    python export_ncnn.py yolo11n.pt
+
+Produces yolo11n_ncnn_model/ (model.ncnn.param + model.ncnn.bin) next to the
+weights. On aarch64/armv7l Config.YOLO_MODEL_PATH defaults to that directory
+when it exists; elsewhere set YOLO_MODEL_PATH=yolo11n_ncnn_model explicitly.
+
+Ultralytics' NCNN export accepts only half/batch (no INT8 calibration), and
+its NCNN backend infers one image per call, so the model is exported at
+batch 1; ObjectDetector feeds exported models one frame at a time.
+"""
+
+import sys
+
+from ultralytics import YOLO
+
+
+def export(weights: str = "yolo11n.pt") -> str:
+    model = YOLO(weights)
+    output = model.export(format="ncnn", half=True, batch=1, imgsz=640)
+    print(f"Exported FP16 NCNN model to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python export_ncnn.py [weights.pt]")
+        sys.exit(1)
+
+    export(*sys.argv[1:])
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Export YOLO11n to ONNX for ONNX Runtime on development machines.
+
+Usage:
+    python export_onnx.py [weights.pt]
+
+Example:
+    python export_onnx.py yolo11n.pt
+
+Produces yolo11n.onnx next to the weights. Set YOLO_MODEL_PATH=yolo11n.onnx
+to run detection on ONNX Runtime (CoreML execution provider on macOS, CPU
+elsewhere) instead of PyTorch. Requires `pip install onnxruntime`.
+"""
+
+import sys
+
+from ultralytics import YOLO
+
+
+def export(weights: str = "yolo11n.pt") -> str:
+    model = YOLO(weights)
+    output = model.export(format="onnx", opset=17, simplify=True, imgsz=640)
+    print(f"Exported ONNX model to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python export_onnx.py [weights.pt]")
+        sys.exit(1)
+
+    export(*sys.argv[1:])
@@ -1,13 +1,44 @@
+"""
+FaceRecognizer: HOG face detection + dlib 128-D encodings against known_faces/.
+
+Snapshot bytes are decoded with Pillow and handed to numpy via np.asarray
+(no extra copy); convert("RGB") only runs when the source is not already
+RGB. Requires Pillow >= 10, whose array export hands numpy the whole image
+buffer in one tobytes() call instead of small fixed-size chunks.
+"""
+
 import io
 import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
 from pathlib import Path
 
+import cv2
 import face_recognition
 import numpy as np
 from PIL import Image
 
+from _paths import RUNTIME_DIR
+from config import Config
+
 logger = logging.getLogger(__name__)
 
+# Per-image encoding cache kept inside known_faces/ (dot-file, so never loaded as a face)
+ENCODING_CACHE_NAME = ".cache.npz"
+ENCODING_DIM = 128
+
+# HOG face detection runs on frames downscaled to at most this width; the
+# 128-D encodings are still computed on the full-resolution image.
+HOG_MAX_WIDTH = 640
+
+# Debug frame capture (DEBUG logging + Config.SAVE_DEBUG_FRAMES): newest N kept
+DEBUG_FRAMES_DIR = RUNTIME_DIR / "debug_frames"
+DEBUG_FRAMES_KEEP = 50
+DEBUG_FRAME_SIZE = (640, 360)
+
 
 class FaceRecognizer:
     """Loads known faces and matches against doorbell snapshots."""
@@ -15,19 +46,60 @@ class FaceRecognizer:
     def __init__(self, known_faces_dir: Path, tolerance: float = 0.5):
         self.tolerance = tolerance
         self.known_faces_dir = known_faces_dir
-        self.known_encodings: list[np.ndarray] = []
+        # (K, 128) matrix of known encodings; row i belongs to known_names[i]
+        self.known_encodings: np.ndarray = np.empty((0, ENCODING_DIM))
         self.known_names: list[str] = []
+        # (encodings, squared norms, names) swapped as one tuple so identify()
+        # on a worker thread never pairs arrays from different loads
+        self._known: tuple[np.ndarray, np.ndarray, list[str]] = (
+            self.known_encodings, np.empty(0), self.known_names,
+        )
+        # Serializes writers (reload / enroll) so an incremental add is never
+        # overwritten by a reload that scanned the directory before it
+        self._update_lock = threading.Lock()
         self._load_known_faces(known_faces_dir)
+        self._debug_frames: deque[Path] = deque()
+        if Config.SAVE_DEBUG_FRAMES and not logger.isEnabledFor(logging.DEBUG):
+            # The apps log at INFO; opting in turns on DEBUG for this module
+            # only, so the setting alone brings the debug frames back
+            logger.setLevel(logging.DEBUG)
+        if self._debug_frames_enabled():
+            self._prune_debug_frames()
+
+    @staticmethod
+    def _debug_frames_enabled() -> bool:
+        return Config.SAVE_DEBUG_FRAMES and logger.isEnabledFor(logging.DEBUG)
+
+    def _prune_debug_frames(self) -> None:
+        """Trim debug_frames/ to the newest DEBUG_FRAMES_KEEP files (by mtime)."""
+        DEBUG_FRAMES_DIR.mkdir(exist_ok=True)
+        frames = sorted(DEBUG_FRAMES_DIR.glob("frame_*.jpg"), key=lambda p: p.stat().st_mtime)
+        for old in frames[:-DEBUG_FRAMES_KEEP]:
+            old.unlink(missing_ok=True)
+        self._debug_frames = deque(frames[-DEBUG_FRAMES_KEEP:])
+
+    def _save_debug_frame(self, image: Image.Image) -> None:
+        """Save a reduced copy of the analysed frame, rotating out the oldest."""
+        DEBUG_FRAMES_DIR.mkdir(exist_ok=True)
+        debug_path = DEBUG_FRAMES_DIR / f"frame_{time.time_ns() // 1_000_000}.jpg"
+        image.thumbnail(DEBUG_FRAME_SIZE)
+        image.save(debug_path)
+        self._debug_frames.append(debug_path)
+        while len(self._debug_frames) > DEBUG_FRAMES_KEEP:
+            self._debug_frames.popleft().unlink(missing_ok=True)
+        logger.debug(f"Saved debug frame to {debug_path}")
 
     def reload(self) -> None:
-        """Clear and re-load all known face encodings from disk."""
-        self.known_encodings.clear()
-        self.known_names.clear()
-        self._load_known_faces(self.known_faces_dir)
+        """Re-load all known face encodings from disk (cached images are not re-encoded)."""
+        with self._update_lock:
+            self._load_known_faces(self.known_faces_dir)
         logger.info("Face encodings reloaded (%d encodings)", len(self.known_encodings))
 
     def enroll(self, name: str, image_bytes: bytes, extension: str = ".jpg") -> str:
-        """Validate an image has exactly one face, save to known_faces, and reload.
+        """Validate an image has exactly one face, save to known_faces, and add it.
+
+        The image is decoded once; its encoding is appended to the in-memory
+        set and the .npz cache instead of rescanning known_faces/.
 
         Args:
             name: Person identifier (e.g. 'yashesh').
@@ -40,7 +112,10 @@ class FaceRecognizer:
         Raises:
             ValueError: If no face or multiple faces are detected.
         """
-        image = face_recognition.load_image_file(io.BytesIO(image_bytes))
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        image = np.asarray(img)
         locations = face_recognition.face_locations(image)
 
         if len(locations) == 0:
@@ -48,20 +123,39 @@ class FaceRecognizer:
         if len(locations) > 1:
             raise ValueError(f"Multiple faces ({len(locations)}) detected — upload a photo with exactly one face")
 
-        # Determine next index
-        existing = list(self.known_faces_dir.glob(f"{name}_*"))
-        next_idx = len(existing) + 1
-        filename = f"{name}_{next_idx}{extension.lower()}"
-        dest = self.known_faces_dir / filename
+        encoding = face_recognition.face_encodings(image, locations)[0]
 
-        # Save the image
-        img = Image.open(io.BytesIO(image_bytes))
-        img.save(str(dest), "JPEG", quality=95)
+        with self._update_lock:
+            # Determine next index
+            existing = list(self.known_faces_dir.glob(f"{name}_*"))
+            next_idx = len(existing) + 1
+            filename = f"{name}_{next_idx}{extension.lower()}"
+            dest = self.known_faces_dir / filename
+
+            # Save the already-decoded image (no second decode)
+            img.save(str(dest), "JPEG", quality=95, optimize=False)
+
+            self._add_known(name, encoding)
 
-        # Reload encodings
-        self.reload()
+            # Record the new file in the cache so the next reload() skips it
+            st = dest.stat()
+            cache = _read_encoding_cache(self.known_faces_dir)
+            cache[filename] = (st.st_mtime_ns, st.st_size, encoding)
+            _write_encoding_cache(self.known_faces_dir, cache)
+
+        logger.info(f"Enrolled face: {name} from {filename}")
         return filename
 
+    def _add_known(self, name: str, encoding: np.ndarray) -> None:
+        """Append one encoding to the known set, leaving existing rows untouched."""
+        known, known_sq_norms, known_names = self._known
+        known = np.ascontiguousarray(np.vstack([known, encoding[None, :]]))
+        known_sq_norms = np.append(known_sq_norms, encoding @ encoding)
+        known_names = [*known_names, name]
+        self._known = (known, known_sq_norms, known_names)
+        self.known_encodings = known
+        self.known_names = known_names
+
     def _load_known_faces(self, directory: Path) -> None:
         """Load and encode all face images from the known_faces directory.
 
@@ -73,9 +167,19 @@ class FaceRecognizer:
         
         The name is derived from the filename (before the underscore/number).
         Multiple images per person improve accuracy.
+
+        Encodings are cached in known_faces/.cache.npz keyed by each file's
+        (st_mtime_ns, st_size); only new or changed images go through the dlib
+        CNN. The loaded encodings replace known_encodings/known_names in one
+        assignment each, so a concurrent identify() sees old or new, never empty.
         """
         extensions = {".jpg", ".jpeg", ".png", ".bmp"}
 
+        cache = _read_encoding_cache(directory)
+        fresh: dict[str, tuple[int, int, np.ndarray | None]] = {}
+        encodings: list[np.ndarray] = []
+        names: list[str] = []
+
         for img_path in sorted(directory.iterdir()):
             if img_path.suffix.lower() not in extensions:
                 continue
@@ -83,42 +187,118 @@ class FaceRecognizer:
             name = img_path.stem.rsplit("_", 1)[0]
 
             try:
-                image = face_recognition.load_image_file(str(img_path))
-                encodings = face_recognition.face_encodings(image)
+                st = img_path.stat()
+                cached = cache.get(img_path.name)
+                if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                    encoding = cached[2]
+                else:
+                    image = face_recognition.load_image_file(str(img_path))
+                    found = face_recognition.face_encodings(image)
+                    encoding = found[0] if found else None
+                fresh[img_path.name] = (st.st_mtime_ns, st.st_size, encoding)
 
-                if encodings:
-                    self.known_encodings.append(encodings[0])
-                    self.known_names.append(name)
+                if encoding is not None:
+                    encodings.append(encoding)
+                    names.append(name)
                     logger.info(f"Loaded face: {name} from {img_path.name}")
                 else:
                     logger.warning(f"No face found in {img_path.name}")
             except Exception as e:
                 logger.error(f"Error loading {img_path.name}: {e}")
 
+        if fresh.keys() != cache.keys() or any(fresh[k][:2] != cache[k][:2] for k in fresh):
+            _write_encoding_cache(directory, fresh)
+
+        known = np.ascontiguousarray(
+            np.vstack(encodings) if encodings else np.empty((0, ENCODING_DIM))
+        )
+        self._known = (known, np.einsum("ij,ij->i", known, known), names)
+        self.known_encodings = known
+        self.known_names = names
+
         logger.info(
             f"Loaded {len(self.known_encodings)} face encoding(s) "
             f"for {len(set(self.known_names))} person(s)"
         )
 
+    @staticmethod
+    def _distances(unknown: np.ndarray, known: np.ndarray, known_sq_norms: np.ndarray) -> np.ndarray:
+        """Euclidean distances from each of U unknown encodings to all K known ones.
+
+        Uses |u|^2 + |k|^2 - 2 u.k so the bulk of the work is a single (U x 128)
+        @ (128 x K) GEMM; the known-side squared norms are precomputed at load.
+        """
+        sq = (
+            np.einsum("ij,ij->i", unknown, unknown)[:, None]
+            + known_sq_norms[None, :]
+            - 2.0 * unknown @ known.T
+        )
+        # Clamp tiny negatives from floating-point cancellation before the sqrt
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    @staticmethod
+    def _locate_faces(image_array: np.ndarray) -> list[tuple[int, int, int, int]]:
+        """HOG face boxes (top, right, bottom, left) in full-resolution coordinates.
+
+        Frames wider than HOG_MAX_WIDTH are detected on an INTER_AREA downscale
+        without upsampling (~9x fewer HOG windows for 1080p) and the boxes are
+        scaled back. Narrower inputs such as person crops keep the default
+        single upsample so small faces are still found.
+        """
+        height, width = image_array.shape[:2]
+        if width <= HOG_MAX_WIDTH:
+            return face_recognition.face_locations(image_array, model="hog")
+
+        scale = HOG_MAX_WIDTH / width
+        small = cv2.resize(image_array, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        inv = 1.0 / scale
+        return [
+            (
+                max(0, int(top * inv)),
+                min(width, int(right * inv)),
+                min(height, int(bottom * inv)),
+                max(0, int(left * inv)),
+            )
+            for top, right, bottom, left in face_recognition.face_locations(
+                small, number_of_times_to_upsample=0, model="hog"
+            )
+        ]
+
     def identify(self, image_bytes: bytes) -> str | None:
         """Identify a face from snapshot bytes. Returns the matched name or None."""
         try:
             image = Image.open(io.BytesIO(image_bytes))
-            image_array = np.array(image.convert("RGB"))
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image_array = np.asarray(image)
         except Exception as e:
             logger.error(f"Failed to decode image: {e}")
             return None
 
-        # Save the frame for debugging
-        from _paths import RUNTIME_DIR
-        debug_dir = RUNTIME_DIR / "debug_frames"
-        debug_dir.mkdir(exist_ok=True)
-        import time as _time
-        debug_path = debug_dir / f"frame_{int(_time.time())}.jpg"
-        image.save(debug_path)
-        logger.info(f"Saved debug frame to {debug_path}")
+        return self.identify_array(image_array)
+
+    def identify_array(self, image_array: np.ndarray) -> str | None:
+        """Identify a face in an already-decoded (H, W, 3) RGB uint8 array.
+
+        Lets the pipeline decode a frame once and hand crops (array views)
+        straight to HOG/dlib instead of round-tripping through JPEG bytes.
+        """
+        height, width = image_array.shape[:2]
+        if min(height, width) < Config.MIN_FACE_PIXELS:
+            logger.info(f"Image too small for face detection ({width}x{height}px)")
+            return None
+
+        # dlib only accepts C-contiguous buffers; crops of a larger frame are strided views
+        image_array = np.ascontiguousarray(image_array)
 
-        face_locations = face_recognition.face_locations(image_array, model="hog")
+        # Save the frame for debugging (opt-in: extra JPEG encode + disk write)
+        if self._debug_frames_enabled():
+            try:
+                self._save_debug_frame(Image.fromarray(image_array))
+            except Exception as e:
+                logger.warning(f"Failed to save debug frame: {e}")
+
+        face_locations = self._locate_faces(image_array)
         if not face_locations:
             logger.info("No faces detected in frame")
             return None
@@ -127,22 +307,77 @@ class FaceRecognizer:
 
         unknown_encodings = face_recognition.face_encodings(image_array, face_locations)
 
-        for encoding in unknown_encodings:
-            distances = face_recognition.face_distance(self.known_encodings, encoding)
+        known, known_sq_norms, known_names = self._known
+        if unknown_encodings and len(known):
+            # (U, K) distance matrix for every detected face in one pass
+            distances = self._distances(np.asarray(unknown_encodings), known, known_sq_norms)
+            best_indices = distances.argmin(axis=1)
 
-            if len(distances) == 0:
-                continue
-
-            best_idx = np.argmin(distances)
-            best_distance = round(distances[best_idx], 3)
-            closest_name = self.known_names[best_idx]
-            logger.info(f"Closest match: {closest_name} (distance: {best_distance}, "
-                        f"tolerance: {self.tolerance})")
+            for row, best_idx in zip(distances, best_indices):
+                best_distance = round(float(row[best_idx]), 3)
+                closest_name = known_names[best_idx]
+                logger.info(f"Closest match: {closest_name} (distance: {best_distance}, "
+                            f"tolerance: {self.tolerance})")
 
-            if distances[best_idx] <= self.tolerance:
-                confidence = round(1 - distances[best_idx], 3)
-                logger.info(f"Face matched: {closest_name} (confidence: {confidence})")
-                return closest_name
+                if row[best_idx] <= self.tolerance:
+                    confidence = round(1 - float(row[best_idx]), 3)
+                    logger.info(f"Face matched: {closest_name} (confidence: {confidence})")
+                    return closest_name
 
         logger.info("Face detected but distance too high — no match")
         return None
+
+
+def _read_encoding_cache(directory: Path) -> dict[str, tuple[int, int, np.ndarray | None]]:
+    """Load {filename: (mtime_ns, size, encoding-or-None)} from the .npz cache, or {}."""
+    path = directory / ENCODING_CACHE_NAME
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            files = data["files"].tolist()
+            mtimes = data["mtimes"].tolist()
+            sizes = data["sizes"].tolist()
+            has_face = data["has_face"].tolist()
+            encodings = data["encodings"]
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable face encoding cache {path}: {e}")
+        return {}
+
+    return {
+        fname: (mtime, size, encodings[i] if face else None)
+        for i, (fname, mtime, size, face) in enumerate(zip(files, mtimes, sizes, has_face))
+    }
+
+
+def _write_encoding_cache(
+    directory: Path, entries: dict[str, tuple[int, int, np.ndarray | None]]
+) -> None:
+    """Atomically rewrite the .npz cache (temp file + os.replace). Failures are non-fatal."""
+    files = list(entries)
+    mtimes = [entries[fname][0] for fname in files]
+    sizes = [entries[fname][1] for fname in files]
+    has_face = [entries[fname][2] is not None for fname in files]
+    encodings = np.zeros((len(files), ENCODING_DIM))
+    for i, fname in enumerate(files):
+        if has_face[i]:
+            encodings[i] = entries[fname][2]
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cache-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                files=np.array(files, dtype=str),
+                mtimes=np.array(mtimes, dtype=np.int64),
+                sizes=np.array(sizes, dtype=np.int64),
+                has_face=np.array(has_face, dtype=bool),
+                encodings=encodings,
+            )
+        os.replace(tmp_path, directory / ENCODING_CACHE_NAME)
+    except Exception as e:
+        logger.warning(f"Could not write face encoding cache: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
@@ -13,12 +13,18 @@ any asyncio.run calls — uvicorn owns the event loop via app.py.
 
 import asyncio
 import datetime
+import functools
 import logging
-import time
+import os
 import zoneinfo
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 from config import Config
-from object_detector import ObjectDetector, crop_person_bbox, detections_to_dicts
+from object_detector import (
+    ObjectDetector,
+    crop_person_array,
+    decode_frame,
+)
 from event_store import EventStore
 
 logging.basicConfig(
@@ -28,8 +34,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger("smart-lock.pipeline")
 
+# Event timestamps are recorded in the household's local time zone
+EVENT_TZ = zoneinfo.ZoneInfo("America/Chicago")
+
+
+def make_face_pool() -> ThreadPoolExecutor:
+    """
+    Dedicated pool for face recognition (dlib HOG + CNN encoding).
 
-async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, store: EventStore, alerter=None):
+    Kept off the default executor, which aiosqlite and other short blocking
+    calls share, so a slow identify() cannot starve them. Sized to cores minus
+    one (capped at 2) so it does not oversubscribe alongside the YOLO worker.
+    """
+    workers = max(1, min(2, (os.cpu_count() or 2) - 1))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="face")
+
+
+async def polling_loop(
+    ring,
+    recognizer,
+    switchbot,
+    detector: ObjectDetector,
+    store: EventStore,
+    alerter=None,
+    face_pool: Executor | None = None,
+):
     """
     Full motion event pipeline loop.
 
@@ -38,8 +67,14 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
     the event to EventStore, dispatches SwitchBot unlock if a known face was
     matched, and sends Telegram alerts for stranger-detected or unlock events.
 
-    All blocking calls (recognizer.identify, switchbot.unlock) are dispatched
-    via run_in_executor to avoid blocking the asyncio event loop.
+    The unlock runs as a background task so slow lock I/O never delays the next
+    Ring event: the event is stored with door_action="pending" and the task
+    updates the row once the lock answers. On cancellation, in-flight unlocks
+    are awaited before the CancelledError propagates.
+
+    All blocking calls (store.save_thumbnail, recognizer.identify) are dispatched
+    via run_in_executor to avoid blocking the asyncio event loop; switchbot.unlock
+    is awaited directly on the shared async HTTP pool.
 
     Args:
         ring: Authenticated RingClient instance.
@@ -48,12 +83,59 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
         detector: ObjectDetector instance (YOLO async wrapper).
         store: Initialized EventStore instance.
         alerter: Optional TelegramAlerter instance. If None, alerts are skipped.
+        face_pool: Executor for recognizer.identify_array (see make_face_pool). None
+                   uses the loop's default executor.
 
     Raises:
         asyncio.CancelledError: Propagated on graceful shutdown (re-raised after logging).
     """
-    last_unlock_time: float = 0
+    # Monotonic loop clock for the cooldown: immune to wall-clock jumps (NTP)
+    last_unlock_mono: float = float("-inf")
     loop = asyncio.get_running_loop()
+    # One unlock at a time, so back-to-back matches cannot double-dispatch
+    unlock_sem = asyncio.Semaphore(1)
+    unlock_tasks: set[asyncio.Task] = set()
+
+    async def run_unlock(
+        event_id: int, matched_name: str, recorded_at: str, thumbnail_path: str | None
+    ) -> None:
+        """Unlock the door for a stored event, then record the outcome on its row."""
+        nonlocal last_unlock_mono
+        unlock_granted = False
+        door_action = "none"
+
+        async with unlock_sem:
+            # Re-checked under the semaphore: an unlock queued behind this one
+            # must see the cooldown started by it
+            if (elapsed := loop.time() - last_unlock_mono) < Config.UNLOCK_COOLDOWN:
+                logger.info(
+                    f"Face matched ({matched_name}) but cooldown active "
+                    f"({int(Config.UNLOCK_COOLDOWN - elapsed)}s remaining)"
+                )
+            else:
+                try:
+                    success = await switchbot.unlock()
+                    if success:
+                        last_unlock_mono = loop.time()
+                        unlock_granted = True
+                        door_action = "unlocked"
+                        logger.info(f"Door unlocked for {matched_name} — welcome home!")
+                    else:
+                        logger.error("SwitchBot unlock command returned failure")
+                except Exception as unlock_exc:
+                    logger.error(f"SwitchBot unlock failed with exception: {unlock_exc}")
+
+        try:
+            await store.update_door_action(event_id, unlock_granted, door_action)
+        except Exception as exc:
+            logger.error(f"Could not record unlock outcome for event {event_id}: {exc}")
+
+        if alerter is not None and unlock_granted:
+            caption = (
+                f"Welcome home, {matched_name}!\n"
+                f"Door unlocked at {recorded_at}"
+            )
+            await alerter.alert_unlock(thumbnail_path, caption)
 
     logger.info(
         f"Polling loop started (interval={Config.POLL_INTERVAL}s, "
@@ -70,14 +152,14 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
                 continue
 
             recording_id, event_kind = result
-            recorded_at = datetime.datetime.now(zoneinfo.ZoneInfo("America/Chicago")).isoformat()
+            recorded_at = datetime.datetime.now(EVENT_TZ).isoformat(timespec="milliseconds")
 
             logger.info(
                 f"Processing event (recording_id={recording_id}, kind={event_kind})"
             )
 
             # --- Cooldown check ---
-            elapsed = time.time() - last_unlock_time
+            elapsed = loop.time() - last_unlock_mono
             if elapsed < Config.UNLOCK_COOLDOWN:
                 logger.info(
                     f"Cooldown active ({int(Config.UNLOCK_COOLDOWN - elapsed)}s remaining), "
@@ -94,12 +176,27 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
                 )
                 continue
 
-            # --- Save thumbnail (synchronous, before DB write) ---
-            thumbnail_path = store.save_thumbnail(frame, recorded_at)
+            # --- Decode once; thumbnail, YOLO and face recognition share the array ---
+            try:
+                frame_array = await loop.run_in_executor(None, decode_frame, frame)
+            except Exception as decode_exc:
+                logger.warning(
+                    f"Could not decode frame from recording {recording_id}: {decode_exc}"
+                )
+                continue
 
-            # --- YOLO object detection ---
-            detections = await detector.detect(frame)
-            detection_dicts = detections_to_dicts(detections)
+            # --- Thumbnail encode and YOLO detection run concurrently ---
+            # Independent work on separate executors; the thumbnail is still
+            # on disk before the DB write below.
+            thumbnail_path, detections = await asyncio.gather(
+                loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        store.save_thumbnail, frame, recorded_at, frame_array=frame_array
+                    ),
+                ),
+                detector.detect(frame_array),
+            )
 
             # --- Face recognition on best person crop ---
             matched_name = None
@@ -111,21 +208,30 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
             if person_detections:
                 # Pick highest-confidence person detection
                 best_person = max(person_detections, key=lambda d: d.confidence)
-                person_crop = crop_person_bbox(frame, best_person)
+                box_w = best_person.bbox_x2 - best_person.bbox_x1
+                box_h = best_person.bbox_y2 - best_person.bbox_y1
 
-                if person_crop is not None:
-                    matched_name = await loop.run_in_executor(
-                        None, recognizer.identify, person_crop
+                if min(box_w, box_h) < Config.MIN_FACE_PIXELS:
+                    logger.info(
+                        f"Person too small for face recognition "
+                        f"({box_w:.0f}x{box_h:.0f}px < {Config.MIN_FACE_PIXELS}px), skipping"
                     )
                 else:
-                    # Degenerate bounding box — fall back to full frame
-                    logger.debug(
-                        "Person crop returned None (degenerate bbox), "
-                        "falling back to full frame for face recognition"
-                    )
-                    matched_name = await loop.run_in_executor(
-                        None, recognizer.identify, frame
-                    )
+                    person_crop = crop_person_array(frame_array, best_person)
+
+                    if person_crop is not None:
+                        matched_name = await loop.run_in_executor(
+                            face_pool, recognizer.identify_array, person_crop
+                        )
+                    else:
+                        # Degenerate bounding box — fall back to full frame
+                        logger.debug(
+                            "Person crop returned None (degenerate bbox), "
+                            "falling back to full frame for face recognition"
+                        )
+                        matched_name = await loop.run_in_executor(
+                            face_pool, recognizer.identify_array, frame_array
+                        )
             else:
                 logger.debug("No person detected by YOLO — skipping face recognition")
                 matched_name = None
@@ -135,9 +241,8 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
             # These fields will be populated in a future phase if the recognizer
             # is extended to return distance scores.
 
-            # --- Determine door action and dispatch unlock ---
-            unlock_granted = False
-            door_action = "none"
+            # --- Determine door action ---
+            dispatch_unlock = False
 
             if matched_name is not None:
                 logger.info(f"Recognized person: {matched_name}")
@@ -152,28 +257,14 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
                     logger.info(
                         f"Auto-unlock disabled for {matched_name} — skipping unlock"
                     )
-                elif (elapsed := time.time() - last_unlock_time) < Config.UNLOCK_COOLDOWN:
+                elif (elapsed := loop.time() - last_unlock_mono) < Config.UNLOCK_COOLDOWN:
                     logger.info(
                         f"Face matched ({matched_name}) but cooldown active "
                         f"({int(Config.UNLOCK_COOLDOWN - elapsed)}s remaining)"
                     )
                 else:
-                    # matched_name is in auto_unlock_names and cooldown has elapsed
-                    try:
-                        success = await loop.run_in_executor(None, switchbot.unlock)
-                        if success:
-                            last_unlock_time = time.time()
-                            unlock_granted = True
-                            door_action = "unlocked"
-                            logger.info(
-                                f"Door unlocked for {matched_name} — welcome home!"
-                            )
-                        else:
-                            logger.error("SwitchBot unlock command returned failure")
-                    except Exception as unlock_exc:
-                        logger.error(
-                            f"SwitchBot unlock failed with exception: {unlock_exc}"
-                        )
+                    # Authorized and out of cooldown: unlock after the event is stored
+                    dispatch_unlock = True
             else:
                 logger.info("Event processed — no authorized face matched")
 
@@ -186,33 +277,38 @@ async def polling_loop(ring, recognizer, switchbot, detector: ObjectDetector, st
                 person_name=matched_name,
                 face_confidence=face_confidence,
                 face_distance=face_distance,
-                unlock_granted=unlock_granted,
-                door_action=door_action,
+                unlock_granted=False,
+                door_action="pending" if dispatch_unlock else "none",
                 thumbnail_path=thumbnail_path,
-                detections=detection_dicts,
+                detections=detections,
             )
             logger.info(f"Event persisted: event_id={event_id}")
 
-            # --- Send Telegram alert ---
+            # --- Dispatch SwitchBot unlock off the polling path ---
+            if dispatch_unlock:
+                task = loop.create_task(
+                    run_unlock(event_id, matched_name, recorded_at, thumbnail_path)
+                )
+                unlock_tasks.add(task)
+                task.add_done_callback(unlock_tasks.discard)
+
+            # --- Send Telegram alert (unlock alerts are sent by run_unlock) ---
             if alerter is not None:
-                if matched_name is None and any(d["label"] == "person" for d in detection_dicts):
+                if matched_name is None and person_detections:
                     caption = (
                         f"Unknown person detected at the door\n"
-                        f"Objects: {', '.join(d['label'] for d in detection_dicts)}\n"
+                        f"Objects: {', '.join(d.label for d in detections)}\n"
                         f"Time: {recorded_at}"
                     )
                     await alerter.alert_stranger(thumbnail_path, caption)
-                elif matched_name is not None and unlock_granted:
-                    caption = (
-                        f"Welcome home, {matched_name}!\n"
-                        f"Door unlocked at {recorded_at}"
-                    )
-                    await alerter.alert_unlock(thumbnail_path, caption)
 
         except asyncio.CancelledError:
             # CRITICAL: must be caught and re-raised BEFORE except Exception
             # for clean shutdown via polling_task.cancel()
             logger.info("Polling loop cancelled — shutting down cleanly")
+            if unlock_tasks:
+                # Let in-flight unlocks finish so their event rows leave "pending"
+                await asyncio.gather(*unlock_tasks, return_exceptions=True)
             raise
 
         except Exception as exc:
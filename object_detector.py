@@ -10,22 +10,35 @@ Exported symbols:
     ObjectDetector       — async YOLO inference class
     Detection            — dataclass for a single detected object
     crop_person_bbox     — extract a person bounding box as JPEG bytes
+    crop_person_array    — extract a person bounding box as an ndarray view
+    crop_person_bbox_from_array — crop_person_bbox for an already-decoded frame
+    decode_frame         — decode image bytes to an RGB ndarray
     detections_to_dicts  — convert Detection list to EventStore dict format
     RELEVANT_CLASSES     — COCO class ID -> project label mapping
     CONFIDENCE_THRESHOLD — minimum confidence to keep a detection
 """
 
 import asyncio
-import io
 import logging
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+import cv2
 import numpy as np
-from PIL import Image
 from ultralytics import YOLO
 
+try:
+    import onnxruntime
+except ImportError:  # optional: only needed for .onnx models
+    onnxruntime = None
+
+try:
+    import torch
+except ImportError:  # Ultralytics installs it; guarded for ONNX-only setups
+    torch = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -41,13 +54,25 @@ RELEVANT_CLASSES: dict[int, str] = {
                      # Known limitation: flat envelopes and padded mailers may not be detected.
 }
 
+# RELEVANT_CLASSES keys as an array, so class filtering is one np.isin call.
+_RELEVANT_IDS = np.array(sorted(RELEVANT_CLASSES), dtype=np.int32)
+
 # Detections with confidence below this threshold are dropped.
 CONFIDENCE_THRESHOLD: float = 0.40
 
+# ONNX Runtime path (.onnx models): square letterbox input side and the IoU
+# threshold of the class-aware NMS that Ultralytics would otherwise apply.
+ONNX_INPUT_SIZE: int = 640
+NMS_IOU_THRESHOLD: float = 0.45
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Detection:
-    """A single YOLO detection result for a relevant object class."""
+    """A single YOLO detection result for a relevant object class.
+
+    Slotted and immutable: no per-instance __dict__, and detections are
+    hashable should the pipeline ever need to de-duplicate them.
+    """
 
     label: str
     confidence: float
@@ -60,7 +85,7 @@ class Detection:
 class ObjectDetector:
     """
     Async YOLO11n wrapper that serializes inference through a single-worker
-    ThreadPoolExecutor.
+    ThreadPoolExecutor, batching frames that arrive while inference is busy.
 
     The YOLO model is not thread-safe; max_workers=1 ensures all predict()
     calls are serialized and the model state is never accessed concurrently.
@@ -71,32 +96,82 @@ class ObjectDetector:
         detector.shutdown()
     """
 
-    def __init__(self, model_path: str = "yolo11n.pt") -> None:
+    def __init__(
+        self,
+        model_path: str = "yolo11n.pt",
+        max_batch: int = 4,
+        provider: str = "CoreMLExecutionProvider",
+        torch_threads: int = 0,
+    ) -> None:
         """
         Load the YOLO model and create the thread pool.
 
         Args:
             model_path: Path to model weights file. Use "yolo11n.pt" for
                         development (PyTorch) or "yolo11n_ncnn_model" for
-                        Raspberry Pi 4 production (NCNN, 3-5x faster on ARM).
+                        Raspberry Pi 4 production (NCNN, 3-5x faster on ARM;
+                        build it with export_ncnn.py; batch 1 only).
+                        Ultralytics picks the backend from the path. A
+                        "yolo11n.onnx" path (export_onnx.py) skips Ultralytics
+                        and runs the model directly on ONNX Runtime.
+            max_batch: Most frames passed to one model.predict() call when
+                       detect() calls queue up behind a running inference.
+                       Only PyTorch (.pt) models batch; exported formats
+                       (NCNN, ONNX) run one frame per call.
+            provider: Preferred ONNX Runtime execution provider for .onnx
+                      models (CoreML on macOS dev machines); CPU is always the
+                      fallback. Ignored for other model formats.
+            torch_threads: PyTorch intra-op thread count; 0 means all cores
+                           but one, so inference does not starve the asyncio
+                           loop or OpenCV (Config.TORCH_THREADS).
         """
         logger.info("Loading YOLO model from: %s", model_path)
-        self.model = YOLO(model_path)
+        self.model = None
+        self._session = None
+        if str(model_path).endswith(".onnx"):
+            if onnxruntime is None:
+                raise RuntimeError(
+                    "onnxruntime is not installed; it is required for .onnx models"
+                )
+            available = onnxruntime.get_available_providers()
+            providers = [p for p in (provider, "CPUExecutionProvider") if p in available]
+            self._session = onnxruntime.InferenceSession(model_path, providers=providers)
+            self._input_name = self._session.get_inputs()[0].name
+            # Reused input tensor; safe because the executor has one worker
+            self._input_buf = np.empty(
+                (1, 3, ONNX_INPUT_SIZE, ONNX_INPUT_SIZE), dtype=np.float32
+            )
+            logger.info("ONNX Runtime providers: %s", self._session.get_providers())
+        else:
+            _limit_torch_threads(torch_threads)
+            # task must be explicit: exported formats (NCNN) carry no task metadata
+            self.model = YOLO(model_path, task="detect")
         # Single-worker executor serializes all inference calls.
         # YOLO is not thread-safe; never increase max_workers.
         self._executor = ThreadPoolExecutor(max_workers=1)
+        # Frames waiting for the batching task: (frame, future)
+        self._pending: list[tuple[bytes | np.ndarray, asyncio.Future]] = []
+        self._batch_task: asyncio.Task | None = None
+        self._max_batch = max_batch
+        # Ultralytics' exported backends (NCNN, ...) infer only im[0] of a
+        # batch, so only PyTorch weights get multi-frame predict() calls
+        self._batched = str(model_path).endswith(".pt")
         logger.info("ObjectDetector initialized with model: %s", model_path)
 
-    async def detect(self, frame_bytes: bytes) -> list[Detection]:
+    async def detect(self, frame: bytes | np.ndarray) -> list[Detection]:
         """
         Run YOLO inference on a frame without blocking the asyncio event loop.
 
-        Dispatches _predict_sync to the ThreadPoolExecutor via run_in_executor.
-        Logs inference time and warns if it exceeds 300ms (thermal throttling
-        indicator on Raspberry Pi 4).
+        Frames are queued for a batching task that runs _predict_batch_sync in
+        the ThreadPoolExecutor. A lone frame is dispatched immediately; frames
+        that arrive while an inference is running (e.g. a burst of Ring push
+        events) are coalesced into the next model.predict() call, up to
+        max_batch per call.
 
         Args:
-            frame_bytes: Raw image bytes (any PIL-supported format).
+            frame: Raw image bytes (any OpenCV-decodable format), or an
+                   already decoded (H, W, 3) RGB uint8 array (see decode_frame)
+                   so callers that need the pixels anyway decode only once.
 
         Returns:
             List of Detection objects for all relevant classes found above
@@ -104,79 +179,145 @@ class ObjectDetector:
             if frame decoding fails.
         """
         loop = asyncio.get_running_loop()
-        t_start = time.monotonic()
+        future: asyncio.Future[list[Detection]] = loop.create_future()
+        self._pending.append((frame, future))
 
-        detections = await loop.run_in_executor(
-            self._executor, self._predict_sync, frame_bytes
-        )
+        task = self._batch_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._batch_task = loop.create_task(self._run_batches())
 
-        elapsed_ms = (time.monotonic() - t_start) * 1000
-        logger.info(
-            "YOLO inference completed in %.1fms — %d relevant detection(s)",
-            elapsed_ms,
-            len(detections),
-        )
+        return await future
+
+    async def detect_with_image(
+        self, frame_bytes: bytes
+    ) -> tuple[np.ndarray, list[Detection]]:
+        """
+        Decode frame_bytes once and run detect() on the decoded array.
+
+        For callers that also need the pixels (annotation, crops): the RGB
+        array used for inference is returned alongside the detections, so
+        nothing downstream decodes the JPEG again.
+
+        Returns:
+            (RGB ndarray, detections)
+
+        Raises:
+            ValueError: If the bytes cannot be decoded.
+        """
+        loop = asyncio.get_running_loop()
+        img_array = await loop.run_in_executor(None, decode_frame, frame_bytes)
+        return img_array, await self.detect(img_array)
+
+    async def _run_batches(self) -> None:
+        """
+        Drain queued frames in batches of up to max_batch, one predict() each.
 
-        if elapsed_ms > 300:
-            logger.warning(
-                "YOLO inference took %.1fms (>300ms threshold). "
-                "Possible thermal throttling on Raspberry Pi 4. "
-                "Check CPU temperature and active cooling.",
+        Logs inference time and warns if it exceeds 300ms (thermal throttling
+        indicator on Raspberry Pi 4).
+        """
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            frames = [frame for frame, _ in batch]
+
+            t_start = time.monotonic()
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._predict_batch_sync, frames
+                )
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_, future), detections in zip(batch, results):
+                if not future.done():
+                    future.set_result(detections)
+
+            elapsed_ms = (time.monotonic() - t_start) * 1000
+            logger.info(
+                "YOLO inference completed in %.1fms — %d frame(s), %d relevant detection(s)",
                 elapsed_ms,
+                len(batch),
+                sum(len(d) for d in results),
             )
 
-        return detections
+            if elapsed_ms > 300 * len(batch):
+                logger.warning(
+                    "YOLO inference took %.1fms for %d frame(s) (>300ms per frame). "
+                    "Possible thermal throttling on Raspberry Pi 4. "
+                    "Check CPU temperature and active cooling.",
+                    elapsed_ms,
+                    len(batch),
+                )
 
-    def _predict_sync(self, frame_bytes: bytes) -> list[Detection]:
+    def _predict_batch_sync(self, frames: list[bytes | np.ndarray]) -> list[list[Detection]]:
         """
         Synchronous YOLO inference — runs in ThreadPoolExecutor worker thread.
 
-        Decodes frame_bytes via PIL, converts to numpy array, runs
-        model.predict(), filters by RELEVANT_CLASSES and CONFIDENCE_THRESHOLD,
-        and returns Detection objects.
+        Decodes frame bytes via OpenCV (arrays are used as-is), runs a single
+        model.predict() over every decodable frame (one call per frame for
+        exported models, which only infer the first image of a batch),
+        filters by RELEVANT_CLASSES and CONFIDENCE_THRESHOLD, and returns
+        Detection lists in input order.
 
         Args:
-            frame_bytes: Raw image bytes (any PIL-supported format).
+            frames: Raw image bytes (any OpenCV-decodable format) or RGB ndarrays.
 
         Returns:
-            List of Detection objects for relevant classes above threshold.
-            Returns empty list on decoding failure (logged as exception).
+            One list of Detection objects per input frame. A frame that fails
+            to decode (logged as exception) gets an empty list.
         """
-        try:
-            img = Image.open(io.BytesIO(frame_bytes)).convert("RGB")
-            img_array = np.array(img)
-        except Exception:
-            logger.exception("Failed to decode frame bytes for YOLO inference")
-            return []
-
-        results = self.model.predict(img_array, verbose=False)
-        detections: list[Detection] = []
-
-        for result in results:
-            if result.boxes is None:
+        output: list[list[Detection]] = [[] for _ in frames]
+        indices: list[int] = []
+        images: list[np.ndarray] = []
+
+        for i, frame in enumerate(frames):
+            if isinstance(frame, np.ndarray):
+                images.append(frame)
+                indices.append(i)
                 continue
-            for box in result.boxes:
-                cls_id = int(box.cls[0])
-                confidence = float(box.conf[0])
-
-                if cls_id not in RELEVANT_CLASSES:
-                    continue
-                if confidence < CONFIDENCE_THRESHOLD:
-                    continue
-
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                detections.append(
-                    Detection(
-                        label=RELEVANT_CLASSES[cls_id],
-                        confidence=round(confidence, 4),
-                        bbox_x1=round(x1, 2),
-                        bbox_y1=round(y1, 2),
-                        bbox_x2=round(x2, 2),
-                        bbox_y2=round(y2, 2),
-                    )
-                )
+            try:
+                images.append(decode_frame(frame))
+                indices.append(i)
+            except Exception:
+                logger.exception("Failed to decode frame bytes for YOLO inference")
+
+        if not images:
+            return output
+
+        if self._session is not None:
+            # Exported ONNX graphs have a fixed batch of 1
+            for i, image in zip(indices, images):
+                output[i] = self._predict_onnx(image)
+            return output
+
+        if self._batched:
+            results = self.model.predict(images, verbose=False)
+            if len(results) == len(images):
+                for i, result in zip(indices, results):
+                    output[i] = _result_to_detections(result)
+                return output
+            logger.error(
+                "YOLO returned %d result(s) for a batch of %d frames; "
+                "re-running one frame per call",
+                len(results),
+                len(images),
+            )
 
-        return detections
+        for i, image in zip(indices, images):
+            results = self.model.predict(image, verbose=False)
+            if results:
+                output[i] = _result_to_detections(results[0])
+        return output
+
+    def _predict_onnx(self, image: np.ndarray) -> list[Detection]:
+        """Letterbox one RGB frame, run the ONNX session and post-process."""
+        blob, scale, pad_x, pad_y = _letterbox(image, ONNX_INPUT_SIZE, out=self._input_buf)
+        (output,) = self._session.run(None, {self._input_name: blob})
+        return _onnx_output_to_detections(output[0], scale, pad_x, pad_y)
 
     def shutdown(self) -> None:
         """
@@ -187,6 +328,198 @@ class ObjectDetector:
         logger.info("ObjectDetector ThreadPoolExecutor shut down")
 
 
+def _limit_torch_threads(threads: int) -> None:
+    """Pin PyTorch's CPU thread pools (process-wide) before the model loads."""
+    if torch is None:
+        return
+    if threads <= 0:
+        threads = max(1, (os.cpu_count() or 1) - 1)
+    torch.set_num_threads(threads)
+    try:
+        # Only settable before the first parallel op; a second detector keeps it
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    logger.info("PyTorch CPU threads: %d", threads)
+
+
+def _result_to_detections(result) -> list[Detection]:
+    """Relevant, above-threshold boxes of one Ultralytics result as Detections.
+
+    The class/confidence filter runs as one numpy mask over all boxes; only
+    the survivors are converted to Python values.
+    """
+    if result.boxes is None or len(result.boxes) == 0:
+        return []
+
+    boxes = result.boxes.cpu().numpy()
+    cls = boxes.cls.astype(np.int32)
+    conf = boxes.conf
+    xyxy = boxes.xyxy
+
+    mask = np.isin(cls, _RELEVANT_IDS) & (conf >= CONFIDENCE_THRESHOLD)
+    return _build_detections(cls[mask], conf[mask], xyxy[mask])
+
+
+def _build_detections(cls: np.ndarray, conf: np.ndarray, xyxy: np.ndarray) -> list[Detection]:
+    """
+    Detection objects for already-filtered boxes.
+
+    Confidences (4 dp) and coordinates (2 dp) are rounded with one np.round
+    per array instead of five round() calls per box. float64 first, so the
+    rounded values are the same Python floats round() would have produced.
+    """
+    confs = np.round(conf.astype(np.float64), 4).tolist()
+    boxes = np.round(xyxy.astype(np.float64), 2).tolist()
+    return [
+        Detection(RELEVANT_CLASSES[c], confidence, *box)
+        for c, confidence, box in zip(cls.tolist(), confs, boxes)
+    ]
+
+
+def _letterbox(
+    image: np.ndarray, size: int, out: np.ndarray | None = None
+) -> tuple[np.ndarray, float, int, int]:
+    """
+    Resize an RGB frame into a size x size canvas, keeping its aspect ratio.
+
+    Returns the (1, 3, size, size) float32 input blob scaled to [0, 1] plus the
+    scale and left/top padding needed to map boxes back to the frame. The
+    blob is written into out when given, so inference can reuse one buffer.
+    """
+    height, width = image.shape[:2]
+    scale = min(size / height, size / width)
+    new_w, new_h = round(width * scale), round(height * scale)
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+    # Grey (114) padding matches the Ultralytics letterbox the model was trained on
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(
+        image, (new_w, new_h), interpolation=cv2.INTER_LINEAR
+    )
+    # HWC uint8 -> CHW float32 in [0, 1] in one pass: no intermediate float
+    # copy of the canvas and, with out, no per-frame allocation
+    blob = out if out is not None else np.empty((1, 3, size, size), dtype=np.float32)
+    np.multiply(canvas.transpose(2, 0, 1), np.float32(1 / 255), out=blob[0])
+    return blob, scale, pad_x, pad_y
+
+
+def _onnx_output_to_detections(
+    output: np.ndarray, scale: float, pad_x: int, pad_y: int
+) -> list[Detection]:
+    """
+    Relevant, above-threshold boxes of one raw YOLO11 ONNX output as Detections.
+
+    output is the (4 + num_classes, num_anchors) prediction for one image:
+    cx, cy, w, h in letterboxed pixels followed by per-class scores. Boxes are
+    filtered like _result_to_detections, de-duplicated with class-aware NMS and
+    mapped back to frame coordinates.
+    """
+    preds = output.T
+    scores = preds[:, 4:]
+    cls = scores.argmax(axis=1)
+    conf = scores[np.arange(len(cls)), cls]
+
+    mask = np.isin(cls, _RELEVANT_IDS) & (conf >= CONFIDENCE_THRESHOLD)
+    if not mask.any():
+        return []
+    boxes, cls, conf = preds[mask, :4], cls[mask], conf[mask]
+
+    # cx, cy, w, h -> x, y, w, h in the original frame
+    xywh = boxes.copy()
+    xywh[:, 0] = (boxes[:, 0] - boxes[:, 2] / 2 - pad_x) / scale
+    xywh[:, 1] = (boxes[:, 1] - boxes[:, 3] / 2 - pad_y) / scale
+    xywh[:, 2:] = boxes[:, 2:] / scale
+
+    keep = cv2.dnn.NMSBoxesBatched(
+        xywh.tolist(), conf.tolist(), cls.tolist(), CONFIDENCE_THRESHOLD, NMS_IOU_THRESHOLD
+    )
+    keep = np.asarray(keep, dtype=np.int64).reshape(-1)
+
+    xyxy = xywh[keep]
+    xyxy[:, 2:] += xyxy[:, :2]
+    return _build_detections(cls[keep], conf[keep], xyxy)
+
+
+def decode_frame(frame_bytes: bytes) -> np.ndarray:
+    """
+    Decode image bytes to an (H, W, 3) RGB uint8 array.
+
+    Uses OpenCV's libjpeg-turbo decoder, which writes straight into a numpy
+    buffer — no intermediate PIL image, convert() pass or np.array() copy.
+
+    Raises:
+        ValueError: If OpenCV cannot decode the bytes; callers decide whether
+                    that is fatal.
+    """
+    if not frame_bytes:
+        raise ValueError("Empty image bytes")
+    bgr = cv2.imdecode(np.frombuffer(frame_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if bgr is None:
+        raise ValueError("Could not decode image bytes")
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def _clamp_bbox(
+    detection: Detection, img_width: int, img_height: int
+) -> tuple[float, float, float, float] | None:
+    """Clamp a detection box to the image; None (logged) if it is degenerate."""
+    x1 = max(0.0, detection.bbox_x1)
+    y1 = max(0.0, detection.bbox_y1)
+    x2 = min(float(img_width), detection.bbox_x2)
+    y2 = min(float(img_height), detection.bbox_y2)
+
+    if x2 - x1 <= 0 or y2 - y1 <= 0:
+        logger.warning(
+            "Degenerate bounding box after clamping: "
+            "x1=%.1f y1=%.1f x2=%.1f y2=%.1f (image %dx%d)",
+            x1, y1, x2, y2, img_width, img_height,
+        )
+        return None
+    return x1, y1, x2, y2
+
+
+def crop_person_array(img_array: np.ndarray, detection: Detection) -> np.ndarray | None:
+    """
+    Crop the person bounding box from a decoded frame without copying.
+
+    Array counterpart of crop_person_bbox for pipelines that already hold the
+    decoded frame (see decode_frame); the result is a view into img_array.
+
+    Returns:
+        (h, w, 3) view of the person region, or None if the bounding box is
+        degenerate after clamping to the image bounds.
+    """
+    img_height, img_width = img_array.shape[:2]
+    box = _clamp_bbox(detection, img_width, img_height)
+    if box is None:
+        return None
+    x1, y1, x2, y2 = (int(v) for v in box)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return img_array[y1:y2, x1:x2]
+
+
+def crop_person_bbox_from_array(img_array: np.ndarray, detection: Detection) -> bytes | None:
+    """
+    Crop the person bounding box from a decoded RGB frame and return JPEG bytes.
+
+    Same contract as crop_person_bbox without the decode: the crop is a view
+    into img_array, encoded directly by OpenCV (quality=90).
+
+    Returns:
+        JPEG bytes of the person region, or None if the bounding box is
+        degenerate or encoding fails.
+    """
+    crop = crop_person_array(img_array, detection)
+    if crop is None:
+        return None
+    ok, jpeg = cv2.imencode(
+        ".jpg", cv2.cvtColor(crop, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, 90]
+    )
+    return jpeg.tobytes() if ok else None
+
+
 def crop_person_bbox(frame_bytes: bytes, detection: Detection) -> bytes | None:
     """
     Crop the person bounding box from a frame and return it as JPEG bytes.
@@ -205,28 +538,19 @@ def crop_person_bbox(frame_bytes: bytes, detection: Detection) -> bytes | None:
         bounding box is degenerate (zero width or height after clamping).
     """
     try:
-        img = Image.open(io.BytesIO(frame_bytes)).convert("RGB")
-        img_width, img_height = img.size
+        # Decoded straight to BGR and re-encoded as BGR: no colour conversion,
+        # no PIL buffers, and the crop itself is a view (no copy)
+        img = cv2.imdecode(np.frombuffer(frame_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("Could not decode image bytes")
 
         # Clamp bounding box coordinates to image bounds
-        x1 = max(0.0, detection.bbox_x1)
-        y1 = max(0.0, detection.bbox_y1)
-        x2 = min(float(img_width), detection.bbox_x2)
-        y2 = min(float(img_height), detection.bbox_y2)
-
-        # Validate non-degenerate box
-        if x2 - x1 <= 0 or y2 - y1 <= 0:
-            logger.warning(
-                "Degenerate bounding box after clamping: "
-                "x1=%.1f y1=%.1f x2=%.1f y2=%.1f (image %dx%d)",
-                x1, y1, x2, y2, img_width, img_height,
-            )
+        crop = crop_person_array(img, detection)
+        if crop is None:
             return None
 
-        crop = img.crop((x1, y1, x2, y2))
-        buf = io.BytesIO()
-        crop.save(buf, format="JPEG", quality=90)
-        return buf.getvalue()
+        ok, jpeg = cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        return jpeg.tobytes() if ok else None
 
     except Exception:
         logger.exception(
@@ -241,12 +565,11 @@ def crop_person_bbox(frame_bytes: bytes, detection: Detection) -> bytes | None:
 
 def detections_to_dicts(detections: list[Detection]) -> list[dict]:
     """
-    Convert a list of Detection objects to the dict format expected by
-    EventStore.write_event(detections=...).
+    Convert a list of Detection objects to the dict format used by
+    EventStore.write_event(detections=...) and its read methods.
 
-    This is the bridge between Phase 2 output (Detection dataclasses) and
-    Phase 1 input (EventStore expects dicts with specific keys). Used in the
-    Phase 3 pipeline after YOLO inference, before persisting an event.
+    The pipelines pass Detection objects to write_event directly (it accepts
+    both shapes); this remains for callers that need plain dicts, e.g. JSON.
 
     Args:
         detections: List of Detection objects from ObjectDetector.detect().
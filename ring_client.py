@@ -1,4 +1,5 @@
 import asyncio
+import io
 import json
 import logging
 import tempfile
@@ -9,8 +10,26 @@ from ring_doorbell.exceptions import Requires2FAError
 
 from _paths import RUNTIME_DIR
 
+# PyAV decodes the recording from memory; without it frames are extracted
+# through a temp file and cv2.VideoCapture
+try:
+    import av
+except ImportError:
+    av = None
+
 logger = logging.getLogger(__name__)
 
+# History polling is only a safety net while the push listener is active
+PUSH_POLL_INTERVAL = 5.0
+
+# Recording download retries: first wait, backoff cap, and total time budget
+CAPTURE_RETRY_INITIAL = 2.0
+CAPTURE_RETRY_MAX = 10.0
+CAPTURE_RETRY_BUDGET = 120.0
+
+# Offset of the extracted frame (skips the blurry first frames of a clip)
+FRAME_OFFSET_SECONDS = 1.0
+
 TOKEN_CACHE = RUNTIME_DIR / ".ring_token.cache"
 FCM_CREDENTIALS_CACHE = RUNTIME_DIR / ".fcm_credentials.cache"
 
@@ -23,7 +42,9 @@ class RingClient:
         self.password = password
         self.ring: Ring | None = None
         self.doorbell = None
-        self._last_event_id: str | None = None
+        # Newest event id handled through either push or history. Ring ids
+        # increase over time, so anything at or below it was already seen
+        self._last_event_id: int | None = None
         self._listener = None
         self._event_queue: asyncio.Queue = asyncio.Queue()
         self._use_push = False
@@ -72,12 +93,7 @@ class RingClient:
                 credentials_updated_callback=self._fcm_credentials_updated,
             )
 
-            def on_event(event):
-                if event.kind in ("motion", "ding") and not event.is_update:
-                    logger.info(f"[PUSH] Event: id={event.id} kind={event.kind}")
-                    self._event_queue.put_nowait(event)
-
-            self._listener.add_notification_callback(on_event)
+            self._listener.add_notification_callback(self._on_push_event)
             started = await self._listener.start()
             if started:
                 self._use_push = True
@@ -87,33 +103,76 @@ class RingClient:
             logger.warning(f"Push listener failed: {e}")
             return False
 
+    def _on_push_event(self, event) -> None:
+        """Queue new motion/ding pushes for the doorbell capture_frame() reads."""
+        if event.kind not in ("motion", "ding") or event.is_update:
+            return
+        # The listener reports every device on the account
+        if event.doorbot_id != self.doorbell.id:
+            return
+        logger.info(f"[PUSH] Event: id={event.id} kind={event.kind}")
+        self._event_queue.put_nowait(event)
+
+    def _claim_event(self, event_id) -> bool:
+        """Mark event_id handled; False if it (or a newer event) already was."""
+        event_id = int(event_id)
+        if self._last_event_id is not None and event_id <= self._last_event_id:
+            return False
+        self._last_event_id = event_id
+        return True
+
     async def wait_for_event(self, poll_interval: float = 2) -> tuple[int, str] | None:
-        """Poll for new events. Returns (recording_id, kind) tuple or None."""
+        """Wait for a new event. Returns (recording_id, kind) tuple or None.
+
+        With the push listener active, waits up to max(poll_interval,
+        PUSH_POLL_INTERVAL) for a pushed event before falling back to one
+        history poll; otherwise polls history straight away. Both paths
+        share one handled-event watermark, so an event is returned once no
+        matter which path sees it first.
+        """
+        if self._use_push:
+            try:
+                async with asyncio.timeout(max(poll_interval, PUSH_POLL_INTERVAL)):
+                    while True:
+                        event = await self._event_queue.get()
+                        if self._claim_event(event.id):
+                            return event.id, event.kind
+                        # Push delayed past the history poll that reported it
+                        logger.debug(f"[PUSH] Skipping already handled event {event.id}")
+            except asyncio.TimeoutError:
+                pass
+
         # Only call history — skip async_update_data() which makes 3 extra API calls
         history = await self.doorbell.async_history(limit=1)
         if not history:
             return None
 
         latest = history[0]
-        event_id = str(latest["id"])
+        event_id = latest["id"]
 
         if self._last_event_id is None:
-            self._last_event_id = event_id
+            self._last_event_id = int(event_id)
             logger.info(f"Baseline event: {event_id} (kind={latest.get('kind')})")
             return None
 
-        if event_id != self._last_event_id:
-            self._last_event_id = event_id
+        # Rejects the current event and, after a push moved ahead, a stale one
+        if self._claim_event(event_id):
             logger.info(f"New event: {event_id} (kind={latest.get('kind')})")
             kind = latest.get("kind", "motion")
-            return latest["id"], kind
+            return event_id, kind
 
         return None
 
     async def capture_frame(self, recording_id: int) -> bytes | None:
         """Download the event recording and extract a frame.
-        Retries since Ring needs time to process recordings."""
-        for attempt in range(1, 25):
+        Retries with exponential backoff (2s, 3s, 4.5s, ... capped at 10s)
+        since Ring needs a few seconds to process recordings."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CAPTURE_RETRY_BUDGET
+        delay = CAPTURE_RETRY_INITIAL
+        attempt = 0
+        while True:
+            attempt += 1
             try:
                 video_bytes = await self.doorbell.async_recording_download(recording_id)
                 if video_bytes:
@@ -122,11 +181,14 @@ class RingClient:
                     return self._extract_frame(video_bytes)
             except Exception:
                 pass
+            if loop.time() + delay > deadline:
+                break
             if attempt == 1:
                 logger.info("Waiting for Ring to process recording...")
-            await asyncio.sleep(5)
+            await asyncio.sleep(delay)
+            delay = min(CAPTURE_RETRY_MAX, delay * 1.5)
 
-        logger.error("All recording download attempts failed")
+        logger.error(f"All recording download attempts failed ({attempt} attempts)")
         return None
 
     def get_battery_level(self) -> int | None:
@@ -170,16 +232,56 @@ class RingClient:
 
     @staticmethod
     def _extract_frame(video_bytes: bytes) -> bytes | None:
-        """Extract a frame from MP4 video bytes using OpenCV."""
+        """Extract the frame at FRAME_OFFSET_SECONDS from MP4 bytes as JPEG."""
+        if av is not None:
+            return RingClient._extract_frame_av(video_bytes)
+        return RingClient._extract_frame_cv2(video_bytes)
+
+    @staticmethod
+    def _extract_frame_av(video_bytes: bytes) -> bytes | None:
+        """PyAV path: demux from memory, seek to the keyframe before the offset
+        and decode only up to the target frame."""
         import cv2
 
-        tmp_path = tempfile.mktemp(suffix=".mp4")
+        with av.open(io.BytesIO(video_bytes)) as container:
+            stream = container.streams.video[0]
+            if stream.time_base is not None:
+                container.seek(
+                    int(FRAME_OFFSET_SECONDS / stream.time_base), stream=stream
+                )
+            frame = None
+            for frame in container.decode(stream):
+                if frame.time is None or frame.time >= FRAME_OFFSET_SECONDS:
+                    break
+            if frame is None:
+                return None
+            image = frame.to_ndarray(format="bgr24")
+
+        ok, jpg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        return jpg.tobytes() if ok else None
+
+    @staticmethod
+    def _extract_frame_cv2(video_bytes: bytes) -> bytes | None:
+        """Fallback when PyAV is not installed: cv2.VideoCapture on a file copy.
+
+        On Linux the copy is an anonymous in-RAM memfd opened via /proc; other
+        platforms use a private mkstemp file (no mktemp name race).
+        """
+        import cv2
+
+        tmp_path = None
+        if hasattr(os, "memfd_create"):
+            fd = os.memfd_create("ring.mp4")
+            video_path = f"/proc/self/fd/{fd}"
+        else:
+            fd, tmp_path = tempfile.mkstemp(suffix=".mp4")
+            video_path = tmp_path
         try:
-            with open(tmp_path, "wb") as f:
+            with os.fdopen(fd, "wb", closefd=False) as f:
                 f.write(video_bytes)
-            cap = cv2.VideoCapture(tmp_path)
+            cap = cv2.VideoCapture(video_path)
             # Seek to 1 second in (skip initial blurry frames)
-            cap.set(cv2.CAP_PROP_POS_MSEC, 1000)
+            cap.set(cv2.CAP_PROP_POS_MSEC, FRAME_OFFSET_SECONDS * 1000)
             ret, frame = cap.read()
             cap.release()
             if not ret:
@@ -187,5 +289,6 @@ class RingClient:
             _, jpg = cv2.imencode(".jpg", frame)
             return jpg.tobytes()
         finally:
-            if os.path.exists(tmp_path):
+            os.close(fd)
+            if tmp_path is not None:
                 os.unlink(tmp_path)
@@ -104,8 +104,8 @@ def install_systemd() -> dict:
     unit_content = generate_systemd_unit()
     unit_path.write_text(unit_content)
 
-    # Reload and enable
-    subprocess.run(["systemctl", "--user", "daemon-reload"], capture_output=True)
+    # enable reloads the user manager itself once the symlink is in place,
+    # so no separate `systemctl --user daemon-reload` process is needed
     result = subprocess.run(
         ["systemctl", "--user", "enable", "watchtower.service"],
         capture_output=True,
@@ -6,6 +6,7 @@ Uses atomic writes to prevent corruption on crash.
 """
 
 import os
+import re
 import stat
 import tempfile
 from pathlib import Path
@@ -14,27 +15,33 @@ from _paths import RUNTIME_DIR
 
 SENTINEL_FILE = ".setup_complete"
 
+# is_setup_complete() results per base_dir, keyed by the files' stat stamp
+_setup_cache: dict[str, tuple[tuple, bool]] = {}
+
+# fdatasync skips the metadata flush; macOS only has fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# read_env: KEY=value with the value double-quoted, single-quoted or bare
+# (surrounding quotes and padding dropped). Comment lines never match.
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"((?:[^"\\\n]|\\.)*)"|'((?:[^'\\\n]|\\.)*)'|([^\r\n]*?))[ \t]*\r?$""",
+    re.MULTILINE,
+)
+
+# One KEY=value assignment per line: indent, key, "=" (with its padding), value
+_KV_RE = re.compile(r"^([ \t]*)([A-Za-z_][A-Za-z0-9_]*)([ \t]*=)(.*)$", re.MULTILINE)
+
 
 def read_env(path: str = str(RUNTIME_DIR / ".env")) -> dict[str, str]:
     """Parse an existing .env file into a dict. Returns empty dict if missing."""
-    env = {}
     p = Path(path)
     if not p.exists():
-        return env
-    for line in p.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, _, value = line.partition("=")
-        key = key.strip()
-        value = value.strip()
-        # Strip surrounding quotes
-        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
-            value = value[1:-1]
-        env[key] = value
-    return env
+        return {}
+    return {
+        m.group(1): m.group(2) or m.group(3) or m.group(4) or ""
+        for m in _ENV_LINE_RE.finditer(p.read_text())
+    }
 
 
 def write_env(path: str = str(RUNTIME_DIR / ".env"), updates: dict[str, str] | None = None) -> None:
@@ -47,38 +54,38 @@ def write_env(path: str = str(RUNTIME_DIR / ".env"), updates: dict[str, str] | N
         updates = {}
 
     p = Path(path)
-    existing_lines: list[str] = []
+    original = p.read_text() if p.exists() else ""
     seen_keys: set[str] = set()
 
-    if p.exists():
-        for line in p.read_text().splitlines():
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#") and "=" in stripped:
-                key = stripped.split("=", 1)[0].strip()
-                if key in updates:
-                    existing_lines.append(f"{key}={updates[key]}")
-                    seen_keys.add(key)
-                else:
-                    existing_lines.append(line)
-            else:
-                existing_lines.append(line)
+    def _replace(m: re.Match) -> str:
+        key = m.group(2)
+        if key not in updates:
+            return m.group(0)
+        seen_keys.add(key)
+        return f"{m.group(1)}{key}{m.group(3)}{updates[key]}"
+
+    # Single C-level scan; comments, blank lines and untouched keys pass through
+    content = _KV_RE.sub(_replace, original)
+    if content and not content.endswith("\n"):
+        content += "\n"
 
     # Append new keys not already in file
     for key, value in updates.items():
         if key not in seen_keys:
-            existing_lines.append(f"{key}={value}")
-
-    content = "\n".join(existing_lines) + "\n"
+            content += f"{key}={value}\n"
 
-    # Atomic write: write to temp file in same dir, then rename
+    # Atomic write: write to temp file in same dir, flush its data to disk,
+    # then rename — a crash can never leave an empty .env behind
     dir_path = p.parent or Path(".")
     fd, tmp_path = tempfile.mkstemp(dir=str(dir_path), prefix=".env_tmp_")
     try:
-        os.write(fd, content.encode())
-        os.close(fd)
+        try:
+            os.write(fd, content.encode())
+            _fdatasync(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp_path, str(p))
     except Exception:
-        os.close(fd) if not os.get_inheritable(fd) else None
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
         raise
@@ -91,15 +98,34 @@ def write_env(path: str = str(RUNTIME_DIR / ".env"), updates: dict[str, str] | N
 
 
 def is_setup_complete(base_dir: str = str(RUNTIME_DIR)) -> bool:
-    """Check if setup has been completed (sentinel file exists + basic config valid)."""
+    """Check if setup has been completed (sentinel file exists + basic config valid).
+
+    The answer is cached per base_dir and only recomputed when the sentinel
+    or .env changes (mtime/size), so steady-state calls cost two stats.
+    """
     sentinel = Path(base_dir) / SENTINEL_FILE
-    if not sentinel.exists():
+    env_path = Path(base_dir) / ".env"
+    try:
+        s_stat = sentinel.stat()
+    except FileNotFoundError:
         return False
+    try:
+        e_stat = env_path.stat()
+        stamp = (s_stat.st_mtime_ns, e_stat.st_mtime_ns, e_stat.st_size)
+    except FileNotFoundError:
+        stamp = (s_stat.st_mtime_ns, None, None)
+
+    cached = _setup_cache.get(base_dir)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
     # Also verify minimum config is present
-    env = read_env(str(Path(base_dir) / ".env"))
+    env = read_env(str(env_path))
     required = ["RING_USERNAME", "RING_PASSWORD", "SWITCHBOT_TOKEN",
                  "SWITCHBOT_SECRET", "SWITCHBOT_DEVICE_ID", "DASHBOARD_PASSWORD"]
-    return all(env.get(k) for k in required)
+    result = all(env.get(k) for k in required)
+    _setup_cache[base_dir] = (stamp, result)
+    return result
 
 
 def mark_setup_complete(base_dir: str = str(RUNTIME_DIR)) -> None:
@@ -5,21 +5,26 @@ All routes are unauthenticated. A security guard redirects to /dashboard/
 if setup is already complete (sentinel file exists + config validates).
 """
 
+import asyncio
+import functools
 import hashlib
 import hmac
 import base64
 import logging
 import os
+import secrets
 import sys
 import time
-import uuid
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-import requests as http_requests
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+import httpx
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
+from switchbot_client import hmac_sha256_pads
 from setup.env_writer import read_env, write_env, is_setup_complete, mark_setup_complete
 from _paths import BUNDLE_DIR, RUNTIME_DIR
 
@@ -27,9 +32,27 @@ logger = logging.getLogger("smart-lock.setup")
 
 router = APIRouter(prefix="/setup")
 templates = Jinja2Templates(directory=str(BUNDLE_DIR / "setup" / "templates"))
+# Templates ship with the app and never change at runtime: skip Jinja's
+# per-render mtime check, and compile the step pages once up front.
+templates.env.auto_reload = False
+_STEP_TEMPLATES = [templates.env.get_template(f"step_{i}.html") for i in range(1, 8)]
 
 SWITCHBOT_API_BASE = "https://api.switch-bot.com/v1.1"
 
+# Outer bound on every vendor call the wizard makes (Ring, Blink, SwitchBot,
+# Telegram) so a stalled server fails the step instead of hanging the request
+VALIDATION_TIMEOUT = 15.0
+
+# Successful SwitchBot validations are reused for this long (step 3 submit
+# right after "Discover Devices" costs no second signed round-trip)
+SWITCHBOT_CACHE_TTL = 60.0
+SWITCHBOT_CACHE_MAX = 64
+
+# sha256(token, secret) -> (expires_at monotonic, lock devices)
+_switchbot_cache: dict[str, tuple[float, list[dict]]] = {}
+# sha256(token, secret) -> in-flight GET /devices shared by concurrent callers
+_switchbot_inflight: dict[str, asyncio.Task] = {}
+
 
 # ---------------------------------------------------------------------------
 # Helper: redirect away if setup already complete
@@ -41,21 +64,64 @@ def _guard(request: Request) -> RedirectResponse | None:
     return None
 
 
+def _safe_eq(a: str, b: str) -> bool:
+    """Timing-safe string equality for secrets, tokens and passwords.
+
+    Compares UTF-8 bytes so non-ASCII input works (compare_digest rejects
+    non-ASCII str).
+    """
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
+
+def _form_strs(form, *keys: str) -> tuple[str, ...]:
+    """Stripped string values for keys from a submitted form ("" if absent)."""
+    return tuple(form.get(key, "").strip() for key in keys)
+
+
+def _http(request: Request) -> httpx.AsyncClient:
+    """Shared outbound HTTP client (app.state.http, set up by the lifespan in both modes)."""
+    return request.app.state.http
+
+
 # ---------------------------------------------------------------------------
 # Session-like storage for multi-step wizard state (in-memory, per-process)
 # ---------------------------------------------------------------------------
 # We store wizard progress in app.state so it survives across requests
 # but doesn't need a database. Lost on restart, which is fine — the wizard
 # restarts from step 1 on reboot.
-def _get_wizard_state(request: Request) -> dict:
-    if not hasattr(request.app.state, "wizard_data"):
-        request.app.state.wizard_data = {}
-    return request.app.state.wizard_data
-
-
-def _set_wizard_state(request: Request, updates: dict) -> None:
+@dataclass(slots=True)
+class WizardState:
+    """Values collected by the wizard steps so far (empty until entered)."""
+
+    ring_username: str = ""
+    ring_password: str = ""
+    switchbot_token: str = ""
+    switchbot_secret: str = ""
+    switchbot_device_id: str = ""
+    dashboard_username: str = ""
+    dashboard_password: str = ""
+    telegram_bot_token: str = ""
+    telegram_chat_id: str = ""
+    telegram_enabled: bool = False
+    blink_username: str = ""
+    blink_password: str = ""
+    blink_camera_name: str = ""
+    blink_enabled: bool = False
+
+
+def _get_wizard_state(request: Request) -> WizardState:
+    # The setup-mode lifespan creates this up front; the fallback only
+    # covers the router being mounted on an app without that lifespan.
+    state = getattr(request.app.state, "wizard_data", None)
+    if state is None:
+        state = request.app.state.wizard_data = WizardState()
+    return state
+
+
+def _set_wizard_state(request: Request, **updates) -> None:
     state = _get_wizard_state(request)
-    state.update(updates)
+    for field, value in updates.items():
+        setattr(state, field, value)
 
 
 # ---------------------------------------------------------------------------
@@ -79,8 +145,8 @@ async def setup_step(request: Request, n: int):
 
     state = _get_wizard_state(request)
     ctx = {"request": request, "current_step": n, "error": None}
-    ctx.update(state)
-    return templates.TemplateResponse(f"step_{n}.html", ctx)
+    ctx.update(asdict(state))
+    return HTMLResponse(_STEP_TEMPLATES[n - 1].render(ctx))
 
 
 # ---------------------------------------------------------------------------
@@ -93,8 +159,7 @@ async def post_step_1(request: Request):
         return redir
 
     form = await request.form()
-    username = form.get("ring_username", "").strip()
-    password = form.get("ring_password", "").strip()
+    username, password = _form_strs(form, "ring_username", "ring_password")
 
     if not username or not password:
         return templates.TemplateResponse("step_1.html", {
@@ -106,7 +171,15 @@ async def post_step_1(request: Request):
     # Test Ring credentials
     try:
         from ring_client import RingClient
-        result = await RingClient.test_credentials(username, password)
+        result = await asyncio.wait_for(
+            RingClient.test_credentials(username, password), timeout=VALIDATION_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        return templates.TemplateResponse("step_1.html", {
+            "request": request, "current_step": 1,
+            "error": "Ring login timed out. Please try again.",
+            "ring_username": username, "ring_password": password,
+        })
     except Exception as e:
         return templates.TemplateResponse("step_1.html", {
             "request": request, "current_step": 1,
@@ -114,10 +187,11 @@ async def post_step_1(request: Request):
             "ring_username": username, "ring_password": password,
         })
 
-    _set_wizard_state(request, {
-        "ring_username": username,
-        "ring_password": password,
-    })
+    _set_wizard_state(
+        request,
+        ring_username=username,
+        ring_password=password,
+    )
 
     if result == "2fa_required":
         return RedirectResponse("/setup/step/2", status_code=303)
@@ -139,8 +213,8 @@ async def post_step_2(request: Request):
     otp_code = form.get("otp_code", "").strip()
     state = _get_wizard_state(request)
 
-    username = state.get("ring_username", "")
-    password = state.get("ring_password", "")
+    username = state.ring_username
+    password = state.ring_password
 
     if not otp_code:
         return templates.TemplateResponse("step_2.html", {
@@ -153,7 +227,15 @@ async def post_step_2(request: Request):
 
     try:
         from ring_client import RingClient
-        await RingClient.complete_2fa(username, password, otp_code)
+        await asyncio.wait_for(
+            RingClient.complete_2fa(username, password, otp_code),
+            timeout=VALIDATION_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        return templates.TemplateResponse("step_2.html", {
+            "request": request, "current_step": 2,
+            "error": "2FA verification timed out. Please try again.",
+        })
     except Exception as e:
         return templates.TemplateResponse("step_2.html", {
             "request": request, "current_step": 2,
@@ -173,9 +255,9 @@ async def post_step_3(request: Request):
         return redir
 
     form = await request.form()
-    token = form.get("switchbot_token", "").strip()
-    secret = form.get("switchbot_secret", "").strip()
-    device_id = form.get("switchbot_device_id", "").strip()
+    token, secret, device_id = _form_strs(
+        form, "switchbot_token", "switchbot_secret", "switchbot_device_id",
+    )
 
     if not token or not secret:
         return templates.TemplateResponse("step_3.html", {
@@ -194,7 +276,7 @@ async def post_step_3(request: Request):
         })
 
     # Validate by calling the SwitchBot API
-    ok, err = _test_switchbot(token, secret)
+    ok, err, _ = await _fetch_switchbot_devices(_http(request), token, secret)
     if not ok:
         return templates.TemplateResponse("step_3.html", {
             "request": request, "current_step": 3,
@@ -203,11 +285,12 @@ async def post_step_3(request: Request):
             "switchbot_device_id": device_id,
         })
 
-    _set_wizard_state(request, {
-        "switchbot_token": token,
-        "switchbot_secret": secret,
-        "switchbot_device_id": device_id,
-    })
+    _set_wizard_state(
+        request,
+        switchbot_token=token,
+        switchbot_secret=secret,
+        switchbot_device_id=device_id,
+    )
 
     return RedirectResponse("/setup/step/4", status_code=303)
 
@@ -222,9 +305,9 @@ async def post_step_4(request: Request):
         return redir
 
     form = await request.form()
-    username = form.get("dashboard_username", "").strip()
-    password = form.get("dashboard_password", "").strip()
-    confirm = form.get("dashboard_password_confirm", "").strip()
+    username, password, confirm = _form_strs(
+        form, "dashboard_username", "dashboard_password", "dashboard_password_confirm",
+    )
 
     if not username or not password:
         return templates.TemplateResponse("step_4.html", {
@@ -233,7 +316,7 @@ async def post_step_4(request: Request):
             "dashboard_username": username,
         })
 
-    if password != confirm:
+    if not _safe_eq(password, confirm):
         return templates.TemplateResponse("step_4.html", {
             "request": request, "current_step": 4,
             "error": "Passwords do not match.",
@@ -247,10 +330,11 @@ async def post_step_4(request: Request):
             "dashboard_username": username,
         })
 
-    _set_wizard_state(request, {
-        "dashboard_username": username,
-        "dashboard_password": password,
-    })
+    _set_wizard_state(
+        request,
+        dashboard_username=username,
+        dashboard_password=password,
+    )
 
     return RedirectResponse("/setup/step/5", status_code=303)
 
@@ -268,15 +352,15 @@ async def post_step_5(request: Request):
     action = form.get("action", "save")
 
     if action == "skip":
-        _set_wizard_state(request, {
-            "telegram_bot_token": "",
-            "telegram_chat_id": "",
-            "telegram_enabled": False,
-        })
+        _set_wizard_state(
+            request,
+            telegram_bot_token="",
+            telegram_chat_id="",
+            telegram_enabled=False,
+        )
         return RedirectResponse("/setup/step/6", status_code=303)
 
-    bot_token = form.get("telegram_bot_token", "").strip()
-    chat_id = form.get("telegram_chat_id", "").strip()
+    bot_token, chat_id = _form_strs(form, "telegram_bot_token", "telegram_chat_id")
 
     if not bot_token or not chat_id:
         return templates.TemplateResponse("step_5.html", {
@@ -285,11 +369,12 @@ async def post_step_5(request: Request):
             "telegram_bot_token": bot_token, "telegram_chat_id": chat_id,
         })
 
-    _set_wizard_state(request, {
-        "telegram_bot_token": bot_token,
-        "telegram_chat_id": chat_id,
-        "telegram_enabled": True,
-    })
+    _set_wizard_state(
+        request,
+        telegram_bot_token=bot_token,
+        telegram_chat_id=chat_id,
+        telegram_enabled=True,
+    )
 
     return RedirectResponse("/setup/step/6", status_code=303)
 
@@ -307,17 +392,18 @@ async def post_step_6(request: Request):
     action = form.get("action", "save")
 
     if action == "skip":
-        _set_wizard_state(request, {
-            "blink_username": "",
-            "blink_password": "",
-            "blink_camera_name": "",
-            "blink_enabled": False,
-        })
+        _set_wizard_state(
+            request,
+            blink_username="",
+            blink_password="",
+            blink_camera_name="",
+            blink_enabled=False,
+        )
         return RedirectResponse("/setup/step/7", status_code=303)
 
-    username = form.get("blink_username", "").strip()
-    password = form.get("blink_password", "").strip()
-    camera_name = form.get("blink_camera_name", "").strip()
+    username, password, camera_name = _form_strs(
+        form, "blink_username", "blink_password", "blink_camera_name",
+    )
 
     if not username or not password:
         return templates.TemplateResponse("step_6.html", {
@@ -327,12 +413,13 @@ async def post_step_6(request: Request):
             "blink_camera_name": camera_name,
         })
 
-    _set_wizard_state(request, {
-        "blink_username": username,
-        "blink_password": password,
-        "blink_camera_name": camera_name,
-        "blink_enabled": True,
-    })
+    _set_wizard_state(
+        request,
+        blink_username=username,
+        blink_password=password,
+        blink_camera_name=camera_name,
+        blink_enabled=True,
+    )
 
     return RedirectResponse("/setup/step/7", status_code=303)
 
@@ -341,7 +428,7 @@ async def post_step_6(request: Request):
 # Step 7: Finalize → write .env → restart
 # ---------------------------------------------------------------------------
 @router.post("/step/7", response_class=HTMLResponse)
-async def post_step_7(request: Request):
+async def post_step_7(request: Request, background_tasks: BackgroundTasks):
     redir = _guard(request)
     if redir:
         return redir
@@ -350,28 +437,28 @@ async def post_step_7(request: Request):
 
     # Build .env updates from wizard state
     env_updates = {
-        "RING_USERNAME": state.get("ring_username", ""),
-        "RING_PASSWORD": state.get("ring_password", ""),
-        "SWITCHBOT_TOKEN": state.get("switchbot_token", ""),
-        "SWITCHBOT_SECRET": state.get("switchbot_secret", ""),
-        "SWITCHBOT_DEVICE_ID": state.get("switchbot_device_id", ""),
-        "DASHBOARD_USERNAME": state.get("dashboard_username", "admin"),
-        "DASHBOARD_PASSWORD": state.get("dashboard_password", ""),
+        "RING_USERNAME": state.ring_username,
+        "RING_PASSWORD": state.ring_password,
+        "SWITCHBOT_TOKEN": state.switchbot_token,
+        "SWITCHBOT_SECRET": state.switchbot_secret,
+        "SWITCHBOT_DEVICE_ID": state.switchbot_device_id,
+        "DASHBOARD_USERNAME": state.dashboard_username or "admin",
+        "DASHBOARD_PASSWORD": state.dashboard_password,
     }
 
     # Only write Telegram keys if provided
-    if state.get("telegram_bot_token"):
-        env_updates["TELEGRAM_BOT_TOKEN"] = state["telegram_bot_token"]
-    if state.get("telegram_chat_id"):
-        env_updates["TELEGRAM_CHAT_ID"] = state["telegram_chat_id"]
+    if state.telegram_bot_token:
+        env_updates["TELEGRAM_BOT_TOKEN"] = state.telegram_bot_token
+    if state.telegram_chat_id:
+        env_updates["TELEGRAM_CHAT_ID"] = state.telegram_chat_id
 
     # Only write Blink keys if provided
-    if state.get("blink_username"):
-        env_updates["BLINK_USERNAME"] = state["blink_username"]
-    if state.get("blink_password"):
-        env_updates["BLINK_PASSWORD"] = state["blink_password"]
-    if state.get("blink_camera_name"):
-        env_updates["BLINK_CAMERA_NAME"] = state["blink_camera_name"]
+    if state.blink_username:
+        env_updates["BLINK_USERNAME"] = state.blink_username
+    if state.blink_password:
+        env_updates["BLINK_PASSWORD"] = state.blink_password
+    if state.blink_camera_name:
+        env_updates["BLINK_CAMERA_NAME"] = state.blink_camera_name
 
     # Validate minimum required fields are present
     missing = [k for k in ["RING_USERNAME", "RING_PASSWORD", "SWITCHBOT_TOKEN",
@@ -381,7 +468,7 @@ async def post_step_7(request: Request):
         return templates.TemplateResponse("step_7.html", {
             "request": request, "current_step": 7,
             "error": f"Missing required configuration: {', '.join(missing)}",
-            **state,
+            **asdict(state),
         })
 
     # Write .env and mark setup complete
@@ -395,9 +482,8 @@ async def post_step_7(request: Request):
         "request": request,
     })
 
-    # Schedule restart after response is sent
-    import asyncio
-    asyncio.get_event_loop().call_later(1.5, _restart_app)
+    # Restart once the completion page has been sent
+    background_tasks.add_task(_delayed_restart, request.app)
 
     return response
 
@@ -409,108 +495,99 @@ async def post_step_7(request: Request):
 async def validate_switchbot(request: Request):
     """Test SwitchBot token/secret and return device list."""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid request body."})
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
 
-    token = body.get("token", "").strip()
-    secret = body.get("secret", "").strip()
-
-    if not token or not secret:
-        return JSONResponse({"ok": False, "error": "Token and secret are required."})
-
-    ok, err = _test_switchbot(token, secret)
-    if not ok:
-        return JSONResponse({"ok": False, "error": err})
-
-    # Fetch device list
-    devices = _get_switchbot_devices(token, secret)
-    return JSONResponse({"ok": True, "devices": devices})
+    return ORJSONResponse(await _check_switchbot(request, body))
 
 
 @router.post("/api/validate-telegram")
 async def validate_telegram(request: Request):
     """Test Telegram bot token via getMe."""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid request body."})
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
 
-    token = body.get("token", "").strip()
-    if not token:
-        return JSONResponse({"ok": False, "error": "Token is required."})
-
-    try:
-        resp = http_requests.get(
-            f"https://api.telegram.org/bot{token}/getMe",
-            timeout=10,
-        )
-        data = resp.json()
-        if data.get("ok"):
-            bot_user = data["result"]
-            return JSONResponse({
-                "ok": True,
-                "bot_username": bot_user.get("username", "unknown"),
-            })
-        return JSONResponse({"ok": False, "error": "Invalid bot token."})
-    except Exception as e:
-        return JSONResponse({"ok": False, "error": str(e)})
+    return ORJSONResponse(await _check_telegram(request, body))
 
 
 @router.post("/api/validate-blink")
 async def validate_blink(request: Request):
     """Test Blink credentials. Stores temp BlinkClient on app.state for 2FA flow."""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid request body."})
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
 
-    username = body.get("username", "").strip()
-    password = body.get("password", "").strip()
+    return ORJSONResponse(await _check_blink(request, body))
 
-    if not username or not password:
-        return JSONResponse({"ok": False, "error": "Email and password are required."})
 
-    try:
-        from blink_client import BlinkClient
-        blink = BlinkClient(username, password)
-        await blink.authenticate()
+@router.post("/api/validate-all")
+async def validate_all(request: Request):
+    """Run the SwitchBot, Telegram and Blink checks concurrently.
 
-        if blink.needs_2fa:
-            # Store the instance so 2FA can be completed
-            request.app.state.wizard_blink = blink
-            return JSONResponse({"ok": True, "needs_2fa": True})
+    Body: {"switchbot": {token, secret}, "telegram": {token},
+    "blink": {username, password}} — each section optional. Returns one
+    result per submitted section (same shape as the single-service
+    endpoints) plus an overall "ok"; total latency is the slowest check,
+    not the sum.
+    """
+    try:
+        body = orjson.loads(await request.body())
+    except Exception:
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
+    if not isinstance(body, dict):
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
+
+    checks = {
+        name: check(request, body[name])
+        for name, check in (
+            ("switchbot", _check_switchbot),
+            ("telegram", _check_telegram),
+            ("blink", _check_blink),
+        )
+        if isinstance(body.get(name), dict)
+    }
+    if not checks:
+        return ORJSONResponse({"ok": False, "error": "No credentials to validate."})
 
-        # Fully authenticated — no need to keep the instance
-        await blink.stop()
-        return JSONResponse({"ok": True, "needs_2fa": False})
-    except Exception as e:
-        return JSONResponse({"ok": False, "error": f"Blink login failed: {e}"})
+    outcomes = await asyncio.gather(*checks.values(), return_exceptions=True)
+    results = {
+        name: outcome if isinstance(outcome, dict) else {"ok": False, "error": str(outcome)}
+        for name, outcome in zip(checks, outcomes)
+    }
+    results["ok"] = all(r["ok"] for r in results.values())
+    return ORJSONResponse(results)
 
 
 @router.post("/api/blink-2fa")
 async def validate_blink_2fa(request: Request):
     """Submit Blink 2FA code using the stored wizard BlinkClient."""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid request body."})
+        return ORJSONResponse({"ok": False, "error": "Invalid request body."})
 
     code = body.get("code", "").strip()
     if not code:
-        return JSONResponse({"ok": False, "error": "Verification code is required."})
+        return ORJSONResponse({"ok": False, "error": "Verification code is required."})
 
     blink = getattr(request.app.state, "wizard_blink", None)
     if blink is None:
-        return JSONResponse({"ok": False, "error": "No pending Blink auth. Test connection first."})
+        return ORJSONResponse({"ok": False, "error": "No pending Blink auth. Test connection first."})
 
-    success = await blink.submit_2fa(code)
+    try:
+        success = await asyncio.wait_for(blink.submit_2fa(code), timeout=VALIDATION_TIMEOUT)
+    except asyncio.TimeoutError:
+        return ORJSONResponse({"ok": False, "error": "Blink verification timed out."})
     if not success:
-        return JSONResponse({"ok": False, "error": "Invalid verification code. Check your email and try again."})
+        return ORJSONResponse({"ok": False, "error": "Invalid verification code. Check your email and try again."})
 
     await blink.stop()
     request.app.state.wizard_blink = None
-    return JSONResponse({"ok": True})
+    return ORJSONResponse({"ok": True})
 
 
 @router.post("/api/install-autostart")
@@ -518,27 +595,102 @@ async def install_autostart(request: Request):
     """Install OS-level autostart service."""
     try:
         from setup.autostart import install_autostart as do_install
-        result = do_install()
-        return JSONResponse(result)
+        # launchctl/systemctl block; keep them off the event loop
+        result = await asyncio.to_thread(do_install)
+        return ORJSONResponse(result)
     except Exception as e:
-        return JSONResponse({"ok": False, "error": str(e)})
+        return ORJSONResponse({"ok": False, "error": str(e)})
+
+
+# ---------------------------------------------------------------------------
+# Validation checks (return the JSON payload of the matching endpoint)
+# ---------------------------------------------------------------------------
+async def _check_switchbot(request: Request, body: dict) -> dict:
+    token = body.get("token", "").strip()
+    secret = body.get("secret", "").strip()
+
+    if not token or not secret:
+        return {"ok": False, "error": "Token and secret are required."}
+
+    # One GET /devices both validates the credentials and lists the locks
+    ok, err, devices = await _fetch_switchbot_devices(_http(request), token, secret)
+    if not ok:
+        return {"ok": False, "error": err}
+    return {"ok": True, "devices": devices}
+
+
+async def _check_telegram(request: Request, body: dict) -> dict:
+    token = body.get("token", "").strip()
+    if not token:
+        return {"ok": False, "error": "Token is required."}
+
+    try:
+        resp = await asyncio.wait_for(
+            _http(request).get(f"https://api.telegram.org/bot{token}/getMe", timeout=10),
+            timeout=VALIDATION_TIMEOUT,
+        )
+        data = orjson.loads(resp.content)
+        if data.get("ok"):
+            bot_user = data["result"]
+            return {
+                "ok": True,
+                "bot_username": bot_user.get("username", "unknown"),
+            }
+        return {"ok": False, "error": "Invalid bot token."}
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": "Telegram API timed out."}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+async def _check_blink(request: Request, body: dict) -> dict:
+    username = body.get("username", "").strip()
+    password = body.get("password", "").strip()
+
+    if not username or not password:
+        return {"ok": False, "error": "Email and password are required."}
+
+    try:
+        from blink_client import BlinkClient
+        blink = BlinkClient(username, password)
+        try:
+            await asyncio.wait_for(blink.authenticate(), timeout=VALIDATION_TIMEOUT)
+        except asyncio.TimeoutError:
+            await blink.stop()
+            return {"ok": False, "error": "Blink login timed out."}
+
+        if blink.needs_2fa:
+            # Store the instance so 2FA can be completed
+            request.app.state.wizard_blink = blink
+            return {"ok": True, "needs_2fa": True}
+
+        # Fully authenticated — no need to keep the instance
+        await blink.stop()
+        return {"ok": True, "needs_2fa": False}
+    except Exception as e:
+        return {"ok": False, "error": f"Blink login failed: {e}"}
 
 
 # ---------------------------------------------------------------------------
 # SwitchBot helpers
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=8)
+def _hmac_pads(secret: str) -> tuple:
+    """Keyed HMAC-SHA256 pad states per secret; callers sign on copies."""
+    return hmac_sha256_pads(secret)
+
+
 def _build_switchbot_headers(token: str, secret: str) -> dict:
     """Build HMAC-SHA256 authenticated headers for SwitchBot API."""
-    nonce = uuid.uuid4().hex
-    timestamp = str(int(time.time() * 1000))
+    nonce = secrets.token_hex(16)
+    timestamp = str(time.time_ns() // 1_000_000)
     sign_payload = f"{token}{timestamp}{nonce}"
-    signature = base64.b64encode(
-        hmac.new(
-            secret.encode("utf-8"),
-            sign_payload.encode("utf-8"),
-            hashlib.sha256,
-        ).digest()
-    ).decode("utf-8")
+    inner_pad, outer_pad = _hmac_pads(secret)
+    inner = inner_pad.copy()
+    inner.update(sign_payload.encode("utf-8"))
+    outer = outer_pad.copy()
+    outer.update(inner.digest())
+    signature = base64.b64encode(outer.digest()).decode("utf-8")
     return {
         "Authorization": token,
         "sign": signature,
@@ -548,54 +700,101 @@ def _build_switchbot_headers(token: str, secret: str) -> dict:
     }
 
 
-def _test_switchbot(token: str, secret: str) -> tuple[bool, str]:
-    """Test SwitchBot API credentials. Returns (ok, error_message)."""
+async def _fetch_switchbot_devices(
+    client: httpx.AsyncClient, token: str, secret: str
+) -> tuple[bool, str, list[dict]]:
+    """Validate SwitchBot credentials and list lock-type devices in one GET /devices.
+
+    Returns (ok, error_message, devices); devices is empty when not ok.
+    Successful results are cached for SWITCHBOT_CACHE_TTL seconds; a failure
+    drops any cached entry for the same credentials. Concurrent calls for the
+    same credentials (validate-all racing a Discover click) share one request.
+    """
+    cache_key = hashlib.sha256(f"{token}\0{secret}".encode("utf-8")).hexdigest()
+    now = time.monotonic()
+    cached = _switchbot_cache.get(cache_key)
+    if cached is not None and now < cached[0]:
+        return True, "", cached[1]
+
+    task = _switchbot_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_request_switchbot_devices(client, token, secret))
+        _switchbot_inflight[cache_key] = task
+        task.add_done_callback(lambda _t: _switchbot_inflight.pop(cache_key, None))
+    # shield: one caller disconnecting or timing out must not cancel the
+    # others' request
     try:
-        headers = _build_switchbot_headers(token, secret)
-        resp = http_requests.get(
-            f"{SWITCHBOT_API_BASE}/devices",
-            headers=headers,
-            timeout=10,
+        ok, err, devices = await asyncio.wait_for(
+            asyncio.shield(task), timeout=VALIDATION_TIMEOUT,
         )
-        data = resp.json()
-        if data.get("statusCode") == 100:
-            return True, ""
-        return False, data.get("message", "API returned an error.")
-    except Exception as e:
-        return False, str(e)
+    except asyncio.TimeoutError:
+        return False, "SwitchBot API timed out.", []
+
+    if ok:
+        if len(_switchbot_cache) >= SWITCHBOT_CACHE_MAX:
+            now = time.monotonic()
+            for key in [k for k, (exp, _) in _switchbot_cache.items() if exp <= now]:
+                del _switchbot_cache[key]
+        if len(_switchbot_cache) >= SWITCHBOT_CACHE_MAX:
+            # Dicts keep insertion order: evict the oldest entry
+            _switchbot_cache.pop(next(iter(_switchbot_cache)))
+        _switchbot_cache[cache_key] = (time.monotonic() + SWITCHBOT_CACHE_TTL, devices)
+    else:
+        _switchbot_cache.pop(cache_key, None)
+    return ok, err, devices
 
 
-def _get_switchbot_devices(token: str, secret: str) -> list[dict]:
-    """Fetch SwitchBot devices, returning lock-type devices."""
+async def _request_switchbot_devices(
+    client: httpx.AsyncClient, token: str, secret: str
+) -> tuple[bool, str, list[dict]]:
+    """Uncached GET /devices behind _fetch_switchbot_devices."""
     try:
         headers = _build_switchbot_headers(token, secret)
-        resp = http_requests.get(
+        resp = await client.get(
             f"{SWITCHBOT_API_BASE}/devices",
             headers=headers,
             timeout=10,
         )
-        data = resp.json()
-        if data.get("statusCode") != 100:
-            return []
-
-        devices = []
-        for d in data.get("body", {}).get("deviceList", []):
-            dtype = d.get("deviceType", "").lower()
-            if "lock" in dtype:
-                devices.append({
-                    "id": d.get("deviceId", ""),
-                    "name": d.get("deviceName", "Unknown"),
-                    "type": d.get("deviceType", ""),
-                })
-        return devices
-    except Exception:
-        return []
+        data = orjson.loads(resp.content)
+    except Exception as e:
+        return False, str(e), []
+
+    if data.get("statusCode") != 100:
+        return False, data.get("message", "API returned an error."), []
+
+    devices = []
+    for d in data.get("body", {}).get("deviceList", []):
+        dtype = d.get("deviceType", "").lower()
+        if "lock" in dtype:
+            devices.append({
+                "id": d.get("deviceId", ""),
+                "name": d.get("deviceName", "Unknown"),
+                "type": d.get("deviceType", ""),
+            })
+    return True, "", devices
 
 
 # ---------------------------------------------------------------------------
 # Restart helper
 # ---------------------------------------------------------------------------
-def _restart_app():
-    """Restart the current process using os.execv."""
+async def _delayed_restart(app, delay: float = 1.5) -> None:
+    """Give the browser a moment to load the completion page, then restart."""
+    await asyncio.sleep(delay)
+    _restart_app(app)
+
+
+def _restart_app(app) -> None:
+    """Restart into operational mode.
+
+    Under `python app.py` the serve loop starts uvicorn again in this
+    interpreter, skipping Python startup and the re-import of every module.
+    Servers launched any other way (e.g. `uvicorn app:app`) fall back to
+    re-executing the process with os.execv.
+    """
+    request_restart = getattr(app.state, "request_restart", None)
+    if request_restart is not None:
+        logger.info("Restarting server in-process...")
+        request_restart()
+        return
     logger.info("Restarting process via os.execv...")
     os.execv(sys.executable, [sys.executable] + sys.argv)
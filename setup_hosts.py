@@ -36,12 +36,13 @@ def _write_hosts(content: str) -> None:
 def add() -> None:
     content = _read_hosts()
 
-    # Already present
-    for line in content.splitlines():
-        stripped = line.strip()
-        if not stripped.startswith("#") and HOSTNAME in stripped:
-            print(f"'{HOSTNAME}' already in hosts file — no changes made.")
-            return
+    # Already present (line scan only needed to skip commented-out entries)
+    if HOSTNAME in content:
+        for line in content.splitlines():
+            stripped = line.strip()
+            if not stripped.startswith("#") and HOSTNAME in stripped:
+                print(f"'{HOSTNAME}' already in hosts file — no changes made.")
+                return
 
     if not content.endswith("\n"):
         content += "\n"
@@ -54,13 +55,11 @@ def add() -> None:
 
 def remove() -> None:
     content = _read_hosts()
-    lines = content.splitlines()
-    filtered = [l for l in lines if HOSTNAME not in l]
-
-    if len(filtered) == len(lines):
+    if HOSTNAME not in content:
         print(f"'{HOSTNAME}' not found in hosts file — no changes made.")
         return
 
+    filtered = [l for l in content.splitlines() if HOSTNAME not in l]
     _write_hosts("\n".join(filtered) + "\n")
     print(f"Removed '{HOSTNAME}' from {_hosts_path()}")
 
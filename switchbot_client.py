@@ -1,38 +1,67 @@
 import hashlib
-import hmac
 import base64
 import logging
+import secrets
 import time
-import uuid
 
-import requests
+import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 SWITCHBOT_API_BASE = "https://api.switch-bot.com/v1.1"
 
+# How long signed headers are reused for read-only status polls. Well inside
+# SwitchBot's signature validity window; commands always get a fresh signature.
+HEADER_CACHE_SECONDS = 25.0
+
+_SHA256_BLOCK = 64
+
+
+def hmac_sha256_pads(secret: str) -> tuple:
+    """SHA-256 states already fed the HMAC inner and outer key pads (RFC 2104).
+
+    Signing copies these and hashes payload, then inner digest — the same
+    bytes hmac.new() would produce, without its per-call Python dispatch.
+    """
+    key = secret.encode("utf-8")
+    if len(key) > _SHA256_BLOCK:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(_SHA256_BLOCK, b"\0")
+    return (
+        hashlib.sha256(bytes(b ^ 0x36 for b in key)),
+        hashlib.sha256(bytes(b ^ 0x5C for b in key)),
+    )
+
 
 class SwitchBotClient:
     """Controls SwitchBot Lock via the Cloud API (routed through Hub Mini)."""
 
-    def __init__(self, token: str, secret: str, device_id: str):
+    def __init__(self, token: str, secret: str, device_id: str, http: httpx.AsyncClient | None = None):
         self.token = token
         self.secret = secret
         self.device_id = device_id
+        # Shared async connection pool (app.state.http) — reuses TLS sessions
+        # across requests instead of a fresh handshake per call. Standalone
+        # use gets a private pool on first request, closed by aclose().
+        self._http = http
+        self._owns_http = False
+        self._last_headers: dict | None = None
+        self._last_headers_time = 0.0
+        # Keyed HMAC pad states; copy() per signature skips re-deriving them
+        self._inner, self._outer = hmac_sha256_pads(secret)
 
     def _build_headers(self) -> dict:
         """Generate authenticated headers with HMAC-SHA256 signature (API v1.1)."""
-        nonce = uuid.uuid4().hex
-        timestamp = str(int(time.time() * 1000))
+        nonce = secrets.token_hex(16)
+        timestamp = str(time.time_ns() // 1_000_000)
 
         sign_payload = f"{self.token}{timestamp}{nonce}"
-        signature = base64.b64encode(
-            hmac.new(
-                self.secret.encode("utf-8"),
-                sign_payload.encode("utf-8"),
-                hashlib.sha256,
-            ).digest()
-        ).decode("utf-8")
+        inner = self._inner.copy()
+        inner.update(sign_payload.encode("utf-8"))
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        signature = base64.b64encode(outer.digest()).decode("utf-8")
 
         return {
             "Authorization": self.token,
@@ -42,15 +71,29 @@ class SwitchBotClient:
             "Content-Type": "application/json",
         }
 
-    def get_lock_status(self) -> dict | None:
+    def _client(self) -> httpx.AsyncClient:
+        """The injected pool, or a private one created on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=10)
+            self._owns_http = True
+        return self._http
+
+    def _status_headers(self) -> dict:
+        """Signed headers for status reads, cached for HEADER_CACHE_SECONDS."""
+        now = time.monotonic()
+        if self._last_headers is None or now - self._last_headers_time >= HEADER_CACHE_SECONDS:
+            self._last_headers = self._build_headers()
+            self._last_headers_time = now
+        return self._last_headers
+
+    async def get_lock_status(self) -> dict | None:
         """Get current lock status."""
         try:
-            resp = requests.get(
+            resp = await self._client().get(
                 f"{SWITCHBOT_API_BASE}/devices/{self.device_id}/status",
-                headers=self._build_headers(),
-                timeout=10,
+                headers=self._status_headers(),
             )
-            data = resp.json()
+            data = orjson.loads(resp.content)
             if data.get("statusCode") == 100:
                 return data["body"]
             logger.error(f"Lock status error: {data}")
@@ -59,20 +102,23 @@ class SwitchBotClient:
             logger.error(f"Failed to get lock status: {e}")
             return None
 
-    def unlock(self) -> bool:
+    async def _command(self, command: str) -> dict:
+        """POST a lock command with a freshly signed request; returns the JSON reply."""
+        resp = await self._client().post(
+            f"{SWITCHBOT_API_BASE}/devices/{self.device_id}/commands",
+            headers=self._build_headers(),
+            json={
+                "command": command,
+                "parameter": "default",
+                "commandType": "command",
+            },
+        )
+        return orjson.loads(resp.content)
+
+    async def unlock(self) -> bool:
         """Send unlock command to the SwitchBot Lock."""
         try:
-            resp = requests.post(
-                f"{SWITCHBOT_API_BASE}/devices/{self.device_id}/commands",
-                headers=self._build_headers(),
-                json={
-                    "command": "unlock",
-                    "parameter": "default",
-                    "commandType": "command",
-                },
-                timeout=10,
-            )
-            data = resp.json()
+            data = await self._command("unlock")
 
             if data.get("statusCode") == 100:
                 logger.info("Lock unlocked successfully")
@@ -84,20 +130,10 @@ class SwitchBotClient:
             logger.error(f"Unlock request failed: {e}")
             return False
 
-    def lock(self) -> bool:
+    async def lock(self) -> bool:
         """Send lock command to the SwitchBot Lock."""
         try:
-            resp = requests.post(
-                f"{SWITCHBOT_API_BASE}/devices/{self.device_id}/commands",
-                headers=self._build_headers(),
-                json={
-                    "command": "lock",
-                    "parameter": "default",
-                    "commandType": "command",
-                },
-                timeout=10,
-            )
-            data = resp.json()
+            data = await self._command("lock")
 
             if data.get("statusCode") == 100:
                 logger.info("Lock locked successfully")
@@ -108,3 +144,10 @@ class SwitchBotClient:
         except Exception as e:
             logger.error(f"Lock request failed: {e}")
             return False
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this instance created it (injected pools are left open)."""
+        if self._owns_http:
+            await self._http.aclose()
+            self._http = None
+            self._owns_http = False
@@ -9,27 +9,93 @@ Design decisions (from Phase 4 research):
 - Uses ExtBot + AIORateLimiter (not Application.run_polling) to avoid
   creating a second asyncio event loop that conflicts with uvicorn.
 - 60-second coalescing per alert type prevents Telegram flood bans from
-  burst Ring motion events.
-- Lock is released before HTTP I/O so coalescing never blocks other
-  coroutines while a slow send is in progress (research pitfall #2).
+  burst Ring motion events. Every alert type goes through one _alert()
+  dispatcher keyed by kind, so adding a type is one _COALESCE entry.
+- Coalescing is a lock-free compare-and-set on a monotonic timestamp: there
+  is no await between the check and the update, so under asyncio's
+  cooperative scheduling no other coroutine can interleave, and nothing is
+  held across the HTTP send (research pitfall #2).
+- Identical alerts (same kind and same photo bytes, or same caption when
+  there is no photo) are dropped for DEDUP_TTL seconds, so re-processing
+  one recording or an unchanged camera thumbnail never re-alerts.
+- Sends are paced by an AIMD rate: each success raises the permitted rate
+  additively, each RetryAfter halves it and holds all sends until Telegram's
+  window reopens, so a burst of alerts slows down before it hits 429 again.
+- Alerts that pass coalescing are queued for a background worker started
+  by initialize(), so the detection pipeline never waits on Telegram's
+  round-trip (or a RetryAfter). A full queue drops the alert with a warning.
 - TelegramError is caught and logged — Telegram unavailability must never
   prevent door unlock or event persistence.
 """
 
 import asyncio
+import hashlib
 import logging
+import random
 import time
+import warnings
+from collections import defaultdict
 from datetime import timedelta
 from pathlib import Path
 
+from telegram import InputFile
 from telegram.error import RetryAfter, TelegramError
 from telegram.ext import AIORateLimiter, ExtBot
+from telegram.request import HTTPXRequest
 
 logger = logging.getLogger("smart-lock.telegram")
 
 # Duplicate alerts within this window are silently suppressed (TELE-04)
 COALESCE_SECONDS: int = 60
 
+# Identical alerts (same kind + photo bytes, or caption without a photo) are
+# dropped for this long; the key table is pruned once it passes DEDUP_MAX
+DEDUP_TTL: float = 15 * 60
+DEDUP_MAX: int = 256
+
+# RetryAfter handling: up to SEND_ATTEMPTS tries, each retry waiting the
+# larger of Telegram's retry_after and an exponential backoff (1, 2, 4 s ...,
+# capped), plus up to RETRY_JITTER of that wait so retries don't align
+SEND_ATTEMPTS: int = 4
+RETRY_BACKOFF_CAP: float = 60.0
+RETRY_JITTER: float = 0.1
+
+# PTB v22 reports RetryAfter.retry_after as int seconds unless PTB_TIMEDELTA
+# opts in to timedelta (the future default). The environment is fixed for
+# the process, so probe once here instead of type-checking every 429.
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")  # PTBDeprecationWarning on the int path
+    _USES_TIMEDELTA: bool = isinstance(RetryAfter(1).retry_after, timedelta)
+
+# Per-call timeouts for photo uploads (PTB's defaults are 5 s read/connect)
+PHOTO_CONNECT_TIMEOUT: float = 5.0
+PHOTO_WRITE_TIMEOUT: float = 20.0
+PHOTO_READ_TIMEOUT: float = 20.0
+
+# Alerts waiting for the send worker; beyond this they are dropped
+SEND_QUEUE_SIZE: int = 50
+# How long shutdown() waits for queued alerts to go out
+SHUTDOWN_DRAIN_SECONDS: float = 10.0
+
+# Keep-alive pool for sends (alerts, command replies, photos). getUpdates
+# long-polls on its own single-connection pool so it never holds these.
+SEND_POOL_SIZE: int = 20
+
+# Adaptive send pacing (AIMD), in messages per second. Telegram asks bots to
+# stay around one message per second per chat.
+SEND_RATE_MAX: float = 1.0
+SEND_RATE_MIN: float = 1 / 30
+SEND_RATE_STEP: float = 0.1      # additive increase per successful send
+SEND_RATE_BACKOFF: float = 0.5   # multiplicative decrease per RetryAfter
+
+
+def _read_bytes(path: str) -> bytes | None:
+    """Read a file's contents, or None if it does not exist."""
+    try:
+        return Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+
 
 class TelegramAlerter:
     """
@@ -43,6 +109,13 @@ class TelegramAlerter:
         await alerter.shutdown()
     """
 
+    # Coalescing window in seconds per alert kind
+    _COALESCE: dict[str, float] = {
+        "stranger": COALESCE_SECONDS,
+        "unlock": COALESCE_SECONDS,
+        "blink_motion": COALESCE_SECONDS,
+    }
+
     def __init__(self, token: str, chat_id: str | int) -> None:
         """
         Initialize the alerter with a bot token and target chat ID.
@@ -53,32 +126,43 @@ class TelegramAlerter:
         """
         self._bot = ExtBot(
             token=token,
+            request=HTTPXRequest(connection_pool_size=SEND_POOL_SIZE),
+            get_updates_request=HTTPXRequest(connection_pool_size=1),
             rate_limiter=AIORateLimiter(max_retries=1),
         )
         self._chat_id = chat_id
 
-        # Separate monotonic timestamps per alert type so stranger and unlock
+        # Separate monotonic timestamps per alert kind so stranger and unlock
         # alerts never suppress each other (TELE-04 requirement)
-        self._last_stranger_alert: float = 0.0
-        self._last_unlock_alert: float = 0.0
-        self._last_blink_motion_alert: float = 0.0
+        self._last_alert: dict[str, float] = defaultdict(float)
+
+        # Content hash -> monotonic time it was last sent (see DEDUP_TTL)
+        self._dedup: dict[str, float] = {}
 
         # Mute support — monotonic timestamp until which alerts are suppressed
         self._muted_until: float = 0.0
 
-        # Single asyncio.Lock guards timestamp reads and updates only
-        # (released BEFORE any HTTP I/O — see _send_photo call sites)
-        self._lock = asyncio.Lock()
+        # AIMD pacing state: current permitted rate and the earliest
+        # monotonic time the next send may start
+        self._send_rate: float = SEND_RATE_MAX
+        self._next_send: float = 0.0
+
+        # (kind, thumbnail_path, caption) for the worker; until initialize()
+        # starts it, alerts are delivered inline
+        self._send_queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._worker: asyncio.Task | None = None
 
     async def initialize(self) -> None:
         """
-        Open the HTTPX connection pool and validate chat reachability.
+        Open the HTTPX connection pools, start the send worker and validate
+        chat reachability.
 
         On TelegramError (bad token, bot blocked, network down): logs the
         error but does NOT raise — Telegram unavailability must not prevent
         door unlock or event logging from functioning.
         """
         await self._bot.initialize()
+        self._worker = asyncio.create_task(self._drain())
         try:
             chat = await self._bot.get_chat(chat_id=self._chat_id)
             logger.info(
@@ -106,7 +190,22 @@ class TelegramAlerter:
         logger.info("Alerts unmuted")
 
     async def shutdown(self) -> None:
-        """Close the HTTPX connection pool cleanly."""
+        """Flush queued alerts (bounded), stop the worker, close the pools."""
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(
+                    self._send_queue.join(), timeout=SHUTDOWN_DRAIN_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {self._send_queue.qsize()} queued Telegram alert(s) on shutdown"
+                )
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
         await self._bot.shutdown()
 
     async def alert_stranger(
@@ -119,22 +218,10 @@ class TelegramAlerter:
         previous stranger alert, or if alerts are muted.
 
         Args:
-            thumbnail_path: Absolute path to a JPEG thumbnail, or None.
+            thumbnail_path: Absolute path to a WebP or JPEG thumbnail, or None.
             caption: Human-readable alert caption.
         """
-        if self.is_muted:
-            logger.debug("Stranger alert suppressed (muted)")
-            return
-        async with self._lock:
-            now = time.monotonic()
-            if now - self._last_stranger_alert < COALESCE_SECONDS:
-                logger.debug(
-                    "Stranger alert suppressed (within coalesce window)"
-                )
-                return
-            self._last_stranger_alert = now
-        # Lock is released BEFORE the HTTP call — never hold lock across I/O
-        await self._send_photo(thumbnail_path, caption)
+        await self._alert("stranger", thumbnail_path, caption)
 
     async def alert_unlock(
         self, thumbnail_path: str | None, caption: str
@@ -146,22 +233,10 @@ class TelegramAlerter:
         previous unlock alert, or if alerts are muted.
 
         Args:
-            thumbnail_path: Absolute path to a JPEG thumbnail, or None.
+            thumbnail_path: Absolute path to a WebP or JPEG thumbnail, or None.
             caption: Human-readable alert caption.
         """
-        if self.is_muted:
-            logger.debug("Unlock alert suppressed (muted)")
-            return
-        async with self._lock:
-            now = time.monotonic()
-            if now - self._last_unlock_alert < COALESCE_SECONDS:
-                logger.debug(
-                    "Unlock alert suppressed (within coalesce window)"
-                )
-                return
-            self._last_unlock_alert = now
-        # Lock is released BEFORE the HTTP call — never hold lock across I/O
-        await self._send_photo(thumbnail_path, caption)
+        await self._alert("unlock", thumbnail_path, caption)
 
     async def alert_blink_motion(
         self, thumbnail_path: str | None, caption: str
@@ -173,71 +248,163 @@ class TelegramAlerter:
         stranger or unlock alert types.
 
         Args:
-            thumbnail_path: Absolute path to a JPEG thumbnail, or None.
+            thumbnail_path: Absolute path to a WebP or JPEG thumbnail, or None.
             caption: Human-readable alert caption.
         """
-        if self.is_muted:
-            logger.debug("Blink motion alert suppressed (muted)")
+        await self._alert("blink_motion", thumbnail_path, caption)
+
+    async def _alert(
+        self, kind: str, thumbnail_path: str | None, caption: str
+    ) -> None:
+        """
+        Queue an alert of the given kind unless muted or coalesced.
+
+        Once initialize() has started the worker this returns immediately;
+        before that the alert is delivered inline.
+
+        Args:
+            kind: Key into _COALESCE ("stranger", "unlock", "blink_motion").
+            thumbnail_path: Absolute path to a WebP or JPEG thumbnail, or None.
+            caption: Human-readable alert caption.
+        """
+        # One clock read serves both the mute check and the coalesce window
+        now = time.monotonic()
+        if now < self._muted_until:
+            logger.debug(f"{kind} alert suppressed (muted)")
             return
-        async with self._lock:
-            now = time.monotonic()
-            if now - self._last_blink_motion_alert < COALESCE_SECONDS:
-                logger.debug(
-                    "Blink motion alert suppressed (within coalesce window)"
-                )
-                return
-            self._last_blink_motion_alert = now
-        # Lock is released BEFORE the HTTP call — never hold lock across I/O
-        await self._send_photo(thumbnail_path, caption)
+        # No await between the check and the update, so this compare-and-set
+        # is atomic under cooperative scheduling — no lock needed
+        if now - self._last_alert[kind] < self._COALESCE[kind]:
+            logger.debug(f"{kind} alert suppressed (within coalesce window)")
+            return
+        self._last_alert[kind] = now
 
-    async def _send_photo(
-        self, thumbnail_path: str | None, caption: str
+        if self._worker is None:
+            await self._deliver(kind, thumbnail_path, caption)
+            return
+        try:
+            self._send_queue.put_nowait((kind, thumbnail_path, caption))
+        except asyncio.QueueFull:
+            logger.warning(f"{kind} alert dropped (send queue full)")
+
+    async def _drain(self) -> None:
+        """Send worker: deliver queued alerts one at a time until cancelled."""
+        while True:
+            kind, thumbnail_path, caption = await self._send_queue.get()
+            try:
+                await self._deliver(kind, thumbnail_path, caption)
+            except Exception:
+                logger.exception(f"Unexpected error delivering {kind} alert")
+            finally:
+                self._send_queue.task_done()
+
+    async def _deliver(
+        self, kind: str, thumbnail_path: str | None, caption: str
     ) -> None:
+        """Load the thumbnail, drop identical repeats, and send."""
+        # Read once up front: a RetryAfter retry re-sends the same buffer
+        # instead of going back to disk. stat + read run in a worker thread
+        # so a slow SD card never stalls the event loop.
+        photo = (
+            await asyncio.to_thread(_read_bytes, thumbnail_path)
+            if thumbnail_path is not None
+            else None
+        )
+        if photo is None and thumbnail_path is not None:
+            logger.warning(
+                f"Thumbnail not found at {thumbnail_path!r}, "
+                "sending text alert instead"
+            )
+        if self._is_duplicate(kind, photo if photo is not None else caption.encode()):
+            logger.debug(f"{kind} alert suppressed (identical alert within {DEDUP_TTL:.0f}s)")
+            return
+        await self._send_photo(
+            # Wrapped once so retries reuse it; the filename sets the MIME type
+            InputFile(photo, filename=Path(thumbnail_path).name) if photo is not None else None,
+            caption,
+        )
+
+    def _is_duplicate(self, kind: str, content: bytes) -> bool:
+        """Record this alert's content hash; True if it was sent within DEDUP_TTL."""
+        digest = hashlib.blake2s(content, digest_size=8, person=kind.encode()[:8])
+        key = digest.hexdigest()
+        now = time.monotonic()
+        if now - self._dedup.get(key, -DEDUP_TTL) < DEDUP_TTL:
+            return True
+        if len(self._dedup) >= DEDUP_MAX:
+            self._dedup = {k: t for k, t in self._dedup.items() if now - t < DEDUP_TTL}
+        self._dedup[key] = now
+        return False
+
+    async def _wait_send_slot(self) -> None:
+        """
+        Wait for this send's turn under the AIMD pacing.
+
+        The slot is reserved before sleeping with no await in between, so
+        concurrent alerts queue up one interval apart without a lock.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_send)
+        self._next_send = slot + 1 / self._send_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _send_photo(self, photo: InputFile | None, caption: str) -> None:
         """
         Send a single Telegram message (photo + caption, or text fallback).
 
-        Implements first-try + one-retry on RetryAfter. All TelegramError
+        Retries RetryAfter up to SEND_ATTEMPTS times with capped exponential
+        backoff and jitter, each attempt paced by _wait_send_slot. All TelegramError
         exceptions are caught and logged — never propagated.
 
         Args:
-            thumbnail_path: Path to thumbnail file, or None for text-only.
+            photo: Thumbnail as an in-memory InputFile, or None for text-only.
             caption: Alert text (used as photo caption or plain message).
         """
-        for attempt in range(2):  # first try + one RetryAfter retry
+        for attempt in range(SEND_ATTEMPTS):
+            await self._wait_send_slot()
             try:
-                if thumbnail_path is not None and Path(thumbnail_path).exists():
-                    with open(thumbnail_path, "rb") as photo:
-                        await self._bot.send_photo(
-                            chat_id=self._chat_id,
-                            photo=photo,
-                            caption=caption,
-                        )
+                if photo is not None:
+                    await self._bot.send_photo(
+                        chat_id=self._chat_id,
+                        photo=photo,
+                        caption=caption,
+                        connect_timeout=PHOTO_CONNECT_TIMEOUT,
+                        write_timeout=PHOTO_WRITE_TIMEOUT,
+                        read_timeout=PHOTO_READ_TIMEOUT,
+                    )
                 else:
                     # Thumbnail missing or unavailable — fall back to text
-                    if thumbnail_path is not None:
-                        logger.warning(
-                            f"Thumbnail not found at {thumbnail_path!r}, "
-                            "sending text alert instead"
-                        )
                     await self._bot.send_message(
                         chat_id=self._chat_id,
                         text=caption,
                     )
+                self._send_rate = min(SEND_RATE_MAX, self._send_rate + SEND_RATE_STEP)
                 return  # Success — exit loop
 
             except RetryAfter as exc:
-                # PTB v22 may return retry_after as int or timedelta
-                wait = (
+                retry_after = (
                     exc.retry_after.total_seconds()
-                    if isinstance(exc.retry_after, timedelta)
+                    if _USES_TIMEDELTA
                     else float(exc.retry_after)
                 )
+                self._send_rate = max(SEND_RATE_MIN, self._send_rate * SEND_RATE_BACKOFF)
+                if attempt + 1 == SEND_ATTEMPTS:
+                    logger.error(
+                        f"Telegram alert dropped after {SEND_ATTEMPTS} RetryAfter "
+                        f"responses (last retry_after={retry_after:.1f}s)"
+                    )
+                    self._next_send = max(self._next_send, time.monotonic() + retry_after)
+                    return
+                wait = max(retry_after, min(RETRY_BACKOFF_CAP, 2.0 ** attempt))
+                wait += random.uniform(0, RETRY_JITTER * wait)
                 logger.warning(
                     f"Telegram RetryAfter: waiting {wait:.1f}s "
-                    f"(attempt {attempt + 1}/2)"
+                    f"(attempt {attempt + 1}/{SEND_ATTEMPTS}, rate now {self._send_rate:.2f}/s)"
                 )
-                await asyncio.sleep(wait)
-                # continue to next iteration for retry
+                # Hold every send (this retry included) until the window
+                # reopens; _wait_send_slot does the waiting
+                self._next_send = max(self._next_send, time.monotonic() + wait)
 
             except TelegramError as exc:
                 logger.error(f"Telegram send failed: {exc}")
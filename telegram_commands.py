@@ -12,15 +12,47 @@ Security: Only messages from the configured TELEGRAM_CHAT_ID are processed.
 """
 
 import asyncio
-import io
 import logging
+import random
+import re
 import time
 
+from telegram import InputFile
+from telegram.constants import ChatAction
 from telegram.error import TelegramError
 
 logger = logging.getLogger("smart-lock.commands")
 
-POLL_INTERVAL: float = 2.0
+# "/cmd[@botname] [args]" in one pass: command name (hyphens allowed, e.g.
+# /arm-blink), any @botname suffix dropped, args with surrounding whitespace
+# trimmed. Non-command text does not match.
+_CMD_RE = re.compile(r"\s*/(?P<cmd>[^\s@]*)(?:@\S*)?(?:\s+(?P<args>.*?))?\s*", re.DOTALL)
+
+# getUpdates blocks server-side until a message arrives or this many seconds
+# pass, so the loop needs no sleep of its own between successful polls
+LONG_POLL_TIMEOUT: int = 30
+
+# Pause (plus up to 50% jitter) after a failed poll so outages don't hot-loop
+ERROR_BACKOFF: float = 1.0
+
+# Commands from one getUpdates batch run concurrently, at most this many at once
+HANDLER_CONCURRENCY: int = 8
+
+# Reply to /help and /start
+_HELP_TEXT = (
+    "🏠 Smart Lock Bot Commands:\n\n"
+    "/status — Check lock state & battery\n"
+    "/unlock — Unlock the door\n"
+    "/lock — Lock the door\n"
+    "/snap — Live Ring camera snapshot\n"
+    "/events — Last 5 events summary\n"
+    "/mute <min> — Mute alerts (default 30 min)\n"
+    "/mute off — Unmute alerts\n"
+    "/arm-blink — Arm Blink camera\n"
+    "/arm-blink off — Disarm Blink camera\n"
+    "/arm-blink status — Check Blink arm state\n"
+    "/help — Show this message"
+)
 
 
 class TelegramCommandHandler:
@@ -35,6 +67,8 @@ class TelegramCommandHandler:
         chat_id: Authorized Telegram chat ID (string or int).
     """
 
+    _LOCK_EMOJI = {"locked": "🔒", "unlocked": "🔓"}
+
     def __init__(self, alerter, switchbot, store, ring, chat_id: str | int, blink=None) -> None:
         self._bot = alerter._bot
         self._alerter = alerter
@@ -44,18 +78,40 @@ class TelegramCommandHandler:
         self._blink = blink
         self._chat_id = str(chat_id)
         self._offset: int = 0
+        self._handler_sem = asyncio.Semaphore(HANDLER_CONCURRENCY)
+        # /lock and /unlock from the same batch still reach the lock in the
+        # order they were sent (Lock waiters are woken FIFO)
+        self._door_lock = asyncio.Lock()
+        # Dispatch table built once; commands are matched lowercase with any
+        # @botname suffix stripped
+        self._handlers = {
+            "/status": self._cmd_status,
+            "/unlock": self._cmd_unlock,
+            "/lock": self._cmd_lock,
+            "/snap": self._cmd_snap,
+            "/events": self._cmd_events,
+            "/mute": self._cmd_mute,
+            "/arm-blink": self._cmd_arm_blink,
+            "/help": self._cmd_help,
+            "/start": self._cmd_help,
+        }
 
     async def run(self) -> None:
         """Main polling loop — call via asyncio.create_task(handler.run())."""
-        logger.info("Telegram command handler started (polling every %.1fs)", POLL_INTERVAL)
+        logger.info("Telegram command handler started (long poll %ds)", LONG_POLL_TIMEOUT)
         while True:
             try:
                 updates = await self._bot.get_updates(
-                    offset=self._offset, timeout=10
+                    offset=self._offset, timeout=LONG_POLL_TIMEOUT
                 )
-                for update in updates:
-                    self._offset = update.update_id + 1
-                    await self._handle_update(update)
+                # A slow /snap no longer holds up a /status queued behind it.
+                # _handle_update never raises, so one failure cannot cancel
+                # the rest of the group
+                async with asyncio.TaskGroup() as tg:
+                    for update in updates:
+                        self._offset = update.update_id + 1
+                        tg.create_task(self._handle_update(update))
+                continue
             except asyncio.CancelledError:
                 logger.info("Telegram command handler stopping")
                 raise
@@ -63,7 +119,7 @@ class TelegramCommandHandler:
                 logger.error("getUpdates failed: %s", exc)
             except Exception:
                 logger.exception("Unexpected error in command handler")
-            await asyncio.sleep(POLL_INTERVAL)
+            await asyncio.sleep(ERROR_BACKOFF * (1 + random.random() / 2))
 
     async def _handle_update(self, update) -> None:
         """Route an incoming update to the appropriate command handler."""
@@ -78,33 +134,20 @@ class TelegramCommandHandler:
             )
             return
 
-        text = (message.text or "").strip()
-        if not text.startswith("/"):
+        match = _CMD_RE.fullmatch(message.text or "")
+        if match is None:
             return
+        command = "/" + match["cmd"].lower()
+        args = match["args"] or ""
 
-        parts = text.split(maxsplit=1)
-        command = parts[0].lower().split("@")[0]  # strip @botname suffix
-        args = parts[1] if len(parts) > 1 else ""
-
-        handlers = {
-            "/status": self._cmd_status,
-            "/unlock": self._cmd_unlock,
-            "/lock": self._cmd_lock,
-            "/snap": self._cmd_snap,
-            "/events": self._cmd_events,
-            "/mute": self._cmd_mute,
-            "/arm-blink": self._cmd_arm_blink,
-            "/help": self._cmd_help,
-            "/start": self._cmd_help,
-        }
-
-        handler = handlers.get(command)
+        handler = self._handlers.get(command)
         if handler is None:
             await self._reply(message.chat_id, f"Unknown command: {command}\nSend /help for available commands.")
             return
 
         try:
-            await handler(message.chat_id, args)
+            async with self._handler_sem:
+                await handler(message.chat_id, args)
         except Exception:
             logger.exception("Error handling command %s", command)
             await self._reply(message.chat_id, f"Error processing {command}. Check server logs.")
@@ -115,15 +158,14 @@ class TelegramCommandHandler:
 
     async def _cmd_status(self, chat_id: int, args: str) -> None:
         """Report current lock status."""
-        await self._reply(chat_id, "Checking lock status...")
-        status = await asyncio.to_thread(self._switchbot.get_lock_status)
+        status = await self._switchbot.get_lock_status()
         if status is None:
             await self._reply(chat_id, "Could not retrieve lock status.")
             return
 
         lock_state = status.get("lockState", "unknown")
         battery = status.get("battery", "?")
-        emoji = {"locked": "🔒", "unlocked": "🔓"}.get(lock_state, "❓")
+        emoji = self._LOCK_EMOJI.get(lock_state, "❓")
         await self._reply(
             chat_id,
             f"{emoji} Lock state: {lock_state}\n🔋 Battery: {battery}%",
@@ -131,8 +173,12 @@ class TelegramCommandHandler:
 
     async def _cmd_unlock(self, chat_id: int, args: str) -> None:
         """Unlock the door."""
-        await self._reply(chat_id, "🔓 Sending unlock command...")
-        success = await asyncio.to_thread(self._switchbot.unlock)
+        ack = self._ack(chat_id, ChatAction.TYPING)
+        try:
+            async with self._door_lock:
+                success = await self._switchbot.unlock()
+        finally:
+            await ack
         if success:
             await self._reply(chat_id, "Door unlocked successfully.")
         else:
@@ -140,8 +186,12 @@ class TelegramCommandHandler:
 
     async def _cmd_lock(self, chat_id: int, args: str) -> None:
         """Lock the door."""
-        await self._reply(chat_id, "🔒 Sending lock command...")
-        success = await asyncio.to_thread(self._switchbot.lock)
+        ack = self._ack(chat_id, ChatAction.TYPING)
+        try:
+            async with self._door_lock:
+                success = await self._switchbot.lock()
+        finally:
+            await ack
         if success:
             await self._reply(chat_id, "Door locked successfully.")
         else:
@@ -149,19 +199,26 @@ class TelegramCommandHandler:
 
     async def _cmd_snap(self, chat_id: int, args: str) -> None:
         """Send a frame from the most recent Ring recording."""
-        await self._reply(chat_id, "📸 Fetching latest recording frame...")
+        ack = self._ack(chat_id, ChatAction.UPLOAD_PHOTO)
         try:
-            history = await self._ring.doorbell.async_history(limit=1)
+            try:
+                history = await self._ring.doorbell.async_history(limit=1)
+                recording_id = history[0]["id"] if history else None
+                frame_bytes = (
+                    await self._ring.capture_frame(recording_id) if history else None
+                )
+            finally:
+                await ack
             if not history:
                 await self._reply(chat_id, "No recent recordings found.")
                 return
 
-            recording_id = history[0]["id"]
-            frame_bytes = await self._ring.capture_frame(recording_id)
             if frame_bytes:
                 await self._bot.send_photo(
                     chat_id=chat_id,
-                    photo=io.BytesIO(frame_bytes),
+                    # Already in memory: no file handle or BytesIO copy is
+                    # held for the upload; the filename sets the MIME type
+                    photo=InputFile(frame_bytes, filename=f"{recording_id}.jpg"),
                     caption=f"Latest recording frame (ID: {recording_id})",
                 )
                 return
@@ -243,26 +300,28 @@ class TelegramCommandHandler:
 
     async def _cmd_help(self, chat_id: int, args: str) -> None:
         """List available commands."""
-        text = (
-            "🏠 Smart Lock Bot Commands:\n\n"
-            "/status — Check lock state & battery\n"
-            "/unlock — Unlock the door\n"
-            "/lock — Lock the door\n"
-            "/snap — Live Ring camera snapshot\n"
-            "/events — Last 5 events summary\n"
-            "/mute <min> — Mute alerts (default 30 min)\n"
-            "/mute off — Unmute alerts\n"
-            "/arm-blink — Arm Blink camera\n"
-            "/arm-blink off — Disarm Blink camera\n"
-            "/arm-blink status — Check Blink arm state\n"
-            "/help — Show this message"
-        )
-        await self._reply(chat_id, text)
+        await self._reply(chat_id, _HELP_TEXT)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _ack(self, chat_id: int, action: str) -> asyncio.Task:
+        """Start showing a chat action ("typing…") without waiting for it.
+
+        Cheaper than an acknowledgement message and cleared by Telegram as
+        soon as the result arrives. The caller overlaps it with the real work
+        and awaits the task before its result reply.
+        """
+        return asyncio.create_task(self._chat_action(chat_id, action))
+
+    async def _chat_action(self, chat_id: int, action: str) -> None:
+        """Send a chat action, swallowing TelegramError."""
+        try:
+            await self._bot.send_chat_action(chat_id=chat_id, action=action)
+        except TelegramError as exc:
+            logger.error("Failed to send chat action: %s", exc)
+
     async def _reply(self, chat_id: int, text: str) -> None:
         """Send a text reply, swallowing TelegramError."""
         try:
@@ -19,8 +19,9 @@ import asyncio
 import base64
 import datetime
 import os
+import shutil
 import tempfile
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import FastAPI
@@ -51,9 +52,8 @@ def insert_test_event(
     detections: list[dict] | None = None,
     camera_id: str = "front_door",
 ) -> int:
-    """Run store.write_event() in the current event loop (sync wrapper)."""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(
+    """Run store.write_event() to completion on a fresh event loop (sync wrapper)."""
+    return asyncio.run(
         store.write_event(
             camera_id=camera_id,
             recorded_at=recorded_at,
@@ -67,12 +67,20 @@ def insert_test_event(
 # Fixture: dashboard_client (authenticated — dependency overridden)
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def dashboard_client():
+async def _clear_events(store: EventStore) -> None:
+    """Delete every event and detection row so a shared store starts empty."""
+    await store.db.execute("DELETE FROM detections")
+    await store.db.execute("DELETE FROM events")
+    await store.db.commit()
+
+
+@pytest.fixture(scope="module")
+def _dashboard_env():
     """
-    Yields an authenticated TestClient for the dashboard test app.
+    Module-wide authenticated TestClient for the dashboard test app.
 
-    - Real EventStore in a temp directory (tests actual SQL queries)
+    - Real EventStore in a temp directory (tests actual SQL queries); schema
+      setup and the client are built once per module, not per test
     - verify_credentials dependency is overridden to bypass HTTP Basic Auth check
     - SwitchBot mocked to return a stable lock status
     """
@@ -83,13 +91,13 @@ def dashboard_client():
         db_path = os.path.join(td, "test.db")
         thumbnails_dir = os.path.join(td, "thumbnails")
 
-        loop = asyncio.get_event_loop()
-
         store = EventStore(db_path=db_path, thumbnails_dir=thumbnails_dir)
-        loop.run_until_complete(store.initialize())
+        asyncio.run(store.initialize())
 
         switchbot_mock = MagicMock()
-        switchbot_mock.get_lock_status.return_value = {"lockState": "locked", "battery": 90}
+        switchbot_mock.get_lock_status = AsyncMock(
+            return_value={"lockState": "locked", "battery": 90}
+        )
 
         test_app.state.store = store
         test_app.state.switchbot = switchbot_mock
@@ -104,21 +112,35 @@ def dashboard_client():
             yield client
 
         # Clean up
-        loop.run_until_complete(store.close())
+        asyncio.run(store.close())
         test_app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def dashboard_client(_dashboard_env):
+    """
+    Yields the shared authenticated TestClient with an empty store.
+
+    Rows and thumbnail files left by the previous test are removed first, so
+    each test still sees a clean database.
+    """
+    asyncio.run(_clear_events(_dashboard_env.store))
+    shutil.rmtree(os.path.join(_dashboard_env.td, "thumbnails"), ignore_errors=True)
+    yield _dashboard_env
+
+
 # ---------------------------------------------------------------------------
 # Fixture: no_auth_client (no dependency override — real 401 testing)
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def no_auth_client():
     """
-    Yields a TestClient without overriding verify_credentials.
+    Yields a module-wide TestClient without overriding verify_credentials.
 
     Uses default Config.DASHBOARD_USERNAME/DASHBOARD_PASSWORD for auth.
-    Requests without valid credentials should return 401.
+    Requests without valid credentials should return 401. Tests using it
+    only read, so no per-test cleanup is needed.
     """
     test_app = FastAPI()
     test_app.include_router(router)
@@ -127,12 +149,13 @@ def no_auth_client():
         db_path = os.path.join(td, "test.db")
         thumbnails_dir = os.path.join(td, "thumbnails")
 
-        loop = asyncio.get_event_loop()
         store = EventStore(db_path=db_path, thumbnails_dir=thumbnails_dir)
-        loop.run_until_complete(store.initialize())
+        asyncio.run(store.initialize())
 
         switchbot_mock = MagicMock()
-        switchbot_mock.get_lock_status.return_value = {"lockState": "locked", "battery": 90}
+        switchbot_mock.get_lock_status = AsyncMock(
+            return_value={"lockState": "locked", "battery": 90}
+        )
 
         test_app.state.store = store
         test_app.state.switchbot = switchbot_mock
@@ -141,7 +164,7 @@ def no_auth_client():
         with TestClient(test_app, raise_server_exceptions=False) as client:
             yield client
 
-        loop.run_until_complete(store.close())
+        asyncio.run(store.close())
 
 
 # ===========================================================================
@@ -342,6 +365,34 @@ def test_thumbnail_served(dashboard_client):
         config.Config.THUMBNAILS_DIR = original_thumbnails_dir
 
 
+def test_thumbnail_conditional_get_returns_304(dashboard_client):
+    """DASH-05: Thumbnails carry ETag/Cache-Control and honor If-None-Match with a 304."""
+    thumbnails_dir = os.path.join(dashboard_client.td, "thumbnails")
+    os.makedirs(thumbnails_dir, exist_ok=True)
+    with open(os.path.join(thumbnails_dir, "cached-event.jpg"), "wb") as f:
+        f.write(b"\xff\xd8\xff\xe0" + b"\x00" * 16 + b"\xff\xd9")
+
+    import config
+    original_thumbnails_dir = config.Config.THUMBNAILS_DIR
+    config.Config.THUMBNAILS_DIR = thumbnails_dir
+
+    try:
+        first = dashboard_client.get("/dashboard/thumbnails/cached-event.jpg")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, max-age=300"
+        etag = first.headers["etag"]
+        assert first.headers.get("last-modified")
+
+        second = dashboard_client.get(
+            "/dashboard/thumbnails/cached-event.jpg",
+            headers={"If-None-Match": etag},
+        )
+        assert second.status_code == 304
+        assert second.content == b""
+    finally:
+        config.Config.THUMBNAILS_DIR = original_thumbnails_dir
+
+
 def test_thumbnail_not_found(dashboard_client):
     """DASH-05: GET /dashboard/thumbnails/nonexistent.jpg returns 404."""
     import config
@@ -389,15 +440,9 @@ def test_pagination_page_1(dashboard_client):
     today = datetime.datetime.utcnow().isoformat(timespec="seconds")
 
     # Insert 25 events with slightly different timestamps to avoid collisions
-    loop = asyncio.get_event_loop()
     for i in range(25):
         ts = (datetime.datetime.utcnow() - datetime.timedelta(seconds=i)).isoformat(timespec="seconds")
-        loop.run_until_complete(
-            dashboard_client.store.write_event(
-                camera_id="front_door",
-                recorded_at=ts,
-            )
-        )
+        insert_test_event(dashboard_client.store, recorded_at=ts)
 
     response = dashboard_client.get("/dashboard/events?limit=20")
     assert response.status_code == 200
@@ -411,15 +456,9 @@ def test_pagination_page_1(dashboard_client):
 
 def test_pagination_page_2(dashboard_client):
     """DASH-06: 25 events at limit=20 — page 2 shows 'Previous' link and remaining 5 events, no Next."""
-    loop = asyncio.get_event_loop()
     for i in range(25):
         ts = (datetime.datetime.utcnow() - datetime.timedelta(seconds=i)).isoformat(timespec="seconds")
-        loop.run_until_complete(
-            dashboard_client.store.write_event(
-                camera_id="front_door",
-                recorded_at=ts,
-            )
-        )
+        insert_test_event(dashboard_client.store, recorded_at=ts)
 
     response = dashboard_client.get("/dashboard/events?page=2&limit=20")
     assert response.status_code == 200
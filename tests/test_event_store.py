@@ -18,7 +18,10 @@ import io
 import os
 import sqlite3
 import tempfile
+from pathlib import Path
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
 import pytest_asyncio
 from PIL import Image
@@ -51,6 +54,56 @@ async def test_wal_mode_active(store):
     assert row[0] == "wal", f"Expected 'wal' but got '{row[0]}'"
 
 
+@pytest.mark.asyncio
+async def test_tuning_pragmas_applied(store):
+    """Constructor tuning PRAGMAs (cache, temp store, mmap, autocheckpoint) are live."""
+    expected = {
+        "cache_size": -64000,
+        "temp_store": 2,  # MEMORY
+        "mmap_size": 268435456,
+        "wal_autocheckpoint": 1000,
+    }
+    for pragma, value in expected.items():
+        async with store.db.execute(f"PRAGMA {pragma}") as cursor:
+            row = await cursor.fetchone()
+        assert row[0] == value, f"PRAGMA {pragma}: expected {value}, got {row[0]}"
+
+
+@pytest.mark.asyncio
+async def test_timed_checkpoint_truncates_wal():
+    """checkpoint_interval disables autocheckpoint; the background timer truncates the WAL."""
+    with tempfile.TemporaryDirectory() as td:
+        db_path = os.path.join(td, "test.db")
+        s = EventStore(
+            db_path=db_path,
+            thumbnails_dir=os.path.join(td, "thumbnails"),
+            checkpoint_interval=0.05,
+        )
+        await s.initialize()
+        try:
+            async with s.db.execute("PRAGMA wal_autocheckpoint") as cursor:
+                assert (await cursor.fetchone())[0] == 0
+
+            await s.write_event(camera_id="front_door", recorded_at="2026-02-25T10:00:00")
+            assert os.path.getsize(db_path + "-wal") > 0
+
+            for _ in range(50):
+                await asyncio.sleep(0.05)
+                if os.path.getsize(db_path + "-wal") == 0:
+                    break
+            assert os.path.getsize(db_path + "-wal") == 0
+            assert (await s.get_event(1)) is not None
+        finally:
+            await s.close()
+        assert s._checkpoint_task is None
+
+
+def test_invalid_temp_store_rejected():
+    """An unknown temp_store mode is rejected before any PRAGMA is built."""
+    with pytest.raises(ValueError):
+        EventStore(db_path="unused.db", temp_store="ramdisk")
+
+
 # ---------------------------------------------------------------------------
 # DATA-01: Basic event write and read
 # ---------------------------------------------------------------------------
@@ -112,6 +165,26 @@ async def test_write_and_read_detections(store):
     assert dog["bbox_y2"] is None
 
 
+@pytest.mark.asyncio
+async def test_write_detection_objects(store):
+    """DATA-02: Detection-like objects are stored without converting to dicts first."""
+    detection = SimpleNamespace(
+        label="package", confidence=0.81, bbox_x1=1.5, bbox_y1=2.5, bbox_x2=30.0, bbox_y2=40.0
+    )
+    event_id = await store.write_event(
+        camera_id="front_door",
+        recorded_at="2026-02-25T10:32:00",
+        detections=[detection],
+    )
+
+    (stored,) = (await store.get_event(event_id))["detections"]
+    assert stored["label"] == "package"
+    assert stored["confidence"] == pytest.approx(0.81)
+    assert (stored["bbox_x1"], stored["bbox_y1"], stored["bbox_x2"], stored["bbox_y2"]) == (
+        1.5, 2.5, 30.0, 40.0,
+    )
+
+
 # ---------------------------------------------------------------------------
 # DATA-03: Thumbnail save and path storage
 # ---------------------------------------------------------------------------
@@ -145,6 +218,50 @@ async def test_thumbnail_save_and_path_storage(store):
     assert event["thumbnail_path"] == path
 
 
+
+@pytest.mark.asyncio
+async def test_thumbnail_jpeg_passthrough_and_transcode(store):
+    """DATA-03: Small JPEGs are stored byte-for-byte; other formats are stored as bounded WebP."""
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color="blue").save(buf, "JPEG")
+    jpeg_bytes = buf.getvalue()
+
+    path = store.save_thumbnail(jpeg_bytes, "2026-02-25T10:31:00.123")
+    assert path.endswith("2026-02-25T10-31-00-123.jpg")
+    with open(path, "rb") as f:
+        assert f.read() == jpeg_bytes
+
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color="green").save(buf, "PNG")
+    path = store.save_thumbnail(buf.getvalue(), "2026-02-25T10:32:00")
+    assert path.endswith(".webp")
+    with Image.open(path) as saved:
+        assert saved.format == "WEBP"
+        assert saved.size == (64, 48)
+
+    # Full frames are downscaled to the longest-side bound, never stored as-is
+    buf = io.BytesIO()
+    Image.new("RGB", (1920, 1080), color="red").save(buf, "JPEG")
+    path = store.save_thumbnail(buf.getvalue(), "2026-02-25T10:33:00")
+    assert path.endswith(".webp")
+    with Image.open(path) as saved:
+        assert saved.format == "WEBP"
+        assert max(saved.size) == 800
+
+@pytest.mark.asyncio
+async def test_thumbnail_from_decoded_array(store):
+    """DATA-03: A pre-decoded frame_array is encoded directly instead of re-decoding the bytes."""
+    buf = io.BytesIO()
+    Image.new("RGB", (1280, 720), color="red").save(buf, "JPEG")
+    frame_array = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    path = store.save_thumbnail(buf.getvalue(), "2026-02-25T10:34:00", frame_array=frame_array)
+    with Image.open(path) as saved:
+        assert saved.format == "WEBP"
+        assert saved.size == (800, 450)
+        # Pixels come from the array (black), not the red JPEG bytes
+        assert saved.convert("RGB").getpixel((400, 225)) == (0, 0, 0)
+
 # ---------------------------------------------------------------------------
 # DATA-04: Unlock action logging
 # ---------------------------------------------------------------------------
@@ -270,6 +387,109 @@ async def test_concurrent_read_write(store):
     assert len(all_events) == 20
 
 
+
+@pytest.mark.asyncio
+async def test_read_pool_is_read_only_and_sees_commits(store):
+    """DATA-05: Reads use pooled query_only connections that see the writer's commits."""
+    event_id = await store.write_event(camera_id="front_door", recorded_at="2026-02-25T10:00:00")
+
+    async with store._acquire_reader() as conn:
+        assert conn is not store.db
+        with pytest.raises(sqlite3.OperationalError):
+            await conn.execute("DELETE FROM events")
+
+    # Many concurrent reads share the small pool without deadlocking
+    results = await asyncio.gather(*(store.get_event(event_id) for _ in range(12)))
+    assert all(r["id"] == event_id for r in results)
+
+
+@pytest.mark.asyncio
+async def test_get_recent_events_camera_filter_uses_composite_index(store):
+    """camera_id filter returns only that camera's events via idx_events_cam_time."""
+    await store.write_event(camera_id="front_door", recorded_at="2026-02-25T10:00:00")
+    await store.write_event(camera_id="blink", recorded_at="2026-02-25T10:01:00")
+    await store.write_event(camera_id="front_door", recorded_at="2026-02-25T10:02:00")
+
+    events = await store.get_recent_events(camera_id="front_door")
+    assert [e["recorded_at"] for e in events] == ["2026-02-25T10:02:00", "2026-02-25T10:00:00"]
+
+    async with store.db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM events WHERE camera_id = ? ORDER BY recorded_at DESC",
+        ("front_door",),
+    ) as cursor:
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "idx_events_cam_time" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_burst_writes_group_commit(store):
+    """DATA-05: A burst of concurrent write_event calls commits in shared batches with distinct ids."""
+    commits = 0
+    real_commit = store.db.commit
+
+    async def counting_commit():
+        nonlocal commits
+        commits += 1
+        await real_commit()
+
+    store.db.commit = counting_commit
+
+    ids = await asyncio.gather(*(
+        store.write_event(
+            camera_id="front_door",
+            recorded_at=f"2026-02-25T12:{i:02d}:00",
+            detections=[{"label": "person", "confidence": 0.9}],
+        )
+        for i in range(40)
+    ))
+
+    assert len(set(ids)) == 40
+    assert commits < 40
+    for i, event_id in enumerate(ids):
+        event = await store.get_event(event_id)
+        assert event["recorded_at"] == f"2026-02-25T12:{i:02d}:00"
+        assert [d["label"] for d in event["detections"]] == ["person"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_raises_to_writer(store):
+    """A lone event that violates a constraint rolls back and raises to its writer."""
+    with pytest.raises(sqlite3.IntegrityError):
+        await store.write_event(
+            camera_id="front_door",
+            recorded_at="2026-02-25T13:00:00",
+            detections=[{"label": None, "confidence": 0.5}],
+        )
+
+    # Store keeps working after the rollback
+    event_id = await store.write_event(camera_id="front_door", recorded_at="2026-02-25T13:01:00")
+    assert (await store.get_event(event_id)) is not None
+    assert len(await store.get_recent_events(limit=10)) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_isolates_bad_writer(store):
+    """One bad event in a group commit fails alone; its batch-mates are still written."""
+    results = await asyncio.gather(
+        store.write_event(camera_id="ring", recorded_at="2026-02-25T13:00:00"),
+        store.write_event(
+            camera_id="blink",
+            recorded_at="2026-02-25T13:00:01",
+            detections=[{"label": None, "confidence": 0.5}],
+        ),
+        store.write_event(camera_id="ring", recorded_at="2026-02-25T13:00:02"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    for event_id, recorded_at in ((results[0], "2026-02-25T13:00:00"), (results[2], "2026-02-25T13:00:02")):
+        assert (await store.get_event(event_id))["recorded_at"] == recorded_at
+    assert len(await store.get_recent_events(limit=10)) == 2
+    # The rolled-back event left no orphan rows behind
+    async with store.db.execute("SELECT COUNT(*) FROM detections") as cursor:
+        assert (await cursor.fetchone())[0] == 0
+
 # ---------------------------------------------------------------------------
 # DATA-03: Thumbnail failure returns None (graceful failure)
 # ---------------------------------------------------------------------------
@@ -367,3 +587,55 @@ async def test_persons_table_unique_constraint(store):
             ("carol", "Carol Duplicate"),
         )
         await store.db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Persons: single-person lookup
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_person_counts_only_own_faces(store):
+    """get_person returns one row with the face count for that name's photos only."""
+    faces_dir = Path(store.thumbnails_dir).parent / "known_faces"
+    faces_dir.mkdir()
+    for fname in ("dave_1.jpg", "dave_2.jpg", "erin_1.jpg"):
+        (faces_dir / fname).write_bytes(b"")
+
+    await store.add_person("dave", "Dave")
+    await store.add_person("erin", "Erin")
+
+    person = await store.get_person("dave", faces_dir)
+    assert person["name"] == "dave"
+    assert person["display_name"] == "Dave"
+    assert person["face_count"] == 2
+
+    assert await store.get_person("nobody", faces_dir) is None
+
+
+# ---------------------------------------------------------------------------
+# Today count: write-through cache
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_today_event_count_tracks_writes(store):
+    """get_today_event_count stays correct as events are written after it is cached."""
+    import datetime
+
+    assert await store.get_today_event_count() == 0
+
+    now = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=6)
+    await store.write_event(camera_id="front_door", recorded_at=now.replace(tzinfo=None).isoformat())
+    await store.write_event(camera_id="front_door", recorded_at="2020-01-01T12:00:00")
+
+    assert await store.get_today_event_count() == 1
+
+    # Cache must agree with a fresh COUNT(*) from SQLite
+    store._today_count = None
+    assert await store.get_today_event_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_today_event_count_rolls_over(store):
+    """A cached count from a previous day is discarded and re-queried."""
+    store._today_count = ("2000-01-01", 42)
+    assert await store.get_today_event_count() == 0
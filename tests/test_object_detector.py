@@ -17,7 +17,9 @@ module tests complete.
 import asyncio
 import io
 import time
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 import pytest_asyncio
 from PIL import Image
@@ -27,7 +29,13 @@ from object_detector import (
     RELEVANT_CLASSES,
     Detection,
     ObjectDetector,
+    _letterbox,
+    _onnx_output_to_detections,
+    _result_to_detections,
+    crop_person_array,
     crop_person_bbox,
+    crop_person_bbox_from_array,
+    decode_frame,
     detections_to_dicts,
 )
 
@@ -156,6 +164,108 @@ async def test_detect_handles_invalid_bytes(detector):
     assert isinstance(result, list), "Must return a list, not raise an exception"
 
 
+@pytest.mark.asyncio
+async def test_concurrent_detects_share_one_predict_call(detector, sample_frame_bytes):
+    """YOLO-01: Frames queued together go through one batched predict(); bad bytes get []."""
+    batch_sizes: list[int] = []
+
+    def fake_predict(images, verbose=False):
+        batch_sizes.append(len(images))
+        return [MagicMock(boxes=None) for _ in images]
+
+    with patch.object(detector.model, "predict", side_effect=fake_predict):
+        results = await asyncio.gather(
+            detector.detect(sample_frame_bytes),
+            detector.detect(b"not-an-image"),
+            detector.detect(sample_frame_bytes),
+        )
+
+    assert results == [[], [], []]
+    assert batch_sizes == [2], f"Expected one batch of the 2 decodable frames, got {batch_sizes}"
+
+
+@pytest.mark.asyncio
+async def test_short_batch_result_reruns_frames_singly(detector, sample_frame_bytes):
+    """YOLO-01: A backend that answers a batch with one result must not drop frames 2..N."""
+    batch_sizes: list[int] = []
+
+    def fake_predict(images, verbose=False):
+        # Like Ultralytics' NCNN backend: only the first image is inferred
+        batch_sizes.append(len(images) if isinstance(images, list) else 1)
+        return [MagicMock(boxes=_FakeBoxes([0], [0.9], [[1, 2, 3, 4]]))]
+
+    with patch.object(detector.model, "predict", side_effect=fake_predict):
+        results = await asyncio.gather(
+            *(detector.detect(sample_frame_bytes) for _ in range(3))
+        )
+
+    assert [[d.label for d in r] for r in results] == [["person"]] * 3
+    assert batch_sizes == [3, 1, 1, 1], f"Expected a batch then per-frame reruns, got {batch_sizes}"
+
+
+@pytest.mark.asyncio
+async def test_exported_model_predicts_one_frame_per_call(detector, sample_frame_bytes):
+    """YOLO-01: Non-.pt models (NCNN) are never handed a multi-frame batch."""
+    batch_sizes: list[int] = []
+
+    def fake_predict(images, verbose=False):
+        batch_sizes.append(len(images) if isinstance(images, list) else 1)
+        return [MagicMock(boxes=None)]
+
+    with patch.object(detector.model, "predict", side_effect=fake_predict), \
+            patch.object(detector, "_batched", False):
+        results = await asyncio.gather(
+            *(detector.detect(sample_frame_bytes) for _ in range(3))
+        )
+
+    assert results == [[], [], []]
+    assert batch_sizes == [1, 1, 1]
+
+
+class _FakeBoxes:
+    """Minimal stand-in for ultralytics Boxes (already on CPU / numpy)."""
+
+    def __init__(self, cls, conf, xyxy):
+        self.cls = np.array(cls, dtype=np.float32)
+        self.conf = np.array(conf, dtype=np.float32)
+        self.xyxy = np.array(xyxy, dtype=np.float32).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.cls)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+
+def test_result_filter_keeps_relevant_confident_boxes():
+    """YOLO-02: Only RELEVANT_CLASSES boxes at or above CONFIDENCE_THRESHOLD survive, in order."""
+    result = MagicMock(
+        boxes=_FakeBoxes(
+            cls=[0, 1, 16, 2, 28],
+            conf=[0.91234, 0.99, 0.39, 0.40, 0.55],
+            xyxy=[
+                [10.123, 20.456, 110.789, 220.001],
+                [0, 0, 1, 1],
+                [0, 0, 1, 1],
+                [5, 6, 7, 8],
+                [1.005, 2.0, 3.0, 4.0],
+            ],
+        )
+    )
+
+    detections = _result_to_detections(result)
+
+    assert [d.label for d in detections] == ["person", "car", "package"]
+    assert detections[0].confidence == pytest.approx(0.9123)
+    assert detections[0].bbox_x1 == pytest.approx(10.12)
+    assert detections[0].bbox_y2 == pytest.approx(220.0)
+    assert _result_to_detections(MagicMock(boxes=None)) == []
+    assert _result_to_detections(MagicMock(boxes=_FakeBoxes([], [], []))) == []
+
+
 # ---------------------------------------------------------------------------
 # YOLO-03: Non-blocking async verification (heartbeat test)
 # ---------------------------------------------------------------------------
@@ -319,6 +429,91 @@ def test_crop_person_bbox_invalid_bytes_returns_none():
     )
 
 
+def test_crop_person_array_is_clamped_view():
+    """YOLO-04: crop_person_array() slices the decoded frame in place, clamped to its bounds."""
+    img = Image.new("RGB", (640, 480), color=(150, 150, 200))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG")
+    frame_array = decode_frame(buf.getvalue())
+    assert frame_array.shape == (480, 640, 3)
+
+    detection = Detection(
+        label="person", confidence=0.90,
+        bbox_x1=500.0, bbox_y1=350.0, bbox_x2=800.0, bbox_y2=600.0,
+    )
+    crop = crop_person_array(frame_array, detection)
+    assert crop is not None
+    assert crop.shape == (130, 140, 3)
+    assert crop.base is frame_array  # view, not a copy
+
+    degenerate = Detection(
+        label="person", confidence=0.88,
+        bbox_x1=200.0, bbox_y1=100.0, bbox_x2=200.0, bbox_y2=300.0,
+    )
+    assert crop_person_array(frame_array, degenerate) is None
+
+
+def test_crop_person_bbox_from_array_matches_bbox():
+    """YOLO-04: The array variant returns JPEG bytes of the clamped bbox region without a decode."""
+    frame_array = np.full((480, 640, 3), 200, dtype=np.uint8)
+    detection = Detection(
+        label="person", confidence=0.95,
+        bbox_x1=100.0, bbox_y1=50.0, bbox_x2=300.0, bbox_y2=400.0,
+    )
+
+    result = crop_person_bbox_from_array(frame_array, detection)
+
+    assert isinstance(result, bytes)
+    cropped_img = Image.open(io.BytesIO(result))
+    assert cropped_img.format == "JPEG"
+    assert cropped_img.size == (200, 350)
+
+    degenerate = Detection(
+        label="person", confidence=0.88,
+        bbox_x1=200.0, bbox_y1=100.0, bbox_x2=200.0, bbox_y2=300.0,
+    )
+    assert crop_person_bbox_from_array(frame_array, degenerate) is None
+
+
+@pytest.mark.asyncio
+async def test_detect_with_image_returns_decoded_frame(detector, sample_frame_bytes):
+    """YOLO-01: detect_with_image() hands back the RGB array it ran inference on."""
+    frame_array, detections = await detector.detect_with_image(sample_frame_bytes)
+
+    assert frame_array.ndim == 3 and frame_array.shape[2] == 3
+    assert isinstance(detections, list)
+
+    with pytest.raises(ValueError):
+        await detector.detect_with_image(b"not-an-image")
+
+
+def test_onnx_postprocess_maps_boxes_back_and_applies_nms():
+    """YOLO-01: raw ONNX output is filtered, NMS'd and un-letterboxed to frame pixels."""
+    frame = np.zeros((320, 640, 3), dtype=np.uint8)
+    blob, scale, pad_x, pad_y = _letterbox(frame, 640)
+    assert blob.shape == (1, 3, 640, 640) and blob.dtype == np.float32
+    assert (scale, pad_x, pad_y) == (1.0, 0, 160)
+
+    # Anchors: two overlapping persons, a low-confidence dog, an irrelevant class
+    output = np.zeros((84, 4), dtype=np.float32)
+    output[:4, 0] = [100, 260, 40, 80]   # person, conf 0.9
+    output[:4, 1] = [102, 262, 40, 80]   # person, conf 0.6 (suppressed by NMS)
+    output[:4, 2] = [300, 300, 20, 20]   # dog, conf 0.2 (below threshold)
+    output[:4, 3] = [400, 300, 20, 20]   # class 1 "bicycle" (not relevant)
+    output[4 + 0, 0] = 0.9
+    output[4 + 0, 1] = 0.6
+    output[4 + 16, 2] = 0.2
+    output[4 + 1, 3] = 0.95
+
+    detections = _onnx_output_to_detections(output, scale, pad_x, pad_y)
+
+    assert len(detections) == 1
+    d = detections[0]
+    assert d.label == "person"
+    assert d.confidence == pytest.approx(0.9)
+    assert (d.bbox_x1, d.bbox_y1, d.bbox_x2, d.bbox_y2) == (80.0, 60.0, 120.0, 140.0)
+
+
 # ---------------------------------------------------------------------------
 # YOLO-05: detections_to_dicts() EventStore format compatibility
 # ---------------------------------------------------------------------------
@@ -10,7 +10,7 @@ Validates all PIPE requirements (PIPE-01 through PIPE-04):
 Mocking strategy:
   - RingClient: AsyncMock (wait_for_event, capture_frame, authenticate, stop)
   - SwitchBotClient: MagicMock (unlock — sync method dispatched via executor)
-  - FaceRecognizer: MagicMock (identify — sync method dispatched via executor)
+  - FaceRecognizer: MagicMock (identify_array — sync method dispatched via executor)
   - ObjectDetector: Real instance (module-scoped, same pattern as test_object_detector.py)
   - EventStore: Real instance in temp directory (same pattern as test_event_store.py)
 """
@@ -89,17 +89,17 @@ def mock_ring():
 
 @pytest.fixture
 def mock_switchbot():
-    """Mock SwitchBotClient with sync unlock method."""
+    """Mock SwitchBotClient with async unlock method."""
     switchbot = MagicMock()
-    switchbot.unlock = MagicMock(return_value=True)
+    switchbot.unlock = AsyncMock(return_value=True)
     return switchbot
 
 
 @pytest.fixture
 def mock_recognizer():
-    """Mock FaceRecognizer with sync identify method returning None (no face match)."""
+    """Mock FaceRecognizer with sync identify_array method returning None (no face match)."""
     recognizer = MagicMock()
-    recognizer.identify = MagicMock(return_value=None)
+    recognizer.identify_array = MagicMock(return_value=None)
     recognizer.known_encodings = ["fake"]  # Non-empty so lifespan doesn't warn
     return recognizer
 
@@ -146,7 +146,7 @@ async def test_full_pipeline_motion_event(mock_ring, mock_switchbot, mock_recogn
     # First call returns a motion event; second call raises CancelledError to exit the loop
     mock_ring.wait_for_event.side_effect = [(12345, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = None  # Stranger — no face match
+    mock_recognizer.identify_array.return_value = None  # Stranger — no face match
 
     try:
         await polling_loop(mock_ring, mock_recognizer, mock_switchbot, detector, store)
@@ -170,7 +170,7 @@ async def test_pipeline_event_has_detections(mock_ring, mock_switchbot, mock_rec
     """
     mock_ring.wait_for_event.side_effect = [(54321, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = None
+    mock_recognizer.identify_array.return_value = None
 
     try:
         await polling_loop(mock_ring, mock_recognizer, mock_switchbot, detector, store)
@@ -190,12 +190,12 @@ async def test_pipeline_with_face_match(mock_ring, mock_switchbot, mock_recogniz
     SwitchBot.unlock() was called.
 
     Note: We patch detector.detect to return a synthetic person Detection so that
-    the pipeline calls recognizer.identify. With a flat gray test frame YOLO
+    the pipeline calls recognizer.identify_array. With a flat gray test frame YOLO
     produces no detections; patching isolates the pipeline logic from YOLO accuracy.
     """
     mock_ring.wait_for_event.side_effect = [(99999, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = "alice"
+    mock_recognizer.identify_array.return_value = "alice"
 
     # Patch detector.detect to return a person detection so face recognition runs
     fake_person = Detection(
@@ -216,6 +216,35 @@ async def test_pipeline_with_face_match(mock_ring, mock_switchbot, mock_recogniz
     assert mock_switchbot.unlock.called  # SwitchBot.unlock() was invoked
 
 
+@pytest.mark.asyncio
+async def test_pipeline_skips_face_recognition_for_tiny_person(
+    mock_ring, mock_switchbot, mock_recognizer, detector, store
+):
+    """
+    PIPE-02: A person box narrower than Config.MIN_FACE_PIXELS cannot contain a
+    detectable face, so recognition is skipped and the event is stored as a stranger.
+    """
+    mock_ring.wait_for_event.side_effect = [(44444, "motion"), asyncio.CancelledError()]
+    mock_ring.capture_frame.return_value = make_test_frame()
+    mock_recognizer.identify_array.return_value = "alice"
+
+    distant_person = Detection(
+        label="person", confidence=0.91,
+        bbox_x1=300.0, bbox_y1=200.0, bbox_x2=340.0, bbox_y2=300.0,
+    )
+    with patch.object(detector, "detect", new=AsyncMock(return_value=[distant_person])):
+        try:
+            await polling_loop(mock_ring, mock_recognizer, mock_switchbot, detector, store)
+        except asyncio.CancelledError:
+            pass
+
+    assert not mock_recognizer.identify_array.called
+    assert not mock_switchbot.unlock.called
+    event = await store.get_event(1)
+    assert event["person_name"] is None
+    assert event["door_action"] == "none"
+
+
 # ---------------------------------------------------------------------------
 # PIPE-03: Unlock behavior preservation tests
 # ---------------------------------------------------------------------------
@@ -229,7 +258,7 @@ async def test_unlock_behavior_preserved(mock_ring, mock_switchbot, mock_recogni
     """
     mock_ring.wait_for_event.side_effect = [(77777, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = "bob"
+    mock_recognizer.identify_array.return_value = "bob"
 
     fake_person = Detection(
         label="person", confidence=0.92,
@@ -248,6 +277,50 @@ async def test_unlock_behavior_preserved(mock_ring, mock_switchbot, mock_recogni
     assert event["unlock_granted"] == 1
 
 
+@pytest.mark.asyncio
+async def test_unlock_does_not_block_polling(mock_ring, mock_switchbot, mock_recognizer, detector, store):
+    """
+    PIPE-03: The event is stored as door_action='pending' and polling resumes
+    while SwitchBot.unlock() is still running; the row is updated afterwards.
+    """
+    release = asyncio.Event()
+
+    async def slow_unlock():
+        await asyncio.wait_for(release.wait(), 5)
+        return True
+
+    mock_switchbot.unlock = AsyncMock(side_effect=slow_unlock)
+    mock_ring.capture_frame.return_value = make_test_frame()
+    mock_recognizer.identify_array.return_value = "dana"
+    seen_while_unlocking = []
+
+    async def next_event(_interval):
+        if not seen_while_unlocking:
+            seen_while_unlocking.append(None)
+            return (10101, "motion")
+        # Second poll happens while the unlock is still blocked
+        seen_while_unlocking.append((await store.get_event(1))["door_action"])
+        release.set()
+        raise asyncio.CancelledError()
+
+    mock_ring.wait_for_event.side_effect = next_event
+
+    fake_person = Detection(
+        label="person", confidence=0.93,
+        bbox_x1=100.0, bbox_y1=50.0, bbox_x2=300.0, bbox_y2=400.0,
+    )
+    with patch.object(detector, "detect", new=AsyncMock(return_value=[fake_person])):
+        try:
+            await polling_loop(mock_ring, mock_recognizer, mock_switchbot, detector, store)
+        except asyncio.CancelledError:
+            pass
+
+    assert seen_while_unlocking[1] == "pending"
+    event = await store.get_event(1)
+    assert event["door_action"] == "unlocked"
+    assert event["unlock_granted"] == 1
+
+
 @pytest.mark.asyncio
 async def test_cooldown_blocks_repeat_unlock(mock_ring, mock_switchbot, mock_recognizer, detector, store):
     """
@@ -266,7 +339,7 @@ async def test_cooldown_blocks_repeat_unlock(mock_ring, mock_switchbot, mock_rec
         asyncio.CancelledError(),
     ]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = "charlie"
+    mock_recognizer.identify_array.return_value = "charlie"
 
     fake_person = Detection(
         label="person", confidence=0.90,
@@ -316,7 +389,7 @@ async def test_camera_id_populated_on_every_event(mock_ring, mock_switchbot, moc
     """
     mock_ring.wait_for_event.side_effect = [(33333, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = None
+    mock_recognizer.identify_array.return_value = None
 
     try:
         await polling_loop(mock_ring, mock_recognizer, mock_switchbot, detector, store)
@@ -338,7 +411,7 @@ async def test_camera_id_from_config(mock_ring, mock_switchbot, mock_recognizer,
     """
     mock_ring.wait_for_event.side_effect = [(44444, "motion"), asyncio.CancelledError()]
     mock_ring.capture_frame.return_value = make_test_frame()
-    mock_recognizer.identify.return_value = None
+    mock_recognizer.identify_array.return_value = None
 
     original_camera_id = Config.CAMERA_ID
     Config.CAMERA_ID = "back_patio"
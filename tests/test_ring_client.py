@@ -0,0 +1,74 @@
+"""
+Tests for RingClient event detection (push listener + history safety net).
+
+The push queue and the history poll can both see the same event, in either
+order; wait_for_event() must return each event exactly once. Ring is never
+contacted: the doorbell is a MagicMock whose async_history is scripted.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import ring_client
+from ring_client import RingClient
+
+DOORBELL_ID = 111
+
+
+def _push(event_id: int, doorbot_id: int = DOORBELL_ID, kind: str = "motion"):
+    """Minimal stand-in for ring_doorbell's RingEvent."""
+    return SimpleNamespace(id=event_id, doorbot_id=doorbot_id, kind=kind, is_update=False)
+
+
+@pytest.fixture
+def client():
+    """RingClient with push enabled, a baseline of event 100, and a scripted doorbell."""
+    c = RingClient("user@example.com", "password")
+    c.doorbell = MagicMock(id=DOORBELL_ID)
+    c.doorbell.async_history = AsyncMock(return_value=[{"id": 100, "kind": "motion"}])
+    c._use_push = True
+    c._last_event_id = 100
+    with patch.object(ring_client, "PUSH_POLL_INTERVAL", 0.01):
+        yield c
+
+
+def _history(client: RingClient, event_id: int) -> None:
+    client.doorbell.async_history.return_value = [{"id": event_id, "kind": "motion"}]
+
+
+@pytest.mark.asyncio
+async def test_push_arriving_after_history_poll_is_dropped(client):
+    """History reports X first (push wait timed out); the late push for X is not replayed."""
+    _history(client, 101)
+    assert await client.wait_for_event(0) == (101, "motion")
+
+    client._on_push_event(_push(101))
+    assert await client.wait_for_event(0) is None
+    assert client._event_queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_stale_history_after_push_is_not_new(client):
+    """A push moves ahead to X; history still listing the previous event W is not reprocessed."""
+    client._on_push_event(_push(101))
+    assert await client.wait_for_event(0) == (101, "motion")
+
+    # History has not caught up yet (still W), then catches up (X)
+    assert await client.wait_for_event(0) is None
+    _history(client, 101)
+    assert await client.wait_for_event(0) is None
+
+    _history(client, 102)
+    assert await client.wait_for_event(0) == (102, "motion")
+
+
+def test_push_from_other_device_is_ignored(client):
+    """Only the doorbell that capture_frame() downloads from feeds the queue."""
+    client._on_push_event(_push(101, doorbot_id=999))
+    client._on_push_event(SimpleNamespace(id=102, doorbot_id=DOORBELL_ID, kind="motion", is_update=True))
+    assert client._event_queue.empty()
+
+    client._on_push_event(_push(103, kind="ding"))
+    assert client._event_queue.qsize() == 1
@@ -25,9 +25,11 @@ import pytest
 import pytest_asyncio
 from PIL import Image
 
+from telegram import InputFile
 from telegram.error import RetryAfter, TelegramError
 from telegram.ext import AIORateLimiter, ExtBot
 
+import telegram_alerter
 from telegram_alerter import TelegramAlerter, COALESCE_SECONDS
 
 
@@ -156,17 +158,19 @@ async def test_stranger_coalescing_suppresses_within_60s(alerter, mock_bot, tmp_
 
 
 @pytest.mark.asyncio
-async def test_stranger_coalescing_allows_after_60s(alerter, mock_bot, tmp_thumbnail):
+async def test_stranger_coalescing_allows_after_60s(alerter, mock_bot, tmp_thumbnail, tmp_path):
     """
     TELE-04: After 61 seconds have elapsed since the last stranger alert,
-    a new stranger alert is allowed through (not suppressed).
+    a new stranger alert (different photo) is allowed through.
     """
     await alerter.alert_stranger(tmp_thumbnail, "First alert")
 
     # Simulate 61 seconds elapsed by back-dating the last alert timestamp
-    alerter._last_stranger_alert = time.monotonic() - 61
+    alerter._last_alert["stranger"] = time.monotonic() - 61
 
-    await alerter.alert_stranger(tmp_thumbnail, "Second alert")
+    second_thumb = tmp_path / "second_thumbnail.jpg"
+    second_thumb.write_bytes(make_jpeg_image(color=(0, 0, 255)))
+    await alerter.alert_stranger(str(second_thumb), "Second alert")
 
     assert mock_bot.send_photo.call_count == 2, (
         f"Expected 2 send_photo calls (both allowed), got {mock_bot.send_photo.call_count}"
@@ -203,6 +207,39 @@ async def test_stranger_and_unlock_coalescing_independent(alerter, mock_bot, tmp
     )
 
 
+@pytest.mark.asyncio
+async def test_blink_motion_coalescing_independent(alerter, mock_bot, tmp_thumbnail):
+    """
+    TELE-04: Blink motion alerts coalesce on their own key — a stranger alert
+    does not suppress one, but a second motion alert within 60s is dropped.
+    """
+    await alerter.alert_stranger(tmp_thumbnail, "Stranger detected")
+    await alerter.alert_blink_motion(tmp_thumbnail, "Car in driveway")
+    await alerter.alert_blink_motion(tmp_thumbnail, "Car still in driveway")
+
+    assert mock_bot.send_photo.call_count == 2, (
+        f"Expected 2 send_photo calls (second motion alert suppressed), "
+        f"got {mock_bot.send_photo.call_count}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_alert_deduplicated_after_coalesce_window(alerter, mock_bot, tmp_thumbnail):
+    """
+    TELE-04: Re-sending the same photo for the same alert type is dropped for
+    DEDUP_TTL even once the 60s window has passed; other types still send it.
+    """
+    await alerter.alert_stranger(tmp_thumbnail, "First alert")
+    alerter._last_alert["stranger"] = time.monotonic() - 61
+    await alerter.alert_stranger(tmp_thumbnail, "Same photo again")
+    await alerter.alert_unlock(tmp_thumbnail, "Door unlocked for Alice")
+
+    assert mock_bot.send_photo.call_count == 2, (
+        f"Expected 2 send_photo calls (repeat stranger photo deduplicated), "
+        f"got {mock_bot.send_photo.call_count}"
+    )
+
+
 # ---------------------------------------------------------------------------
 # TELE-05: AIORateLimiter configured on ExtBot
 # ---------------------------------------------------------------------------
@@ -249,6 +286,67 @@ async def test_retry_after_exception_retries_once(alerter, mock_bot, tmp_thumbna
     )
 
 
+@pytest.mark.asyncio
+async def test_retry_after_reuses_thumbnail_bytes(alerter, mock_bot, tmp_thumbnail):
+    """
+    TELE-05: The thumbnail is read from disk once; the RetryAfter retry
+    re-sends the same in-memory bytes.
+    """
+    mock_bot.send_photo.side_effect = [RetryAfter(1), None]
+
+    with patch("telegram_alerter.asyncio.sleep", new_callable=AsyncMock), \
+            patch("telegram_alerter._read_bytes", wraps=telegram_alerter._read_bytes) as mock_read:
+        await alerter.alert_stranger(tmp_thumbnail, "RetryAfter test")
+
+    mock_read.assert_called_once_with(tmp_thumbnail)
+    first, second = (c.kwargs["photo"] for c in mock_bot.send_photo.call_args_list)
+    assert first is second
+    assert isinstance(first, InputFile)
+    assert first.mimetype == "image/jpeg"
+
+
+@pytest.mark.asyncio
+async def test_retry_after_halves_send_rate_and_success_recovers(alerter, mock_bot, tmp_thumbnail):
+    """
+    TELE-05: RetryAfter multiplicatively cuts the AIMD send rate; the
+    successful retry then raises it additively.
+    """
+    mock_bot.send_photo.side_effect = [RetryAfter(1), None]
+
+    with patch("telegram_alerter.asyncio.sleep", new_callable=AsyncMock):
+        await alerter.alert_stranger(tmp_thumbnail, "RetryAfter test")
+
+    expected = (
+        telegram_alerter.SEND_RATE_MAX * telegram_alerter.SEND_RATE_BACKOFF
+        + telegram_alerter.SEND_RATE_STEP
+    )
+    assert alerter._send_rate == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_repeated_retry_after_backs_off_exponentially(alerter, mock_bot, tmp_thumbnail):
+    """
+    TELE-05: Back-to-back RetryAfter responses are retried with growing waits
+    (at least retry_after, then 2s, 4s) and the alert is dropped, not raised,
+    after SEND_ATTEMPTS tries.
+    """
+    mock_bot.send_photo.side_effect = RetryAfter(1)
+    clock = [time.monotonic()]
+
+    async def fake_sleep(seconds):
+        clock[0] += seconds  # let the alerter's monotonic clock advance
+
+    with patch("telegram_alerter.asyncio.sleep", new_callable=AsyncMock, side_effect=fake_sleep) as mock_sleep, \
+            patch("telegram_alerter.time.monotonic", side_effect=lambda: clock[0]):
+        await alerter.alert_stranger(tmp_thumbnail, "Backoff test")
+
+    assert mock_bot.send_photo.call_count == telegram_alerter.SEND_ATTEMPTS
+    waits = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(waits) == telegram_alerter.SEND_ATTEMPTS - 1
+    for wait, base in zip(waits, (1.0, 2.0, 4.0)):
+        assert base * 0.99 <= wait <= base * (1 + telegram_alerter.RETRY_JITTER) + 0.01
+
+
 # ---------------------------------------------------------------------------
 # Robustness: TelegramError does not crash the pipeline
 # ---------------------------------------------------------------------------
@@ -299,6 +397,36 @@ async def test_none_thumbnail_falls_back_to_text(alerter, mock_bot):
     mock_bot.send_photo.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# Send worker: alerts are queued after initialize() and flushed on shutdown
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_alert_is_queued_and_flushed_on_shutdown(alerter, mock_bot, tmp_thumbnail):
+    """
+    After initialize(), alert_stranger() returns without waiting on the
+    Telegram round-trip; shutdown() drains the queue before closing the bot.
+    """
+    release = asyncio.Event()
+
+    async def slow_send_photo(**kwargs):
+        await release.wait()
+
+    mock_bot.send_photo.side_effect = slow_send_photo
+    await alerter.initialize()
+
+    await asyncio.wait_for(
+        alerter.alert_stranger(tmp_thumbnail, "Stranger detected"), timeout=1
+    )
+
+    release.set()
+    await alerter.shutdown()
+
+    mock_bot.send_photo.assert_called_once()
+    mock_bot.shutdown.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # Startup: initialize validates bot and chat reachability
 # ---------------------------------------------------------------------------
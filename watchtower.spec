@@ -49,6 +49,8 @@ a = Analysis(
         "face_recognition",
         "ring_doorbell",
         "ring_doorbell.listen",
+        "h2",
+        "orjson",
     ],
     hookspath=[],
     hooksconfig={},